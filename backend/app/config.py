@@ -15,6 +15,41 @@ class Settings:
         self.google_client_secret: str = os.getenv("GOOGLE_CLIENT_SECRET", "")
         self.google_project_id: str = os.getenv("GOOGLE_PROJECT_ID", "")
         self.redirect_uri: str = os.getenv("REDIRECT_URI", "http://localhost:8000/api/auth/callback")
+        
+        # YouTube API host override, e.g. http://127.0.0.1:8765 for a local fake API
+        self.youtube_api_base_url: str = os.getenv("YOUTUBE_API_BASE_URL", "")
+        self.youtube_daily_quota: int = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+        
+        # Retries with jittered backoff, and per-endpoint circuit breakers
+        self.youtube_max_attempts: int = int(os.getenv("YOUTUBE_MAX_ATTEMPTS", "4"))
+        self.youtube_retry_base_delay: float = float(os.getenv("YOUTUBE_RETRY_BASE_DELAY", "0.5"))
+        self.youtube_retry_max_delay: float = float(os.getenv("YOUTUBE_RETRY_MAX_DELAY", "30"))
+        self.youtube_breaker_threshold: int = int(os.getenv("YOUTUBE_BREAKER_THRESHOLD", "5"))
+        self.youtube_breaker_reset_seconds: float = float(os.getenv("YOUTUBE_BREAKER_RESET_SECONDS", "30"))
+        
+        # Share of the daily quota the monitoring scheduler may spend
+        self.monitor_quota_share: float = float(os.getenv("MONITOR_QUOTA_SHARE", "0.5"))
+        
+        # Parallel comments.list requests when scanning replies
+        self.reply_fetch_concurrency: int = int(os.getenv("REPLY_FETCH_CONCURRENCY", "8"))
+        
+        # Detection
+        self.detection_cache_size: int = int(os.getenv("DETECTION_CACHE_SIZE", "50000"))
+        
+        # Admission control: concurrent requests, wait queue length and longest wait (seconds)
+        self.detection_max_concurrent: int = int(os.getenv("DETECTION_MAX_CONCURRENT", "4"))
+        self.detection_max_queue: int = int(os.getenv("DETECTION_MAX_QUEUE", "16"))
+        self.detection_queue_timeout: float = float(os.getenv("DETECTION_QUEUE_TIMEOUT", "10"))
+        self.moderation_max_concurrent: int = int(os.getenv("MODERATION_MAX_CONCURRENT", "2"))
+        self.moderation_max_queue: int = int(os.getenv("MODERATION_MAX_QUEUE", "8"))
+        self.moderation_queue_timeout: float = float(os.getenv("MODERATION_QUEUE_TIMEOUT", "10"))
+        
+        # Detection history (SQLite); empty disables it
+        self.history_db_path: str = os.getenv("HISTORY_DB_PATH", "detection_history.db")
+        
+        # Author reputation; an empty path keeps it in memory only
+        self.author_reputation_path: str = os.getenv("AUTHOR_REPUTATION_PATH", "author_reputation.json")
+        self.author_spam_threshold: int = int(os.getenv("AUTHOR_SPAM_THRESHOLD", "3"))
 
 @lru_cache()
 def get_settings():
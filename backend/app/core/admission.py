@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import math
+import statistics
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+class AdmissionRejected(Exception):
+    """A request was turned away because the queue was full or it waited too long"""
+
+    def __init__(self, name: str, reason: str, retry_after: int):
+        super().__init__(f"{name.capitalize()} is busy ({reason}), retry in {retry_after}s")
+        self.name = name
+        self.reason = reason
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """Bounded concurrency with a short FIFO wait queue, for one event loop.
+
+    Up to `max_concurrent` requests run at once and up to `max_queue` more
+    wait, each for at most `queue_timeout` seconds. Anything beyond that is
+    rejected at once with an estimate of when to retry, so that a burst
+    cannot pile up work until every request times out. A finishing request
+    hands its slot straight to the oldest waiter.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float,
+        window: int = 1000
+    ):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._in_flight = 0
+        self._waiters: deque = deque()
+        self._wait_times: deque = deque(maxlen=window)
+        self._service_times: deque = deque(maxlen=window)
+
+        self.admitted = 0
+        self.queued = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.max_queue_depth = 0
+        self.wait_seconds_total = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self):
+        if self._in_flight < self.max_concurrent and not self._waiters:
+            self._in_flight += 1
+            self._record_wait(0.0)
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise AdmissionRejected(self.name, "queue full", self.retry_after())
+
+        start = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # handed a slot just as we gave up; pass it on
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.rejected_timeout += 1
+            raise AdmissionRejected(self.name, "queue wait timed out", self.retry_after())
+        self._record_wait(time.monotonic() - start)
+
+    def release(self, service_time: Optional[float] = None):
+        """Free a slot, or hand it to the oldest waiter; `service_time` feeds the Retry-After estimate"""
+        if service_time is not None:
+            self._service_times.append(service_time)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._in_flight -= 1
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog has likely drained, from recent service times"""
+        service_time = statistics.mean(self._service_times) if self._service_times else 1.0
+        backlog = (len(self._waiters) + 1) / self.max_concurrent
+        return min(60, max(1, math.ceil(service_time * backlog)))
+
+    def _record_wait(self, seconds: float):
+        self.admitted += 1
+        self.wait_seconds_total += seconds
+        self._wait_times.append(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        waits = sorted(self._wait_times) or [0.0]
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "queue_depth": len(self._waiters),
+            "max_queue_depth": self.max_queue_depth,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "wait_p50_ms": round(waits[(len(waits) - 1) // 2] * 1000, 2),
+            "wait_p95_ms": round(waits[(len(waits) - 1) * 95 // 100] * 1000, 2),
+            "wait_max_ms": round(waits[-1] * 1000, 2),
+            "retry_after_seconds": self.retry_after()
+        }
+
+# Singleton instances, one per route group
+_controllers: Dict[str, AdmissionController] = {}
+
+def get_admission_controller(name: str) -> AdmissionController:
+    """The controller for "detection" or "moderation", sized from settings"""
+    if name not in _controllers:
+        settings = get_settings()
+        _controllers[name] = AdmissionController(
+            name,
+            max_concurrent=getattr(settings, f"{name}_max_concurrent"),
+            max_queue=getattr(settings, f"{name}_max_queue"),
+            queue_timeout=getattr(settings, f"{name}_queue_timeout")
+        )
+    return _controllers[name]
+
+def all_admission_controllers() -> List[AdmissionController]:
+    return list(_controllers.values())
+
+def render_prometheus(controllers: List[AdmissionController]) -> str:
+    """Admission metrics in the Prometheus text exposition format"""
+    metrics = [
+        ("admission_in_flight", "gauge", "Requests currently running", lambda c: c.in_flight),
+        ("admission_queue_depth", "gauge", "Requests waiting for a slot", lambda c: c.queue_depth),
+        ("admission_max_concurrent", "gauge", "Concurrency limit", lambda c: c.max_concurrent),
+        ("admission_admitted_total", "counter", "Requests admitted", lambda c: c.admitted),
+        ("admission_queued_total", "counter", "Requests that had to wait", lambda c: c.queued),
+        ("admission_wait_seconds_sum", "counter", "Total time admitted requests waited",
+         lambda c: round(c.wait_seconds_total, 6)),
+        ("admission_wait_seconds_count", "counter", "Admitted requests whose wait was measured",
+         lambda c: c.admitted),
+    ]
+    lines = []
+    for metric, kind, help_text, value in metrics:
+        lines.append(f"# HELP judol_{metric} {help_text}")
+        lines.append(f"# TYPE judol_{metric} {kind}")
+        lines.extend(f'judol_{metric}{{group="{c.name}"}} {value(c)}' for c in controllers)
+
+    lines.append("# HELP judol_admission_rejected_total Requests rejected with 429")
+    lines.append("# TYPE judol_admission_rejected_total counter")
+    for c in controllers:
+        lines.append(f'judol_admission_rejected_total{{group="{c.name}",reason="queue_full"}} {c.rejected_queue_full}')
+        lines.append(f'judol_admission_rejected_total{{group="{c.name}",reason="timeout"}} {c.rejected_timeout}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,125 @@
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CALIBRATION_PATH = os.path.join(os.path.dirname(__file__), "planner_calibration.json")
+
+# distinct 2-character blocks in typical normalized comments ([a-z0-9 ] squared)
+_BLOCK_SPACE = 37 * 37
+
+class AlgorithmPlanner:
+    """Pick the cheapest exact keyword matcher for a pattern set and batch.
+
+    Each algorithm's cost is modelled as
+        seconds = work * feature(shape) + per_comment * comments + fixed
+    where feature() captures how the algorithm scales with the pattern-set
+    shape and text volume. The three coefficients per algorithm are fitted by
+    benchmarks/calibrate_planner.py and stored in planner_calibration.json.
+    """
+
+    CANDIDATES = ("kmp", "boyer_moore", "wu_manber", "rabin_karp", "rabin_karp_vectorized")
+
+    DEFAULT_COEFFICIENTS = {
+        "kmp": {"work": 2.0e-7, "per_comment": 1.0e-6, "fixed": 0.0},
+        "boyer_moore": {"work": 6.0e-7, "per_comment": 1.0e-6, "fixed": 0.0},
+        "wu_manber": {"work": 5.0e-7, "per_comment": 2.0e-6, "fixed": 0.0},
+        "rabin_karp": {"work": 5.0e-7, "per_comment": 5.0e-6, "fixed": 0.0},
+        "rabin_karp_vectorized": {"work": 2.0e-8, "per_comment": 1.0e-6, "fixed": 5.0e-4},
+    }
+
+    def __init__(self, calibration_path: str = CALIBRATION_PATH):
+        self.coefficients = self._load_coefficients(calibration_path)
+
+    def _load_coefficients(self, calibration_path: str) -> Dict[str, Dict[str, float]]:
+        coefficients = {name: dict(values) for name, values in self.DEFAULT_COEFFICIENTS.items()}
+        try:
+            with open(calibration_path, "r", encoding="utf-8") as f:
+                calibration = json.load(f)
+            for name, values in calibration.get("coefficients", {}).items():
+                if name in coefficients:
+                    coefficients[name].update(values)
+            logger.info(f"AlgorithmPlanner calibration loaded from {calibration_path}")
+        except FileNotFoundError:
+            logger.warning("No planner calibration found, using default coefficients")
+        except Exception as e:
+            logger.warning(f"Invalid planner calibration, using default coefficients: {e}")
+        return coefficients
+
+    @staticmethod
+    def describe_workload(patterns: List[str], text_lengths: List[int]) -> Dict[str, Any]:
+        lengths = [len(pattern.strip()) for pattern in patterns if pattern.strip()]
+        return {
+            "pattern_count": len(lengths),
+            "distinct_lengths": len(set(lengths)),
+            "min_length": min(lengths) if lengths else 0,
+            "inverse_length_sum": sum(1.0 / length for length in lengths),
+            "total_pattern_chars": sum(lengths),
+            "comment_count": len(text_lengths),
+            "text_chars": sum(text_lengths),
+        }
+
+    @staticmethod
+    def feature(algorithm: str, workload: Dict[str, Any]) -> float:
+        n = workload["text_chars"]
+        p = workload["pattern_count"]
+
+        if algorithm == "kmp":
+            return n * p
+        if algorithm == "boyer_moore":
+            return n * workload["inverse_length_sum"]
+        if algorithm == "rabin_karp":
+            return n * workload["distinct_lengths"] + workload["total_pattern_chars"]
+        if algorithm == "rabin_karp_vectorized":
+            return n * workload["distinct_lengths"]
+        if algorithm == "wu_manber":
+            min_length = workload["min_length"]
+            if min_length < 2:
+                return n * p
+            # blocks seen in the shift table eat into the default skip, and
+            # every zero-shift block verifies its candidate patterns
+            coverage = min(1.0, p * (min_length - 1) / _BLOCK_SPACE)
+            average_shift = max(1.0, (min_length - 1) * (1.0 - coverage))
+            return n / average_shift * (1.0 + p / _BLOCK_SPACE)
+        raise ValueError(f"No cost model for algorithm: {algorithm}")
+
+    def estimate(self, algorithm: str, workload: Dict[str, Any]) -> float:
+        c = self.coefficients[algorithm]
+        return (
+            c["work"] * self.feature(algorithm, workload)
+            + c["per_comment"] * workload["comment_count"]
+            + c["fixed"]
+        )
+
+    def plan(self, patterns: List[str], text_lengths: List[int], candidates: Optional[List[str]] = None) -> Dict[str, Any]:
+        workload = self.describe_workload(patterns, text_lengths)
+        estimates = {name: self.estimate(name, workload) for name in (candidates or self.CANDIDATES)}
+        chosen = min(estimates, key=estimates.get)
+
+        runner_up = sorted(estimates, key=estimates.get)[1:2]
+        reason = (
+            f"{chosen} has the lowest estimated cost ({estimates[chosen] * 1000:.2f} ms) for "
+            f"{workload['pattern_count']} patterns ({workload['distinct_lengths']} distinct lengths, "
+            f"min length {workload['min_length']}) over {workload['text_chars']} chars in "
+            f"{workload['comment_count']} comments"
+        )
+        if runner_up:
+            reason += f"; next best {runner_up[0]} ({estimates[runner_up[0]] * 1000:.2f} ms)"
+
+        return {
+            "chosen": chosen,
+            "reason": reason,
+            "estimates": estimates,
+            "workload": workload,
+        }
+
+# Singleton instance
+_algorithm_planner = None
+
+def get_algorithm_planner() -> AlgorithmPlanner:
+    global _algorithm_planner
+    if _algorithm_planner is None:
+        _algorithm_planner = AlgorithmPlanner()
+    return _algorithm_planner
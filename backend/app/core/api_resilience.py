@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import random
+import socket
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# 403s that clear up within seconds; quotaExceeded only clears at the daily reset
+RETRYABLE_403_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+
+TRANSIENT_ERRORS = (socket.timeout, ConnectionError, httplib2.ServerNotFoundError)
+
+class CircuitOpenError(Exception):
+    """Calls to an endpoint are failing fast while its circuit is open"""
+
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(f"YouTube API {endpoint} is unavailable, retry in {retry_after:.0f}s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+def error_reasons(error: HttpError) -> set:
+    return {detail.get('reason') for detail in (error.error_details or []) if isinstance(detail, dict)}
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, HttpError):
+        status = error.resp.status
+        return status in RETRYABLE_STATUSES or (status == 403 and bool(error_reasons(error) & RETRYABLE_403_REASONS))
+    return isinstance(error, TRANSIENT_ERRORS)
+
+def describe_error(error: Exception) -> str:
+    """A short description for clients; HttpError's own text contains the request URL and API key"""
+    if isinstance(error, HttpError):
+        return f"HTTP {error.resp.status}: {error.reason}"
+    return str(error)
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """The Retry-After header of an HTTP error, in seconds"""
+    if not isinstance(error, HttpError):
+        return None
+    value = error.resp.get('retry-after')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures and stays open for
+    `reset_timeout` seconds; then one trial call decides whether it closes"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, endpoint: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.times_opened = 0
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self.opened_at + self.reset_timeout - time.time()
+                if remaining > 0:
+                    raise CircuitOpenError(self.endpoint, remaining)
+                self.state = self.HALF_OPEN
+                self.trial_in_flight = False
+            if self.state == self.HALF_OPEN:
+                if self.trial_in_flight:
+                    raise CircuitOpenError(self.endpoint, self.reset_timeout)
+                self.trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit for {self.endpoint} closed")
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                    logger.warning(f"Circuit for {self.endpoint} opened after "
+                                   f"{self.consecutive_failures} consecutive failures")
+                self.state = self.OPEN
+                self.opened_at = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened
+        }
+
+class ApiResilience:
+    """Runs YouTube API requests with retries and a circuit breaker per endpoint.
+
+    Retryable failures (5xx, 429, rate-limit 403s and network errors) are
+    retried up to `max_attempts` times. Each wait is the error's Retry-After
+    when it has one, otherwise a full-jitter exponential backoff. A failure
+    that would need a wait longer than `max_delay` is raised at once. Only
+    retryable failures count towards opening a circuit, since a 404 says
+    nothing about the API's health.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self.retries = 0
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = CircuitBreaker(endpoint, self.failure_threshold, self.reset_timeout)
+                self._breakers[endpoint] = breaker
+            return breaker
+
+    def execute(self, endpoint: str, request, http=None, retry: bool = True) -> Dict[str, Any]:
+        """Execute a request, sleeping between attempts; for worker threads and sync callers"""
+        attempt = 0
+        while True:
+            try:
+                return self._attempt(endpoint, request, http)
+            except Exception as e:
+                delay = self._retry_delay(endpoint, e, attempt, retry)
+            time.sleep(delay)
+            attempt += 1
+
+    async def execute_async(self, endpoint: str, request, retry: bool = True) -> Dict[str, Any]:
+        """Like execute(), but without blocking the event loop: requests run in a
+        worker thread and waits between attempts are asyncio sleeps"""
+        attempt = 0
+        while True:
+            try:
+                return await asyncio.to_thread(self._attempt, endpoint, request, None)
+            except Exception as e:
+                delay = self._retry_delay(endpoint, e, attempt, retry)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _attempt(self, endpoint: str, request, http) -> Dict[str, Any]:
+        breaker = self.breaker(endpoint)
+        breaker.before_call()
+        try:
+            response = request.execute(http=http)
+        except Exception as e:
+            if is_retryable(e):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        breaker.record_success()
+        return response
+
+    def _retry_delay(self, endpoint: str, error: Exception, attempt: int, retry: bool) -> float:
+        """Seconds to wait before the next attempt, or re-raise when it should not be retried"""
+        if not retry or not is_retryable(error) or attempt + 1 >= self.max_attempts:
+            raise error
+
+        delay = retry_after_seconds(error)
+        if delay is None:
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if delay > self.max_delay:
+            raise error
+
+        with self._lock:
+            self.retries += 1
+        logger.warning(f"YouTube API {endpoint} failed ({describe_error(error)}), retry {attempt + 1} in {delay:.2f}s")
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            breakers = {endpoint: breaker.to_dict() for endpoint, breaker in self._breakers.items()}
+        return {
+            "retries": self.retries,
+            "circuits": breakers
+        }
+
+# Singleton instance; circuits are shared by every client, since they track the API's health
+_api_resilience = None
+
+def get_api_resilience() -> ApiResilience:
+    global _api_resilience
+    if _api_resilience is None:
+        settings = get_settings()
+        _api_resilience = ApiResilience(
+            max_attempts=settings.youtube_max_attempts,
+            base_delay=settings.youtube_retry_base_delay,
+            max_delay=settings.youtube_retry_max_delay,
+            failure_threshold=settings.youtube_breaker_threshold,
+            reset_timeout=settings.youtube_breaker_reset_seconds
+        )
+    return _api_resilience
@@ -0,0 +1,179 @@
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from app.models.records import JudolHit
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# distinct video hashes kept per author, for the videos count
+_MAX_TRACKED = 32
+# most recent counted comment hashes kept per author; a comment older than
+# this window can be counted again on a re-scan, but only for an author who
+# is already far over any spammer threshold
+_MAX_COMMENT_HASHES = 256
+
+@dataclass(slots=True)
+class AuthorReputation:
+    display_name: str
+    judol_hits: int = 0
+    first_seen: int = 0
+    last_seen: int = 0
+    comment_hashes: Deque[int] = field(default_factory=lambda: deque(maxlen=_MAX_COMMENT_HASHES))
+    video_hashes: List[int] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.comment_hashes = deque(self.comment_hashes, maxlen=_MAX_COMMENT_HASHES)
+
+    def to_row(self) -> list:
+        return [
+            self.display_name, self.judol_hits, self.first_seen, self.last_seen,
+            list(self.comment_hashes), self.video_hashes
+        ]
+
+class AuthorReputationIndex:
+    """Judol hit counts per author channel, across videos.
+
+    Kept in memory as one small record per channel ID and persisted as JSON.
+    Each judol comment is counted once, however often its video is re-scanned,
+    as long as it is among the author's last _MAX_COMMENT_HASHES counted hits.
+    Authors with at least `spammer_threshold` hits are known spammers.
+    """
+
+    def __init__(self, path: Optional[str], spammer_threshold: int = 3, save_interval: float = 30.0):
+        self.path = path
+        self.spammer_threshold = spammer_threshold
+        self.save_interval = save_interval
+        self._authors: Dict[str, AuthorReputation] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._saving = False
+        self._last_save = time.time()
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._authors = {
+                channel_id: AuthorReputation(*row)
+                for channel_id, row in data.get("authors", {}).items()
+            }
+            logger.info(f"Author reputation loaded: {len(self._authors)} authors from {self.path}")
+        except Exception as e:
+            logger.warning(f"Could not load author reputation from {self.path}: {e}")
+
+    def is_known_spammer(self, channel_id: str) -> bool:
+        if not channel_id:
+            return False
+        reputation = self._authors.get(channel_id)
+        return reputation is not None and reputation.judol_hits >= self.spammer_threshold
+
+    def get(self, channel_id: str) -> Optional[AuthorReputation]:
+        return self._authors.get(channel_id)
+
+    def record_hits(self, video_id: str, hits: Iterable[JudolHit]):
+        now = int(time.time())
+        video_hash = zlib.crc32(video_id.encode("utf-8"))
+        with self._lock:
+            for hit in hits:
+                channel_id = hit.comment.author_channel_id
+                if not channel_id:
+                    continue
+
+                reputation = self._authors.get(channel_id)
+                if reputation is None:
+                    reputation = AuthorReputation(hit.comment.author, first_seen=now)
+                    self._authors[channel_id] = reputation
+
+                comment_hash = zlib.crc32(hit.comment.comment_id.encode("utf-8"))
+                if comment_hash in reputation.comment_hashes:
+                    continue
+                reputation.comment_hashes.append(comment_hash)
+                if video_hash not in reputation.video_hashes and len(reputation.video_hashes) < _MAX_TRACKED:
+                    reputation.video_hashes.append(video_hash)
+
+                reputation.judol_hits += 1
+                reputation.last_seen = now
+                reputation.display_name = hit.comment.author
+                self._dirty = True
+
+            save_due = self._dirty and not self._saving and time.time() - self._last_save >= self.save_interval
+            if save_due:
+                self._saving = True
+
+        if save_due:
+            threading.Thread(target=self.save, name="author-reputation-save", daemon=True).start()
+
+    def save(self):
+        """Write the index to disk atomically, if anything changed"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                self._saving = False
+                return
+            snapshot = {channel_id: reputation.to_row() for channel_id, reputation in self._authors.items()}
+            self._dirty = False
+
+        try:
+            temporary_path = f"{self.path}.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "authors": snapshot}, f, separators=(",", ":"))
+            os.replace(temporary_path, self.path)
+            logger.debug(f"Author reputation saved: {len(snapshot)} authors")
+        except Exception as e:
+            logger.error(f"Could not save author reputation to {self.path}: {e}")
+            with self._lock:
+                self._dirty = True
+        finally:
+            with self._lock:
+                self._saving = False
+                self._last_save = time.time()
+
+    def top_spammers(self, limit: int = 20) -> List[Dict[str, Any]]:
+        with self._lock:
+            ranked = sorted(self._authors.items(), key=lambda item: item[1].judol_hits, reverse=True)[:limit]
+            return [
+                {
+                    "author_channel_id": channel_id,
+                    "author": reputation.display_name,
+                    "judol_hits": reputation.judol_hits,
+                    "videos": len(reputation.video_hashes),
+                    "known_spammer": reputation.judol_hits >= self.spammer_threshold,
+                    "last_seen": reputation.last_seen
+                }
+                for channel_id, reputation in ranked
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "tracked_authors": len(self._authors),
+                "known_spammers": sum(
+                    1 for reputation in self._authors.values() if reputation.judol_hits >= self.spammer_threshold
+                ),
+                "spammer_threshold": self.spammer_threshold
+            }
+
+# Singleton instance
+_author_reputation_index = None
+
+def get_author_reputation_index() -> AuthorReputationIndex:
+    global _author_reputation_index
+    if _author_reputation_index is None:
+        settings = get_settings()
+        _author_reputation_index = AuthorReputationIndex(
+            settings.author_reputation_path or None,
+            spammer_threshold=settings.author_spam_threshold
+        )
+    return _author_reputation_index
@@ -0,0 +1,380 @@
+import csv
+import json
+import logging
+import mmap
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from app.models.schemas import AlgorithmType, DetectionMode
+from app.core.unicode_normalizer import UnicodeNormalizer
+from app.core.string_matching import StringMatchingFactory
+
+logger = logging.getLogger(__name__)
+
+# (comment_id, text)
+Record = Tuple[str, str]
+# (comment_id, matched patterns), empty when clean
+Verdict = Tuple[str, List[str]]
+# (byte offset, byte length, matched patterns) of a judol line in a mapped archive
+ArchiveHit = Tuple[int, int, List[str]]
+
+def read_jsonl_records(stream: TextIO, id_field: str, text_field: str) -> Iterator[Record]:
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping malformed JSON on line {line_number}: {e}")
+            continue
+        yield str(item.get(id_field, line_number)), item.get(text_field) or ""
+
+def read_csv_records(stream: TextIO, id_field: str, text_field: str) -> Iterator[Record]:
+    csv.field_size_limit(sys.maxsize)
+    reader = csv.DictReader(stream)
+    if reader.fieldnames and text_field not in reader.fieldnames:
+        raise ValueError(f"CSV has no '{text_field}' column (columns: {', '.join(reader.fieldnames)})")
+    for row_number, row in enumerate(reader, 1):
+        yield str(row.get(id_field) or row_number), row.get(text_field) or ""
+
+def read_records(stream: TextIO, fmt: str, id_field: str, text_field: str) -> Iterator[Record]:
+    if fmt == "jsonl":
+        return read_jsonl_records(stream, id_field, text_field)
+    if fmt == "csv":
+        return read_csv_records(stream, id_field, text_field)
+    raise ValueError(f"Unsupported input format: {fmt}")
+
+def extract_json_string(archive: mmap.mmap, key: bytes, start: int, end: int) -> Optional[str]:
+    """The string value of `key` (a JSON-encoded field name) in the JSON line at
+    [start, end), found at the byte level without parsing the rest of the line"""
+    position = start
+    while True:
+        found = archive.find(key, position, end)
+        if found == -1:
+            return None
+        position = found + len(key)
+        # an escaped quote means the name is inside another string value
+        if found > start and archive[found - 1] == 0x5C:
+            continue
+        colon = position
+        while colon < end and archive[colon] in b" \t":
+            colon += 1
+        if colon < end and archive[colon] == 0x3A:
+            break
+
+    value = colon + 1
+    while value < end and archive[value] in b" \t":
+        value += 1
+    if value >= end or archive[value] != 0x22:
+        return None
+
+    close = value + 1
+    while True:
+        close = archive.find(b'"', close, end)
+        if close == -1:
+            return None
+        # the quote is escaped when an odd number of backslashes precedes it
+        backslashes = 0
+        while archive[close - 1 - backslashes] == 0x5C:
+            backslashes += 1
+        if backslashes % 2 == 0:
+            break
+        close += 1
+
+    span = archive[value:close + 1]
+    if b"\\" not in span:
+        return span[1:-1].decode("utf-8", errors="replace")
+    try:
+        return json.loads(span)
+    except ValueError:
+        return None
+
+def chunked(records: Iterator[Record], size: int) -> Iterator[List[Record]]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class ChunkScanner:
+    """Normalizes and matches one chunk of records; one instance per worker process"""
+
+    def __init__(
+        self,
+        algorithm: AlgorithmType,
+        patterns: Optional[List[str]],
+        detection_mode: DetectionMode = DetectionMode.FULL,
+        max_edits: int = 1
+    ):
+        options = {"max_edits": max_edits} if algorithm == AlgorithmType.APPROXIMATE else {}
+        self.normalizer = UnicodeNormalizer()
+        self.matcher = StringMatchingFactory.create_matcher(algorithm.value, **options)
+        self.patterns = patterns
+        self.detection_mode = detection_mode
+
+    def scan_texts(self, texts: List[str]) -> List[List[str]]:
+        normalized_texts = [self.normalizer.normalize_text(text) for text in texts]
+        verdict_only = self.detection_mode == DetectionMode.VERDICT
+
+        if hasattr(self.matcher, "search_batch"):
+            matches = [
+                [pattern for pattern, positions in results if positions]
+                for results in self.matcher.search_batch(
+                    normalized_texts,
+                    self.patterns,
+                    first_only=self.detection_mode == DetectionMode.FIRST_HIT,
+                    stop_at_first=verdict_only
+                )
+            ]
+            return [matched[:1] for matched in matches] if verdict_only else matches
+
+        if verdict_only:
+            matches = []
+            for text in normalized_texts:
+                matched_pattern = self.matcher.find_any(text, self.patterns)
+                matches.append([matched_pattern] if matched_pattern is not None else [])
+            return matches
+
+        first_only = self.detection_mode == DetectionMode.FIRST_HIT
+        return [
+            [pattern for pattern, positions in self.matcher.search(text, self.patterns, first_only=first_only) if positions]
+            for text in normalized_texts
+        ]
+
+    def scan(self, chunk: List[Record]) -> List[Verdict]:
+        matches = self.scan_texts([text for _, text in chunk])
+        return [(comment_id, matched) for (comment_id, _), matched in zip(chunk, matches)]
+
+    def scan_mapped_range(
+        self,
+        archive: mmap.mmap,
+        start: int,
+        end: int,
+        text_key: Optional[bytes] = None
+    ) -> List[ArchiveHit]:
+        """Match every line in [start, end) of a mapped archive, with no record parsing.
+
+        Without `text_key` each line is one comment. With it, each line is a
+        JSON object and only its `text_key` string value is matched, unescaped,
+        so keys, IDs and author names never produce hits.
+        """
+        offsets = []
+        texts = []
+        position = start
+        while position < end:
+            newline = archive.find(b"\n", position, end)
+            line_end = end if newline == -1 else newline
+            length = line_end - position
+            if length and archive[line_end - 1:line_end] == b"\r":
+                length -= 1
+            if length:
+                if text_key is None:
+                    text = archive[position:position + length].decode("utf-8", errors="replace")
+                else:
+                    text = extract_json_string(archive, text_key, position, position + length)
+                if text:
+                    offsets.append((position, length))
+                    texts.append(text)
+            position = line_end + 1
+
+        return [
+            (offset, length, matched)
+            for (offset, length), matched in zip(offsets, self.scan_texts(texts)) if matched
+        ]
+
+def record_aligned_ranges(archive: mmap.mmap, chunk_bytes: int) -> List[Tuple[int, int]]:
+    """Split a mapped archive into [start, end) byte ranges that end on a newline"""
+    size = len(archive)
+    ranges = []
+    start = 0
+    while start < size:
+        end = min(start + chunk_bytes, size)
+        if end < size:
+            newline = archive.find(b"\n", end - 1)
+            end = size if newline == -1 else newline + 1
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+# per-process state, created once by the pool initializers
+_worker_scanner: Optional[ChunkScanner] = None
+_worker_archive: Optional[mmap.mmap] = None
+
+def _init_worker(*args):
+    global _worker_scanner
+    _worker_scanner = ChunkScanner(*args)
+
+def _init_mapped_worker(path: str, *args):
+    global _worker_archive
+    _init_worker(*args)
+    # each worker maps the file itself, so chunks are never copied between processes
+    with open(path, "rb") as f:
+        _worker_archive = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def _scan_in_worker(chunk: List[Record]) -> List[Verdict]:
+    return _worker_scanner.scan(chunk)
+
+def _scan_range_in_worker(task: Tuple[int, int, Optional[bytes]]) -> List[ArchiveHit]:
+    return _worker_scanner.scan_mapped_range(_worker_archive, *task)
+
+def ordered_pool_map(
+    func: Callable,
+    tasks: Iterable,
+    workers: int,
+    initializer: Callable,
+    initargs: tuple
+) -> Iterator:
+    """Results of func over tasks in task order, with at most 2 * workers tasks in flight"""
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(func, task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+class BatchScanner:
+    """Scans a stream of records on all cores and writes one JSON verdict per line.
+
+    Chunks are handed to a process pool through a window of at most
+    `2 * workers` in-flight chunks, so memory stays bounded by the chunk size
+    however large the input is, and verdicts are written in input order.
+    """
+
+    def __init__(
+        self,
+        algorithm: AlgorithmType,
+        patterns: Optional[List[str]],
+        detection_mode: DetectionMode = DetectionMode.FULL,
+        max_edits: int = 1,
+        workers: int = 1,
+        chunk_size: int = 2000
+    ):
+        self._scanner_args = (algorithm, patterns, detection_mode, max_edits)
+        self.algorithm = algorithm
+        self.workers = max(1, workers)
+        self.chunk_size = chunk_size
+
+    def scan(
+        self,
+        records: Iterator[Record],
+        output: TextIO,
+        only_judol: bool = False,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        progress_interval: float = 5.0
+    ) -> Dict[str, Any]:
+        stats = {"comments": 0, "judol": 0, "elapsed": 0.0, "comments_per_second": 0.0}
+        start_time = time.perf_counter()
+        last_report = start_time
+
+        def write(verdicts: List[Verdict]):
+            nonlocal last_report
+            for comment_id, matched in verdicts:
+                if matched:
+                    stats["judol"] += 1
+                elif only_judol:
+                    continue
+                output.write(json.dumps(
+                    {"comment_id": comment_id, "judol": bool(matched), "matched_patterns": matched},
+                    ensure_ascii=False
+                ))
+                output.write("\n")
+            stats["comments"] += len(verdicts)
+
+            now = time.perf_counter()
+            stats["elapsed"] = now - start_time
+            stats["comments_per_second"] = stats["comments"] / stats["elapsed"] if stats["elapsed"] else 0.0
+            if progress and now - last_report >= progress_interval:
+                last_report = now
+                progress(dict(stats))
+
+        chunks = chunked(records, self.chunk_size)
+
+        if self.workers == 1:
+            scanner = ChunkScanner(*self._scanner_args)
+            for chunk in chunks:
+                write(scanner.scan(chunk))
+        else:
+            for verdicts in ordered_pool_map(
+                _scan_in_worker, chunks, self.workers, _init_worker, self._scanner_args
+            ):
+                write(verdicts)
+
+        stats["elapsed"] = time.perf_counter() - start_time
+        stats["comments_per_second"] = stats["comments"] / stats["elapsed"] if stats["elapsed"] else 0.0
+        logger.info(f"Batch scan completed: {stats['judol']}/{stats['comments']} judol comments "
+                    f"in {stats['elapsed']:.2f}s ({stats['comments_per_second']:.0f} comments/s)")
+        return stats
+
+    def scan_archive(
+        self,
+        path: str,
+        output: TextIO,
+        chunk_bytes: int = 8 * 1024 * 1024,
+        text_field: Optional[str] = None,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        progress_interval: float = 5.0
+    ) -> Dict[str, Any]:
+        """Scan a newline-delimited archive in place through a memory map.
+
+        Lines are matched without parsing records, so a new pattern set needs
+        no re-export of the archive. Each line is one comment, or with
+        `text_field` a JSON object whose string field of that name is pulled
+        out and unescaped at the byte level. Hits are written as JSON lines
+        holding the byte offset and length of the matching line.
+        """
+        stats = {"bytes": 0, "judol": 0, "elapsed": 0.0, "megabytes_per_second": 0.0}
+        start_time = time.perf_counter()
+        last_report = start_time
+
+        with open(path, "rb") as f:
+            size = f.seek(0, 2)
+            if size == 0:
+                return stats
+            archive = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            ranges = record_aligned_ranges(archive, chunk_bytes)
+            text_key = json.dumps(text_field).encode("utf-8") if text_field else None
+
+            if self.workers == 1:
+                scanner = ChunkScanner(*self._scanner_args)
+                results = (scanner.scan_mapped_range(archive, start, end, text_key) for start, end in ranges)
+            else:
+                results = ordered_pool_map(
+                    _scan_range_in_worker, [(start, end, text_key) for start, end in ranges], self.workers,
+                    _init_mapped_worker, (path,) + self._scanner_args
+                )
+
+            for (start, end), hits in zip(ranges, results):
+                for offset, length, matched in hits:
+                    output.write(json.dumps(
+                        {"offset": offset, "length": length, "matched_patterns": matched},
+                        ensure_ascii=False
+                    ))
+                    output.write("\n")
+                stats["judol"] += len(hits)
+                stats["bytes"] += end - start
+
+                now = time.perf_counter()
+                stats["elapsed"] = now - start_time
+                stats["megabytes_per_second"] = stats["bytes"] / 1e6 / stats["elapsed"] if stats["elapsed"] else 0.0
+                if progress and now - last_report >= progress_interval:
+                    last_report = now
+                    progress(dict(stats))
+        finally:
+            archive.close()
+
+        stats["elapsed"] = time.perf_counter() - start_time
+        stats["megabytes_per_second"] = stats["bytes"] / 1e6 / stats["elapsed"] if stats["elapsed"] else 0.0
+        logger.info(f"Archive scan completed: {stats['judol']} judol lines in {stats['bytes']} bytes "
+                    f"in {stats['elapsed']:.2f}s ({stats['megabytes_per_second']:.1f} MB/s)")
+        return stats
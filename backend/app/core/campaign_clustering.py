@@ -0,0 +1,111 @@
+import logging
+import zlib
+from typing import Dict, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Mersenne prime for the universal hash family (a * x + b) mod p
+_PRIME = (1 << 61) - 1
+
+class CampaignClusterer:
+    """Near-duplicate clustering of comments with MinHash and LSH banding.
+
+    Every text is reduced to `num_perm` MinHash values over its character
+    shingles. The signature is cut into `bands` bands; texts that agree on a
+    whole band share a bucket and become candidates, and candidates whose
+    estimated Jaccard similarity reaches `threshold` are merged. Runtime is
+    linear in the number of texts, with no pairwise comparison.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 5,
+        threshold: float = 0.7,
+        seed: int = 1
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+
+        rng = np.random.default_rng(seed)
+        # kept below 2^32 so a * x + b stays inside uint64 for 32-bit shingle hashes
+        self._a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def _shingle_hashes(self, text: str) -> np.ndarray:
+        text = " ".join(text.lower().split())
+        k = self.shingle_size
+        if len(text) <= k:
+            shingles = {text}
+        else:
+            shingles = {text[i:i + k] for i in range(len(text) - k + 1)}
+        return np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = self._shingle_hashes(text)
+        permuted = (hashes[:, None] * self._a[None, :] + self._b[None, :]) % np.uint64(_PRIME)
+        return permuted.min(axis=0)
+
+    @staticmethod
+    def _similarity(first: np.ndarray, second: np.ndarray) -> float:
+        """Estimated Jaccard similarity of the two shingle sets"""
+        return float(np.mean(first == second))
+
+    def cluster(self, texts: List[str]) -> List[List[int]]:
+        """Groups of two or more near-duplicate text indices"""
+        candidates = [i for i, text in enumerate(texts) if text and text.strip()]
+        if len(candidates) < 2:
+            return []
+
+        signatures = {i: self.signature(texts[i]) for i in candidates}
+
+        parent = {i: i for i in candidates}
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for band in range(self.bands):
+            start = band * self.rows
+            buckets: Dict[bytes, int] = {}
+            for i in candidates:
+                key = signatures[i][start:start + self.rows].tobytes()
+                representative = buckets.setdefault(key, i)
+                if representative == i:
+                    continue
+
+                root_i = find(i)
+                root_rep = find(representative)
+                if root_i == root_rep:
+                    continue
+
+                # compare the two cluster roots too, so clusters cannot drift
+                # apart through long chains of pairwise-similar members
+                if (
+                    self._similarity(signatures[i], signatures[representative]) >= self.threshold
+                    and self._similarity(signatures[root_i], signatures[root_rep]) >= self.threshold
+                ):
+                    parent[root_i] = root_rep
+
+        groups: Dict[int, List[int]] = {}
+        for i in candidates:
+            groups.setdefault(find(i), []).append(i)
+
+        clusters = sorted((group for group in groups.values() if len(group) > 1), key=len, reverse=True)
+        logger.debug(f"Clustered {len(candidates)} texts into {len(clusters)} campaign clusters")
+        return clusters
@@ -0,0 +1,157 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.models.records import CommentRecord
+from app.core.unicode_normalizer import UnicodeNormalizer
+
+logger = logging.getLogger(__name__)
+
+# separates comments in the concatenated corpus; stripped from texts and queries
+_SEPARATOR = "\x00"
+
+class SuffixArrayIndex:
+    """Suffix array over the lowercased, normalized comments of one video.
+
+    Built once in O(n log^2 n) with NumPy prefix doubling. A query binary-searches
+    the suffix range that starts with the pattern (O(m log n)) and maps that
+    range back to comments, so the cost does not grow with a scan of the corpus.
+    """
+
+    def __init__(self, comments: List[CommentRecord], normalizer: UnicodeNormalizer):
+        self.comments = comments
+        self.normalizer = normalizer
+        self.built_at = datetime.now()
+        self.content_key = self.content_key_for(comments)
+
+        texts = [
+            normalizer.normalize_text(comment.text).lower().replace(_SEPARATOR, " ")
+            for comment in comments
+        ]
+        self.corpus = _SEPARATOR.join(texts) + _SEPARATOR
+
+        lengths = np.fromiter((len(text) + 1 for text in texts), dtype=np.int64, count=len(texts))
+        self._owners = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+        self._suffix_array = self._build_suffix_array(self.corpus)
+
+    @staticmethod
+    def content_key_for(comments: List[CommentRecord]) -> int:
+        """Identifies the comment set an index was built from, including edits"""
+        return hash(tuple((comment.comment_id, comment.text) for comment in comments))
+
+    @staticmethod
+    def _build_suffix_array(corpus: str) -> np.ndarray:
+        n = len(corpus)
+        if n == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        rank = np.frombuffer(corpus.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+        step = 1
+        while True:
+            # rank of the suffix `step` characters later, -1 past the end
+            shifted = np.full(n, -1, dtype=np.int64)
+            if step < n:
+                shifted[:n - step] = rank[step:]
+            order = np.lexsort((shifted, rank))
+
+            sorted_rank = rank[order]
+            sorted_shifted = shifted[order]
+            boundaries = np.zeros(n, dtype=np.int64)
+            boundaries[1:] = (sorted_rank[1:] != sorted_rank[:-1]) | (sorted_shifted[1:] != sorted_shifted[:-1])
+
+            rank = np.empty(n, dtype=np.int64)
+            rank[order] = np.cumsum(boundaries)
+
+            if rank[order[-1]] == n - 1:
+                return order
+            step *= 2
+
+    def _bound(self, query: str, upper: bool) -> int:
+        corpus = self.corpus
+        suffix_array = self._suffix_array
+        m = len(query)
+        lo, hi = 0, len(suffix_array)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = int(suffix_array[mid])
+            prefix = corpus[start:start + m]
+            if prefix < query or (upper and prefix == query):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find(self, query: str) -> List[int]:
+        """Indices of comments whose normalized text contains query, in original order"""
+        normalized = self.normalizer.normalize_text(query).lower().replace(_SEPARATOR, "")
+        if not normalized:
+            return []
+
+        lo = self._bound(normalized, upper=False)
+        hi = self._bound(normalized, upper=True)
+        if lo >= hi:
+            return []
+
+        return np.unique(self._owners[self._suffix_array[lo:hi]]).tolist()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "comments": len(self.comments),
+            "chars": len(self.corpus),
+            "built_at": self.built_at.isoformat()
+        }
+
+class CorpusIndexStore:
+    """Per-video suffix-array indexes with LRU eviction"""
+
+    def __init__(self, max_videos: int = 16):
+        self._max_videos = max_videos
+        self._indexes: "OrderedDict[str, SuffixArrayIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._normalizer = UnicodeNormalizer()
+        logger.info(f"CorpusIndexStore initialized (max {max_videos} videos)")
+
+    def build(self, video_id: str, comments: List[CommentRecord]) -> SuffixArrayIndex:
+        with self._lock:
+            existing = self._indexes.get(video_id)
+            if existing and existing.content_key == SuffixArrayIndex.content_key_for(comments):
+                self._indexes.move_to_end(video_id)
+                return existing
+
+        start_time = time.time()
+        index = SuffixArrayIndex(comments, self._normalizer)
+        logger.info(f"Corpus index built for {video_id}: {len(comments)} comments, "
+                    f"{len(index.corpus)} chars in {time.time() - start_time:.3f}s")
+
+        with self._lock:
+            self._indexes[video_id] = index
+            self._indexes.move_to_end(video_id)
+            while len(self._indexes) > self._max_videos:
+                evicted, _ = self._indexes.popitem(last=False)
+                logger.info(f"Corpus index evicted: {evicted}")
+        return index
+
+    def get(self, video_id: str) -> Optional[SuffixArrayIndex]:
+        with self._lock:
+            index = self._indexes.get(video_id)
+            if index:
+                self._indexes.move_to_end(video_id)
+            return index
+
+    def has_index(self, video_id: str) -> bool:
+        with self._lock:
+            return video_id in self._indexes
+
+# Singleton instance
+_corpus_index_store = None
+
+def get_corpus_index_store() -> CorpusIndexStore:
+    global _corpus_index_store
+    if _corpus_index_store is None:
+        _corpus_index_store = CorpusIndexStore()
+    return _corpus_index_store
@@ -0,0 +1,84 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (matched_patterns, normalized_text, pattern_matches) of a judol comment, or None when clean
+CachedVerdict = Optional[Tuple[List[str], Optional[str], List[Tuple[str, str]]]]
+
+# returned by get() on a miss, since None is a valid (clean) verdict
+MISS = object()
+
+class DetectionCache:
+    """Bounded LRU of per-comment verdicts.
+
+    A verdict depends only on the raw comment text, the pattern set and the
+    detection settings, so the key is a digest of the text plus those. The
+    whole cache is dropped whenever the pattern-set version changes.
+    """
+
+    def __init__(self, max_entries: int = 50_000):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, CachedVerdict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(text: str, *settings: Hashable) -> Tuple:
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        return (digest,) + settings
+
+    def ensure_version(self, version: Optional[str]):
+        """Drop every cached verdict if the pattern set changed since the last call"""
+        with self._lock:
+            if version == self._version:
+                return
+            if self._entries:
+                self.invalidations += 1
+                logger.info(f"Detection cache invalidated: pattern set {self._version} -> {version}, "
+                            f"{len(self._entries)} entries dropped")
+            self._entries.clear()
+            self._version = version
+
+    def get(self, key: Tuple) -> Any:
+        with self._lock:
+            verdict = self._entries.get(key, MISS)
+            if verdict is MISS:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return verdict
+
+    def put(self, key: Tuple, verdict: CachedVerdict):
+        with self._lock:
+            self._entries[key] = verdict
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "pattern_version": self._version
+            }
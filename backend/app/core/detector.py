@@ -1,18 +1,40 @@
 import time
 import logging
 from typing import List, Dict, Optional, Any
-from app.models.schemas import CommentData, JudolComment, AlgorithmType
+from app.models.schemas import CampaignCluster, AlgorithmType, PatternType, DetectionMode, SpammerPolicy
+from app.models.records import CommentRecord, JudolHit
 from app.core.unicode_normalizer import UnicodeNormalizer
 from app.core.string_matching import StringMatchingFactory
 from app.core.pattern_manager import get_pattern_manager
+from app.core.prefilter import QGramPrefilter, PrefilterStats
+from app.core.algorithm_planner import get_algorithm_planner
+from app.core.campaign_clustering import CampaignClusterer
+from app.core.detection_cache import DetectionCache, CachedVerdict, MISS
+from app.core.author_reputation import get_author_reputation_index
+from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
 class JudolDetector:
+    # exact keyword matchers, for which a q-gram miss proves there is no match
+    PREFILTER_ALGORITHMS = {
+        AlgorithmType.KMP,
+        AlgorithmType.BOYER_MOORE,
+        AlgorithmType.WU_MANBER,
+        AlgorithmType.RABIN_KARP,
+        AlgorithmType.RABIN_KARP_VECTORIZED,
+    }
+    
     def __init__(self):
         self._normalizer = UnicodeNormalizer()
         self._pattern_manager = get_pattern_manager()
         self._string_matcher_factory = StringMatchingFactory()
+        self._planner = get_algorithm_planner()
+        self._clusterer = CampaignClusterer()
+        # (pattern tuple, prefilter), swapped as one so concurrent detections never mix them up
+        self._prefilter_entry: Optional[tuple] = None
+        self._result_cache = DetectionCache(get_settings().detection_cache_size)
+        self._reputation = get_author_reputation_index()
         logger.info("JudolDetector initialized")
 
     @property
@@ -22,30 +44,108 @@ class JudolDetector:
     @property
     def pattern_manager(self):
         return self._pattern_manager
+    
+    @property
+    def result_cache(self) -> DetectionCache:
+        return self._result_cache
+    
+    @property
+    def reputation(self):
+        return self._reputation
 
     def detect_judol_comments(
         self, 
-        comments: List[CommentData], 
+        comments: List[CommentRecord], 
         algorithm: AlgorithmType,
-        pattern_file_id: Optional[str] = None
+        pattern_file_id: Optional[str] = None,
+        detection_mode: DetectionMode = DetectionMode.FULL,
+        max_edits: int = 1,
+        cluster_campaigns: bool = False,
+        spammer_policy: SpammerPolicy = SpammerPolicy.IGNORE,
+        video_id: Optional[str] = None
     ) -> Dict[str, Any]:
         start_time = time.time()
         
         try:
+            plan = None
+            if algorithm == AlgorithmType.AUTO:
+                plan = self._plan_algorithm(comments, pattern_file_id)
+                algorithm = AlgorithmType(plan['chosen'])
+                logger.info(f"Planner chose {algorithm.value}: {plan['reason']}")
+            
             patterns = self._load_patterns_for_algorithm(algorithm, pattern_file_id)
             
-            matcher = self._create_matcher(algorithm)
+            matcher = self._create_matcher(algorithm, max_edits)
+            
+            prefilter = self._get_prefilter(patterns) if algorithm in self.PREFILTER_ALGORITHMS else None
+            prefilter_stats = PrefilterStats() if prefilter else None
             
-            judol_comments = self._process_comments(comments, patterns, matcher, algorithm)
+            self._result_cache.ensure_version(self.pattern_version())
+            cache_scope = (algorithm.value, detection_mode.value)
+            if algorithm == AlgorithmType.APPROXIMATE:
+                cache_scope += (max_edits,)
+            hits_before, misses_before = self._result_cache.hits, self._result_cache.misses
+            
+            known_spammer_ids = set()
+            if spammer_policy != SpammerPolicy.IGNORE:
+                known_spammer_ids = {
+                    comment.comment_id for comment in comments
+                    if self._reputation.is_known_spammer(comment.author_channel_id)
+                }
+            
+            to_match = comments
+            if spammer_policy == SpammerPolicy.SHORT_CIRCUIT and known_spammer_ids:
+                to_match = [comment for comment in comments if comment.comment_id not in known_spammer_ids]
+            
+            # filled by the matching pass so clustering can reuse its normalized texts
+            normalized_by_id = {} if cluster_campaigns else None
+            judol_comments = self._process_comments(
+                to_match, patterns, matcher, algorithm, detection_mode, prefilter, prefilter_stats, cache_scope,
+                normalized_by_id
+            )
+            
+            # matched hits only, so short-circuited comments never feed the reputation they came from
+            if video_id:
+                self._reputation.record_hits(video_id, judol_comments)
+            
+            reputation_stats = None
+            if spammer_policy != SpammerPolicy.IGNORE:
+                judol_comments = self._apply_spammer_policy(
+                    comments, judol_comments, known_spammer_ids, algorithm, spammer_policy
+                )
+                reputation_stats = self._reputation.stats()
+                reputation_stats['known_spammer_comments'] = len(known_spammer_ids)
+                reputation_stats['short_circuited'] = len(comments) - len(to_match)
+            
+            cache_stats = self._result_cache.stats()
+            cache_stats['request_hits'] = self._result_cache.hits - hits_before
+            cache_stats['request_misses'] = self._result_cache.misses - misses_before
+            
+            campaigns = None
+            if cluster_campaigns:
+                judol_comments, campaigns = self._cluster_campaigns(
+                    comments, judol_comments, algorithm, normalized_by_id
+                )
             
             processing_time = time.time() - start_time
             
+            patterns_used = patterns if patterns else ['default_regex_pattern']
+            if algorithm == AlgorithmType.HYBRID:
+                patterns_used = ['default_regex_pattern'] + patterns
+            
             result = {
                 'judol_comments': judol_comments,
                 'count': len(judol_comments),
                 'processing_time': processing_time,
                 'algorithm_used': algorithm.value,
-                'patterns_used': patterns if patterns else ['default_regex_pattern'],
+                'detection_mode': detection_mode.value,
+                'patterns_used': patterns_used,
+                'source_counts': self._count_sources(judol_comments) if hasattr(matcher, 'search_tagged') else None,
+                'prefilter_stats': prefilter_stats.to_dict() if prefilter_stats else None,
+                'planner': plan,
+                'campaigns': campaigns,
+                'cache_stats': cache_stats,
+                'reputation_stats': reputation_stats,
                 'total_comments_processed': len(comments)
             }
             
@@ -58,14 +158,21 @@ class JudolDetector:
             logger.error(f"Error in judol detection: {e}")
             raise
     
-    def upload_patterns(self, content: str, filename: str) -> Dict[str, Any]:
+    def upload_patterns(
+        self,
+        content: str,
+        filename: str,
+        pattern_type: PatternType = PatternType.KEYWORD
+    ) -> Dict[str, Any]:
         try:
-            validation_result = self._validate_pattern_content(content)
+            validation_result = self._validate_pattern_content(content, pattern_type)
             
             if not validation_result['valid']:
-                raise ValueError(validation_result['error'])
+                raise ValueError(validation_result.get('error') or "; ".join(
+                    f"{detail['pattern']}: {detail['error']}" for detail in validation_result['invalid_details']
+                ))
             
-            upload_result = self._pattern_manager.upload_patterns(content, filename)
+            upload_result = self._pattern_manager.upload_patterns(content, filename, pattern_type)
             
             logger.info(f"Pattern file uploaded: {filename} ({upload_result['patterns_count']} patterns)")
             return upload_result
@@ -80,18 +187,29 @@ class JudolDetector:
     def clear_patterns(self) -> bool:
         return self._pattern_manager.clear_current_file()
     
+    def get_patterns_for_algorithm(
+        self,
+        algorithm: AlgorithmType,
+        pattern_file_id: Optional[str] = None
+    ) -> Optional[List[str]]:
+        """Patterns an algorithm would run with; None means the default regex"""
+        return self._load_patterns_for_algorithm(algorithm, pattern_file_id)
+    
     def _load_patterns_for_algorithm(
         self, 
         algorithm: AlgorithmType, 
         pattern_file_id: Optional[str] = None
     ) -> Optional[List[str]]:
         if algorithm == AlgorithmType.REGEX:
-            return None 
+            return self._load_regex_patterns(pattern_file_id)
         
         if not pattern_file_id and not self._pattern_manager.has_patterns():
             raise ValueError(f"Pattern file required for {algorithm.value} algorithm")
         
         try:
+            if self._pattern_manager.get_pattern_type(pattern_file_id) == PatternType.REGEX:
+                raise ValueError(f"Regex pattern files can only be used with the {AlgorithmType.REGEX.value} algorithm")
+            
             patterns = self._pattern_manager.get_patterns(pattern_file_id)
             
             if not patterns:
@@ -104,29 +222,119 @@ class JudolDetector:
             logger.error(f"Error loading patterns: {e}")
             raise ValueError(f"Error loading pattern file: {str(e)}")
     
-    def _create_matcher(self, algorithm: AlgorithmType):
+    def _load_regex_patterns(self, pattern_file_id: Optional[str] = None) -> Optional[List[str]]:
+        """Regexes from an uploaded regex pattern file, or None for the default heuristic"""
+        if not self._pattern_manager.has_patterns():
+            if pattern_file_id:
+                raise ValueError(f"Pattern file not found: {pattern_file_id}")
+            return None
+        
         try:
-            return self._string_matcher_factory.create_matcher(algorithm.value)
+            if self._pattern_manager.get_pattern_type(pattern_file_id) != PatternType.REGEX:
+                if pattern_file_id:
+                    raise ValueError(f"Pattern file {pattern_file_id} does not contain regex patterns")
+                return None
+            return self._pattern_manager.get_patterns(pattern_file_id)
+        except Exception as e:
+            logger.error(f"Error loading regex patterns: {e}")
+            raise ValueError(f"Error loading pattern file: {str(e)}")
+    
+    def _plan_algorithm(
+        self,
+        comments: List[CommentRecord],
+        pattern_file_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        try:
+            has_keywords = (
+                self._pattern_manager.has_patterns()
+                and self._pattern_manager.get_pattern_type(pattern_file_id) == PatternType.KEYWORD
+            )
+            if not has_keywords:
+                return {
+                    'requested': AlgorithmType.AUTO.value,
+                    'chosen': AlgorithmType.REGEX.value,
+                    'reason': "No keyword pattern file loaded, using the regex algorithm"
+                }
+            
+            patterns = self._pattern_manager.get_patterns(pattern_file_id)
+        except Exception as e:
+            raise ValueError(f"Error loading pattern file: {str(e)}")
+        
+        plan = self._planner.plan(patterns, [len(comment.text) for comment in comments])
+        plan['requested'] = AlgorithmType.AUTO.value
+        return plan
+    
+    def pattern_version(self) -> str:
+        """Identifies the loaded pattern set; every upload gets a new file id"""
+        file_info = self._pattern_manager.get_current_file_info()
+        return file_info['file_id'] if file_info else 'default'
+    
+    def _get_prefilter(self, patterns: List[str]) -> QGramPrefilter:
+        key = tuple(patterns)
+        entry = self._prefilter_entry
+        if entry is None or entry[0] != key:
+            entry = (key, QGramPrefilter(patterns))
+            self._prefilter_entry = entry
+        return entry[1]
+    
+    def _create_matcher(self, algorithm: AlgorithmType, max_edits: int = 1):
+        options = {'max_edits': max_edits} if algorithm == AlgorithmType.APPROXIMATE else {}
+        try:
+            return self._string_matcher_factory.create_matcher(algorithm.value, **options)
         except Exception as e:
             logger.error(f"Error creating matcher for {algorithm.value}: {e}")
             raise ValueError(f"Unsupported algorithm: {algorithm.value}")
     
     def _process_comments(
         self,
-        comments: List[CommentData],
+        comments: List[CommentRecord],
         patterns: Optional[List[str]],
         matcher,
-        algorithm: AlgorithmType
-    ) -> List[JudolComment]:
+        algorithm: AlgorithmType,
+        detection_mode: DetectionMode = DetectionMode.FULL,
+        prefilter: Optional[QGramPrefilter] = None,
+        prefilter_stats: Optional[PrefilterStats] = None,
+        cache_scope: Optional[tuple] = None,
+        normalized_by_id: Optional[Dict[str, str]] = None
+    ) -> List[JudolHit]:
+        if hasattr(matcher, 'search_batch'):
+            return self._process_comments_batch(
+                comments, patterns, matcher, algorithm, detection_mode, prefilter, prefilter_stats, cache_scope,
+                normalized_by_id
+            )
+        
         judol_comments = []
         
         for comment in comments:
             try:
+                cache_key = None
+                if cache_scope is not None:
+                    cache_key = self._result_cache.make_key(comment.text, *cache_scope)
+                    cached = self._result_cache.get(cache_key)
+                    if cached is not MISS:
+                        if cached is not None:
+                            judol_comments.append(self._hit_from_cache(comment, cached, algorithm))
+                        continue
+                
                 normalized_text = self._normalizer.normalize_text(comment.text)
+                if normalized_by_id is not None:
+                    normalized_by_id[comment.comment_id] = normalized_text
                 
+                if prefilter and not self._passes_prefilter(normalized_text, prefilter, prefilter_stats):
+                    if cache_key:
+                        self._result_cache.put(cache_key, None)
+                    continue
+                
+                match_start = time.perf_counter()
                 detection_result = self._detect_patterns_in_comment(
-                    comment, normalized_text, patterns, matcher, algorithm
+                    comment, normalized_text, patterns, matcher, algorithm, detection_mode
                 )
+                if prefilter_stats:
+                    prefilter_stats.match_time += time.perf_counter() - match_start
+                    prefilter_stats.matched_candidates += 1
+                
+                if cache_key:
+                    self._result_cache.put(cache_key, self._verdict_of(detection_result))
                 
                 if detection_result:
                     judol_comments.append(detection_result)
@@ -137,22 +345,153 @@ class JudolDetector:
         
         return judol_comments
     
+    def _passes_prefilter(
+        self,
+        normalized_text: str,
+        prefilter: QGramPrefilter,
+        prefilter_stats: Optional[PrefilterStats]
+    ) -> bool:
+        prefilter_start = time.perf_counter()
+        candidate = prefilter.may_match(normalized_text)
+        if prefilter_stats:
+            prefilter_stats.prefilter_time += time.perf_counter() - prefilter_start
+            prefilter_stats.checked += 1
+            if not candidate:
+                prefilter_stats.rejected += 1
+        return candidate
+    
+    def _process_comments_batch(
+        self,
+        comments: List[CommentRecord],
+        patterns: Optional[List[str]],
+        matcher,
+        algorithm: AlgorithmType,
+        detection_mode: DetectionMode = DetectionMode.FULL,
+        prefilter: Optional[QGramPrefilter] = None,
+        prefilter_stats: Optional[PrefilterStats] = None,
+        cache_scope: Optional[tuple] = None,
+        normalized_by_id: Optional[Dict[str, str]] = None
+    ) -> List[JudolHit]:
+        verdict_only = detection_mode == DetectionMode.VERDICT
+        cached_hits = {}
+        candidates = []
+        normalized_texts = []
+        cache_keys = []
+        for comment in comments:
+            cache_key = None
+            if cache_scope is not None:
+                cache_key = self._result_cache.make_key(comment.text, *cache_scope)
+                cached = self._result_cache.get(cache_key)
+                if cached is not MISS:
+                    if cached is not None:
+                        cached_hits[comment.comment_id] = self._hit_from_cache(comment, cached, algorithm)
+                    continue
+            
+            try:
+                normalized_text = self._normalizer.normalize_text(comment.text)
+            except Exception as e:
+                logger.warning(f"Error normalizing comment {comment.comment_id}: {e}")
+                continue
+            if normalized_by_id is not None:
+                normalized_by_id[comment.comment_id] = normalized_text
+            
+            if prefilter and not self._passes_prefilter(normalized_text, prefilter, prefilter_stats):
+                if cache_key:
+                    self._result_cache.put(cache_key, None)
+                continue
+            
+            candidates.append(comment)
+            normalized_texts.append(normalized_text)
+            cache_keys.append(cache_key)
+        
+        match_start = time.perf_counter()
+        batch_results = matcher.search_batch(
+            normalized_texts,
+            patterns,
+            first_only=detection_mode == DetectionMode.FIRST_HIT,
+            stop_at_first=verdict_only
+        )
+        if prefilter_stats:
+            prefilter_stats.match_time += time.perf_counter() - match_start
+            prefilter_stats.matched_candidates += len(candidates)
+        
+        detected = {}
+        for comment, normalized_text, search_results, cache_key in zip(
+            candidates, normalized_texts, batch_results, cache_keys
+        ):
+            hit = None
+            matched_patterns = [pattern for pattern, positions in search_results if positions]
+            if matched_patterns:
+                hit = JudolHit(
+                    comment=comment,
+                    matched_patterns=matched_patterns[:1] if verdict_only else matched_patterns,
+                    normalized_text=None if verdict_only else normalized_text,
+                    detection_algorithm=algorithm
+                )
+                detected[comment.comment_id] = hit
+            if cache_key:
+                self._result_cache.put(cache_key, self._verdict_of(hit))
+        
+        # keep the original comment order across cached and freshly matched hits
+        judol_comments = []
+        for comment in comments:
+            hit = cached_hits.get(comment.comment_id) or detected.get(comment.comment_id)
+            if hit:
+                judol_comments.append(hit)
+        
+        return judol_comments
+    
+    @staticmethod
+    def _verdict_of(hit: Optional[JudolHit]) -> CachedVerdict:
+        if hit is None:
+            return None
+        return (hit.matched_patterns, hit.normalized_text, hit.pattern_matches)
+    
+    @staticmethod
+    def _hit_from_cache(comment: CommentRecord, verdict: CachedVerdict, algorithm: AlgorithmType) -> JudolHit:
+        matched_patterns, normalized_text, pattern_matches = verdict
+        return JudolHit(
+            comment=comment,
+            matched_patterns=list(matched_patterns),
+            normalized_text=normalized_text,
+            detection_algorithm=algorithm,
+            pattern_matches=list(pattern_matches)
+        )
+    
     def _detect_patterns_in_comment(
         self, 
-        comment: CommentData, 
+        comment: CommentRecord, 
         normalized_text: str, 
         patterns: Optional[List[str]],
         matcher,
-        algorithm: AlgorithmType
-    ) -> Optional[JudolComment]:
+        algorithm: AlgorithmType,
+        detection_mode: DetectionMode = DetectionMode.FULL
+    ) -> Optional[JudolHit]:
         try:
-            search_results = matcher.search(normalized_text, patterns)
+            if detection_mode == DetectionMode.VERDICT:
+                matched_pattern = matcher.find_any(normalized_text, patterns)
+                if matched_pattern is None:
+                    return None
+                return JudolHit(
+                    comment=comment,
+                    matched_patterns=[matched_pattern],
+                    detection_algorithm=algorithm
+                )
+            
+            first_only = detection_mode == DetectionMode.FIRST_HIT
+            
+            if hasattr(matcher, 'search_tagged'):
+                return self._detect_tagged_patterns_in_comment(
+                    comment, normalized_text, patterns, matcher, algorithm, first_only
+                )
+            
+            search_results = matcher.search(normalized_text, patterns, first_only=first_only)
             
             if search_results:
                 matched_patterns = [pattern for pattern, positions in search_results if positions]
                 
                 if matched_patterns:
-                    return JudolComment(
+                    return JudolHit(
                         comment=comment,
                         matched_patterns=matched_patterns,
                         normalized_text=normalized_text,
@@ -165,7 +504,132 @@ class JudolDetector:
             logger.warning(f"Error in pattern detection: {e}")
             return None
     
-    def _validate_pattern_content(self, content: str) -> Dict[str, Any]:
+    def _detect_tagged_patterns_in_comment(
+        self,
+        comment: CommentRecord,
+        normalized_text: str,
+        patterns: Optional[List[str]],
+        matcher,
+        algorithm: AlgorithmType,
+        first_only: bool = False
+    ) -> Optional[JudolHit]:
+        tagged_results = matcher.search_tagged(normalized_text, patterns, first_only)
+        pattern_matches = [
+            (pattern, source)
+            for pattern, positions, source in tagged_results if positions
+        ]
+        
+        if not pattern_matches:
+            return None
+        
+        return JudolHit(
+            comment=comment,
+            matched_patterns=[pattern for pattern, _ in pattern_matches],
+            normalized_text=normalized_text,
+            detection_algorithm=algorithm,
+            pattern_matches=pattern_matches
+        )
+    
+    def _apply_spammer_policy(
+        self,
+        comments: List[CommentRecord],
+        judol_comments: List[JudolHit],
+        known_spammer_ids: set,
+        algorithm: AlgorithmType,
+        spammer_policy: SpammerPolicy
+    ) -> List[JudolHit]:
+        """Mark hits from known spammers and, when short-circuiting, add their unmatched comments"""
+        if not known_spammer_ids:
+            return judol_comments
+        
+        for judol_comment in judol_comments:
+            if judol_comment.comment.comment_id in known_spammer_ids:
+                judol_comment.known_spammer = True
+        
+        if spammer_policy != SpammerPolicy.SHORT_CIRCUIT:
+            return judol_comments
+        
+        judol_by_id = {judol_comment.comment.comment_id: judol_comment for judol_comment in judol_comments}
+        ordered = []
+        for comment in comments:
+            if comment.comment_id in judol_by_id:
+                ordered.append(judol_by_id[comment.comment_id])
+            elif comment.comment_id in known_spammer_ids:
+                ordered.append(JudolHit(
+                    comment=comment,
+                    matched_patterns=[],
+                    detection_algorithm=algorithm,
+                    known_spammer=True
+                ))
+        return ordered
+    
+    def _cluster_campaigns(
+        self,
+        comments: List[CommentRecord],
+        judol_comments: List[JudolHit],
+        algorithm: AlgorithmType,
+        normalized_by_id: Optional[Dict[str, str]] = None
+    ) -> tuple:
+        """Cluster near-duplicate comments and flag every member of a cluster with a pattern-matched member.
+
+        Texts the matching pass already normalized are taken from `normalized_by_id`;
+        only cache hits and short-circuited comments are normalized here.
+        """
+        normalized_by_id = normalized_by_id or {}
+        normalized_texts = [
+            normalized_by_id.get(comment.comment_id) or self._normalizer.normalize_text(comment.text)
+            for comment in comments
+        ]
+        clusters = self._clusterer.cluster(normalized_texts)
+        
+        judol_by_id = {judol_comment.comment.comment_id: judol_comment for judol_comment in judol_comments}
+        campaigns = []
+        
+        for cluster_id, members in enumerate(clusters):
+            member_ids = [comments[i].comment_id for i in members]
+            detected = [comment_id for comment_id in member_ids if comment_id in judol_by_id]
+            # a known-spammer flag with no pattern match is reputation, not evidence about the text
+            sources = [comment_id for comment_id in detected if judol_by_id[comment_id].matched_patterns]
+            
+            for i in members:
+                comment_id = comments[i].comment_id
+                if comment_id in judol_by_id:
+                    judol_by_id[comment_id].cluster_id = cluster_id
+                elif sources:
+                    source = judol_by_id[sources[0]]
+                    judol_by_id[comment_id] = JudolHit(
+                        comment=comments[i],
+                        matched_patterns=source.matched_patterns,
+                        normalized_text=normalized_texts[i],
+                        detection_algorithm=algorithm,
+                        cluster_id=cluster_id,
+                        propagated_from=sources[0]
+                    )
+            
+            campaigns.append(CampaignCluster(
+                cluster_id=cluster_id,
+                size=len(members),
+                comment_ids=member_ids,
+                judol=bool(sources),
+                sample_text=comments[members[0]].text[:200]
+            ))
+        
+        ordered = [judol_by_id[comment.comment_id] for comment in comments if comment.comment_id in judol_by_id]
+        return ordered, campaigns
+    
+    def _count_sources(self, judol_comments: List[JudolHit]) -> Dict[str, int]:
+        """Number of flagged comments per match source"""
+        counts = {source.value: 0 for source in PatternType}
+        for judol_comment in judol_comments:
+            for source in {source for _, source in judol_comment.pattern_matches}:
+                counts[source] += 1
+        return counts
+    
+    def _validate_pattern_content(
+        self,
+        content: str,
+        pattern_type: PatternType = PatternType.KEYWORD
+    ) -> Dict[str, Any]:
         try:
             patterns = [line.strip() for line in content.split('\n') if line.strip()]
             
@@ -175,7 +639,7 @@ class JudolDetector:
                     'error': 'File is empty or contains no valid patterns'
                 }
             
-            validation_result = self._pattern_manager.validate_patterns(patterns)
+            validation_result = self._pattern_manager.validate_patterns(patterns, pattern_type)
             return validation_result
             
         except Exception as e:
@@ -0,0 +1,245 @@
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.records import JudolHit
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS detections (
+    comment_id TEXT PRIMARY KEY,
+    video_id TEXT NOT NULL,
+    author TEXT NOT NULL,
+    author_channel_id TEXT NOT NULL DEFAULT '',
+    text TEXT NOT NULL,
+    published_at TEXT,
+    algorithm TEXT NOT NULL,
+    first_detected_at REAL NOT NULL,
+    last_detected_at REAL NOT NULL,
+    times_detected INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_detections_video ON detections (video_id, last_detected_at);
+CREATE INDEX IF NOT EXISTS idx_detections_author ON detections (author, last_detected_at);
+CREATE INDEX IF NOT EXISTS idx_detections_time ON detections (last_detected_at);
+
+CREATE TABLE IF NOT EXISTS detection_patterns (
+    pattern TEXT NOT NULL,
+    comment_id TEXT NOT NULL,
+    PRIMARY KEY (pattern, comment_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_detection_patterns_comment ON detection_patterns (comment_id);
+"""
+
+# columns added after the first schema, as (name, definition)
+_MIGRATIONS = [
+    ("author_channel_id", "TEXT NOT NULL DEFAULT ''"),
+]
+
+_POST_MIGRATION_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_detections_channel ON detections (author_channel_id, last_detected_at);
+"""
+
+_UPSERT_DETECTION = """
+INSERT INTO detections (
+    comment_id, video_id, author, author_channel_id, text, published_at, algorithm,
+    first_detected_at, last_detected_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (comment_id) DO UPDATE SET
+    algorithm = excluded.algorithm,
+    last_detected_at = excluded.last_detected_at,
+    times_detected = times_detected + 1
+"""
+
+_INSERT_PATTERN = "INSERT OR IGNORE INTO detection_patterns (pattern, comment_id) VALUES (?, ?)"
+
+# queued by close() to stop the writer after the pending batches
+_STOP = object()
+
+class DetectionHistoryStore:
+    """Persistent history of judol verdicts in SQLite (WAL mode).
+
+    record() only enqueues the hits of a detection run; a background thread
+    drains the queue and writes up to `batch_size` runs per transaction, so
+    the request path never waits on disk. Queries open their own read
+    connection, which WAL lets run alongside the writer.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        batch_size: int = 50,
+        flush_interval: float = 0.5,
+        max_pending: int = 1000
+    ):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self.dropped_runs = 0
+
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            self._migrate(connection)
+
+        self._writer = threading.Thread(target=self._write_loop, name="detection-history-writer", daemon=True)
+        self._writer.start()
+        logger.info(f"DetectionHistoryStore initialized at {db_path}")
+
+    @staticmethod
+    def _migrate(connection: sqlite3.Connection):
+        columns = {row["name"] for row in connection.execute("PRAGMA table_info(detections)")}
+        for name, definition in _MIGRATIONS:
+            if name not in columns:
+                connection.execute(f"ALTER TABLE detections ADD COLUMN {name} {definition}")
+                logger.info(f"Detection history: added column {name}")
+        connection.executescript(_POST_MIGRATION_INDEXES)
+    
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, timeout=10)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def record(self, video_id: str, hits: List[JudolHit], algorithm: str):
+        """Queue the judol comments of one detection run for writing"""
+        if not hits:
+            return
+        try:
+            self._queue.put_nowait((video_id, hits, algorithm, time.time()))
+        except queue.Full:
+            self.dropped_runs += 1
+            logger.warning(f"Detection history queue full, dropped run for {video_id} ({len(hits)} hits)")
+
+    def close(self, timeout: float = 5.0):
+        """Write everything still queued and stop the writer thread"""
+        self._queue.put(_STOP)
+        self._writer.join(timeout)
+
+    def _write_loop(self):
+        connection = self._connect()
+        try:
+            stopping = False
+            while not stopping:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+
+                batch = [item]
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get(timeout=self.flush_interval)
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+
+                try:
+                    self._write_batch(connection, batch)
+                except Exception as e:
+                    logger.error(f"Failed to write detection history batch: {e}")
+        finally:
+            connection.close()
+
+    def _write_batch(self, connection: sqlite3.Connection, batch: List[Tuple]):
+        detection_rows = []
+        pattern_rows = []
+        for video_id, hits, algorithm, detected_at in batch:
+            for hit in hits:
+                comment = hit.comment
+                detection_rows.append((
+                    comment.comment_id, video_id, comment.author, comment.author_channel_id, comment.text,
+                    comment.published_at, algorithm, detected_at, detected_at
+                ))
+                pattern_rows.extend((pattern, comment.comment_id) for pattern in hit.matched_patterns)
+
+        with connection:
+            connection.executemany(_UPSERT_DETECTION, detection_rows)
+            connection.executemany(_INSERT_PATTERN, pattern_rows)
+        logger.debug(f"Detection history: wrote {len(detection_rows)} detections from {len(batch)} runs")
+
+    def _query(self, sql: str, params: tuple) -> List[Dict[str, Any]]:
+        connection = self._connect()
+        try:
+            return [dict(row) for row in connection.execute(sql, params)]
+        finally:
+            connection.close()
+
+    def top_authors(self, since: float, limit: int = 20) -> List[Dict[str, Any]]:
+        return self._query(
+            """
+            SELECT MAX(author) AS author, NULLIF(author_channel_id, '') AS author_channel_id,
+                   COUNT(*) AS judol_comments, COUNT(DISTINCT video_id) AS videos,
+                   MAX(last_detected_at) AS last_detected_at
+            FROM detections
+            WHERE last_detected_at >= ?
+            GROUP BY CASE WHEN author_channel_id = '' THEN author ELSE author_channel_id END
+            ORDER BY judol_comments DESC, last_detected_at DESC
+            LIMIT ?
+            """,
+            (since, limit)
+        )
+
+    def videos_by_pattern(self, pattern: str, since: float = 0.0, limit: int = 20) -> List[Dict[str, Any]]:
+        return self._query(
+            """
+            SELECT d.video_id, COUNT(*) AS judol_comments, MAX(d.last_detected_at) AS last_detected_at
+            FROM detection_patterns p
+            JOIN detections d ON d.comment_id = p.comment_id
+            WHERE p.pattern = ? AND d.last_detected_at >= ?
+            GROUP BY d.video_id
+            ORDER BY judol_comments DESC, last_detected_at DESC
+            LIMIT ?
+            """,
+            (pattern, since, limit)
+        )
+
+    def video_history(self, video_id: str, limit: int = 100) -> List[Dict[str, Any]]:
+        rows = self._query(
+            """
+            SELECT d.comment_id, d.author, d.author_channel_id, d.text, d.published_at, d.algorithm,
+                   d.first_detected_at, d.last_detected_at, d.times_detected,
+                   GROUP_CONCAT(p.pattern, char(31)) AS patterns
+            FROM detections d
+            LEFT JOIN detection_patterns p ON p.comment_id = d.comment_id
+            WHERE d.video_id = ?
+            GROUP BY d.comment_id
+            ORDER BY d.last_detected_at DESC
+            LIMIT ?
+            """,
+            (video_id, limit)
+        )
+        for row in rows:
+            patterns = row.pop("patterns")
+            row["matched_patterns"] = patterns.split("\x1f") if patterns else []
+        return rows
+
+    def stats(self) -> Dict[str, Any]:
+        counts = self._query(
+            "SELECT COUNT(*) AS detections, COUNT(DISTINCT video_id) AS videos, "
+            "COUNT(DISTINCT author) AS authors FROM detections",
+            ()
+        )[0]
+        counts["pending_runs"] = self._queue.qsize()
+        counts["dropped_runs"] = self.dropped_runs
+        return counts
+
+# Singleton instance
+_history_store = None
+
+def get_history_store() -> Optional[DetectionHistoryStore]:
+    """The shared store, or None when HISTORY_DB_PATH is set to an empty string"""
+    global _history_store
+    if _history_store is None:
+        db_path = get_settings().history_db_path
+        if not db_path:
+            return None
+        _history_store = DetectionHistoryStore(db_path)
+    return _history_store
@@ -0,0 +1,222 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.models.schemas import AlgorithmType
+from app.models.records import CommentRecord, JudolHit
+from app.core.unicode_normalizer import UnicodeNormalizer
+from app.core.string_matching import StringMatchingFactory
+from app.core.prefilter import QGramPrefilter
+from app.core.detector import JudolDetector
+from app.core.youtube_client import LiveChatEndedError
+from app.core.monitor import MonitorAlert
+
+logger = logging.getLogger(__name__)
+
+# consecutive failed polls before a session gives up
+_MAX_POLL_FAILURES = 5
+
+class StreamingDetector:
+    """Checks chat messages one at a time against a pattern set prepared once.
+
+    Every matcher caches its tables for the pattern set (compiled regex,
+    Wu-Manber and Rabin-Karp tables, or per-pattern KMP, Boyer-Moore and
+    Myers tables), and they are built here before the first message. Exact
+    keyword engines also get the detector's q-gram prefilter, so most clean
+    messages cost only normalization and one pass over their q-grams.
+    """
+
+    def __init__(self, algorithm: AlgorithmType, patterns: Optional[List[str]], latency_window: int = 1000):
+        self.algorithm = algorithm
+        self.patterns = patterns
+        self.normalizer = UnicodeNormalizer()
+        self.matcher = StringMatchingFactory.create_matcher(algorithm.value)
+        self.matcher.find_any("", patterns)
+        self.prefilter = (
+            QGramPrefilter(patterns) if patterns and algorithm in JudolDetector.PREFILTER_ALGORITHMS else None
+        )
+
+        self.processed = 0
+        self.flagged = 0
+        self._latencies: deque = deque(maxlen=latency_window)
+
+    def process(self, message: CommentRecord) -> Optional[JudolHit]:
+        start = time.perf_counter()
+        normalized_text = self.normalizer.normalize_text(message.text)
+        matched_pattern = None
+        if self.prefilter is None or self.prefilter.may_match(normalized_text):
+            matched_pattern = self.matcher.find_any(normalized_text, self.patterns)
+        self._latencies.append(time.perf_counter() - start)
+
+        self.processed += 1
+        if matched_pattern is None:
+            return None
+
+        self.flagged += 1
+        return JudolHit(
+            comment=message,
+            matched_patterns=[matched_pattern],
+            detection_algorithm=self.algorithm
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = np.array(self._latencies) * 1000 if self._latencies else np.zeros(1)
+        return {
+            "processed": self.processed,
+            "flagged": self.flagged,
+            "latency_p50_ms": round(float(np.percentile(latencies, 50)), 4),
+            "latency_p99_ms": round(float(np.percentile(latencies, 99)), 4),
+            "latency_max_ms": round(float(latencies.max()), 4)
+        }
+
+@dataclass
+class LiveChatSession:
+    video_id: str
+    algorithm: AlgorithmType
+    pattern_file_id: Optional[str] = None
+    live_chat_id: Optional[str] = None
+    page_token: Optional[str] = None
+    polling_interval: float = 5.0
+    pattern_version: Optional[str] = None
+    detector: Optional[StreamingDetector] = None
+    started_at: float = field(default_factory=time.time)
+    ended: bool = False
+    last_error: Optional[str] = None
+    stop_event: threading.Event = field(default_factory=threading.Event)
+    thread: Optional[threading.Thread] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "video_id": self.video_id,
+            "live_chat_id": self.live_chat_id,
+            "algorithm": self.algorithm.value,
+            "polling_interval_seconds": self.polling_interval,
+            "running": self.thread is not None and self.thread.is_alive(),
+            "ended": self.ended,
+            "last_error": self.last_error,
+            "detector": self.detector.stats() if self.detector else None
+        }
+
+class LiveChatWatcher:
+    """Follows live chats and flags judol messages as they arrive.
+
+    Every chat is polled in its own thread with liveChatMessages.list, waiting
+    the pollingIntervalMillis the API returns between pages. The page token is
+    kept on the session, so restarting a stopped chat resumes where it left off.
+    Judol messages are handed to `on_alert` in one MonitorAlert per page.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable,
+        on_alert: Callable[[MonitorAlert], None],
+        detector: Optional[JudolDetector] = None
+    ):
+        self._client_factory = client_factory
+        self._on_alert = on_alert
+        self._detector = detector or JudolDetector()
+        self._sessions: Dict[str, LiveChatSession] = {}
+        self._lock = threading.Lock()
+
+    def start(
+        self,
+        video_id: str,
+        algorithm: AlgorithmType = AlgorithmType.REGEX,
+        pattern_file_id: Optional[str] = None
+    ) -> LiveChatSession:
+        with self._lock:
+            session = self._sessions.get(video_id)
+            if session and session.thread and session.thread.is_alive():
+                return session
+
+            if session is None or session.ended or session.algorithm != algorithm:
+                session = LiveChatSession(video_id=video_id, algorithm=algorithm, pattern_file_id=pattern_file_id)
+                self._sessions[video_id] = session
+
+            session.pattern_file_id = pattern_file_id
+            session.stop_event.clear()
+            self._refresh_detector(session)
+            session.thread = threading.Thread(
+                target=lambda: asyncio.run(self._follow(session)), name=f"live-chat-{video_id}", daemon=True
+            )
+            session.thread.start()
+
+        logger.info(f"Following live chat of {video_id} with {algorithm.value}")
+        return session
+
+    def stop(self, video_id: str, timeout: float = 5.0) -> bool:
+        with self._lock:
+            session = self._sessions.get(video_id)
+        if session is None:
+            return False
+        session.stop_event.set()
+        if session.thread:
+            session.thread.join(timeout)
+        return True
+
+    def stop_all(self, timeout: float = 5.0):
+        """Signal every session first, so shutdown waits one timeout rather than one per chat"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            session.stop_event.set()
+        deadline = time.time() + timeout
+        for session in sessions:
+            if session.thread:
+                session.thread.join(max(0.0, deadline - time.time()))
+
+    def status(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [session.to_dict() for session in self._sessions.values()]
+
+    def _refresh_detector(self, session: LiveChatSession):
+        """Rebuild the streaming detector only when the loaded pattern set changed"""
+        version = self._detector.pattern_version()
+        if session.detector is None or version != session.pattern_version:
+            patterns = self._detector.get_patterns_for_algorithm(session.algorithm, session.pattern_file_id)
+            session.detector = StreamingDetector(session.algorithm, patterns)
+            session.pattern_version = version
+
+    async def _follow(self, session: LiveChatSession):
+        failures = 0
+        while not session.stop_event.is_set():
+            try:
+                client = self._client_factory()
+                if not session.live_chat_id:
+                    session.live_chat_id = await client.get_live_chat_id(session.video_id)
+
+                messages, session.page_token, interval_ms = await client.get_live_chat_messages(
+                    session.live_chat_id, session.page_token
+                )
+                session.polling_interval = interval_ms / 1000
+                failures = 0
+                session.last_error = None
+
+                self._refresh_detector(session)
+                hits = []
+                for message in messages:
+                    hit = session.detector.process(message)
+                    if hit:
+                        hits.append(hit)
+                if hits:
+                    self._on_alert(MonitorAlert(session.video_id, hits, len(messages), time.time()))
+
+            except LiveChatEndedError as e:
+                logger.info(f"Live chat of {session.video_id} ended: {e}")
+                session.ended = True
+                session.last_error = str(e)
+                return
+            except Exception as e:
+                failures += 1
+                session.last_error = str(e)
+                logger.warning(f"Live chat poll failed for {session.video_id} ({failures}/{_MAX_POLL_FAILURES}): {e}")
+                if failures >= _MAX_POLL_FAILURES:
+                    return
+
+            session.stop_event.wait(session.polling_interval)
@@ -0,0 +1,343 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+from app.models.schemas import AlgorithmType, DetectionMode
+from app.models.records import JudolHit
+from app.core.detector import JudolDetector
+from app.core.history_store import get_history_store
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# YouTube Data API quotas reset at midnight Pacific time
+_QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+# comment ids remembered per video to skip comments sharing the watermark second
+_RECENT_IDS = 1000
+
+@dataclass
+class MonitorAlert:
+    video_id: str
+    hits: List[JudolHit]
+    new_comments: int
+    detected_at: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "video_id": self.video_id,
+            "new_comments": self.new_comments,
+            "judol_count": len(self.hits),
+            "judol_comment_ids": [hit.comment.comment_id for hit in self.hits],
+            "detected_at": datetime.fromtimestamp(self.detected_at).isoformat()
+        }
+
+@dataclass
+class WatchedVideo:
+    video_id: str
+    algorithm: AlgorithmType
+    pattern_file_id: Optional[str] = None
+    min_interval: float = 60.0
+    max_interval: float = 1800.0
+    alert_on_backlog: bool = False
+    interval: float = 60.0
+    next_poll_at: float = 0.0
+    last_polled_at: Optional[float] = None
+    watermark: Optional[str] = None
+    recent_ids: "OrderedDict[str, None]" = field(default_factory=OrderedDict)
+    velocity: float = 0.0
+    polls: int = 0
+    new_comments: int = 0
+    judol_comments: int = 0
+    last_error: Optional[str] = None
+
+    def remember(self, comment_ids: List[str]):
+        for comment_id in comment_ids:
+            self.recent_ids[comment_id] = None
+        while len(self.recent_ids) > _RECENT_IDS:
+            self.recent_ids.popitem(last=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "video_id": self.video_id,
+            "algorithm": self.algorithm.value,
+            "interval_seconds": round(self.interval, 1),
+            "next_poll_in": round(max(0.0, self.next_poll_at - time.time()), 1),
+            "comments_per_minute": round(self.velocity * 60, 2),
+            "polls": self.polls,
+            "new_comments": self.new_comments,
+            "judol_comments": self.judol_comments,
+            "last_error": self.last_error
+        }
+
+class QuotaBudget:
+    """API units the monitor may spend per quota day"""
+
+    def __init__(self, daily_units: int):
+        self.daily_units = daily_units
+        self.used = 0
+        self._day = self._quota_day()
+
+    @staticmethod
+    def _quota_day():
+        return datetime.now(_QUOTA_TIMEZONE).date()
+
+    def _roll_over(self):
+        today = self._quota_day()
+        if today != self._day:
+            self._day = today
+            self.used = 0
+
+    def spend(self, units: int):
+        self._roll_over()
+        self.used += units
+
+    def remaining(self) -> int:
+        self._roll_over()
+        return max(0, self.daily_units - self.used)
+
+    def seconds_until_reset(self) -> float:
+        now = datetime.now(_QUOTA_TIMEZONE)
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), _QUOTA_TIMEZONE)
+        return max(1.0, (midnight - now).total_seconds())
+
+    def sustainable_rate(self) -> float:
+        """Units per second that spread the remaining budget until the reset"""
+        return self.remaining() / self.seconds_until_reset()
+
+class MonitorScheduler:
+    """Polls watched videos for new comments and alerts on judol ones.
+
+    Each video is polled on its own interval, aiming for about
+    `target_comments_per_poll` new comments per poll at the video's observed
+    comment velocity, within [min_interval, max_interval]. When all videos
+    together would spend quota faster than the remaining daily budget allows,
+    every interval is stretched by the same factor.
+
+    The first poll of a video only records the comments already there, as
+    the baseline for later polls, unless the video was watched with
+    `alert_on_backlog`.
+
+    Runs in its own thread and event loop, since the YouTube client blocks
+    while a request is in flight.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable,
+        detector: Optional[JudolDetector] = None,
+        daily_quota: Optional[int] = None,
+        target_comments_per_poll: int = 20,
+        tick: float = 1.0
+    ):
+        settings = get_settings()
+        if daily_quota is None:
+            daily_quota = int(settings.youtube_daily_quota * settings.monitor_quota_share)
+
+        self._client_factory = client_factory
+        self._detector = detector or JudolDetector()
+        self.budget = QuotaBudget(daily_quota)
+        self.target_comments_per_poll = target_comments_per_poll
+        self.tick = tick
+
+        self._videos: Dict[str, WatchedVideo] = {}
+        self._lock = threading.Lock()
+        self._alert_hooks: List[Callable[[MonitorAlert], None]] = [self._log_alert]
+        self._alerts: deque = deque(maxlen=200)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_alert_hook(self, hook: Callable[[MonitorAlert], None]):
+        self._alert_hooks.append(hook)
+
+    def remove_alert_hook(self, hook: Callable[[MonitorAlert], None]):
+        if hook in self._alert_hooks:
+            self._alert_hooks.remove(hook)
+
+    def watch(
+        self,
+        video_id: str,
+        algorithm: AlgorithmType = AlgorithmType.REGEX,
+        pattern_file_id: Optional[str] = None,
+        min_interval: float = 60.0,
+        max_interval: float = 1800.0,
+        alert_on_backlog: bool = False
+    ) -> WatchedVideo:
+        if min_interval > max_interval:
+            raise ValueError("min_interval cannot be greater than max_interval")
+
+        with self._lock:
+            video = WatchedVideo(
+                video_id=video_id,
+                algorithm=algorithm,
+                pattern_file_id=pattern_file_id,
+                min_interval=min_interval,
+                max_interval=max_interval,
+                alert_on_backlog=alert_on_backlog,
+                interval=min_interval,
+                next_poll_at=time.time()
+            )
+            self._videos[video_id] = video
+
+        logger.info(f"Monitoring {video_id} with {algorithm.value} every {min_interval:.0f}-{max_interval:.0f}s")
+        self.start()
+        return video
+
+    def unwatch(self, video_id: str) -> bool:
+        with self._lock:
+            return self._videos.pop(video_id, None) is not None
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            videos = [video.to_dict() for video in self._videos.values()]
+        stretch = self._stretch_factor()
+        return {
+            "running": self.is_running(),
+            "videos": videos,
+            "quota": {
+                "daily_units": self.budget.daily_units,
+                "used": self.budget.used,
+                "remaining": self.budget.remaining(),
+                "stretch_factor": round(stretch, 2) if stretch != float("inf") else None
+            }
+        }
+
+    def recent_alerts(self, limit: int = 50) -> List[Dict[str, Any]]:
+        return [alert.to_dict() for alert in list(self._alerts)[-limit:]]
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._run()), name="video-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    async def _run(self):
+        logger.info("Monitor scheduler started")
+        while not self._stop.is_set():
+            now = time.time()
+            with self._lock:
+                due = [video for video in self._videos.values() if video.next_poll_at <= now]
+            for video in due:
+                if self._stop.is_set():
+                    break
+                await self.poll(video)
+            await asyncio.sleep(self.tick)
+        logger.info("Monitor scheduler stopped")
+
+    async def poll(self, video: WatchedVideo) -> Optional[MonitorAlert]:
+        """Fetch and check the comments that arrived since the last poll, then reschedule"""
+        now = time.time()
+        if self.budget.remaining() <= 0:
+            video.next_poll_at = now + self.budget.seconds_until_reset()
+            video.last_error = "Monitor quota exhausted until the daily reset"
+            return None
+
+        alert = None
+        new_count = 0
+        try:
+            client = self._client_factory()
+            first_poll = video.watermark is None
+            comments, pages = await client.get_new_comments(
+                video.video_id,
+                since=video.watermark,
+                seen_ids=set(video.recent_ids),
+                max_results=100 if first_poll else 500
+            )
+            self.budget.spend(pages)
+            new_count = len(comments)
+
+            if comments:
+                video.watermark = max(comment.published_at for comment in comments)
+                video.remember([comment.comment_id for comment in comments])
+                if not first_poll or video.alert_on_backlog:
+                    alert = self._detect(video, comments)
+            video.last_error = None
+
+        except Exception as e:
+            logger.warning(f"Monitor poll failed for {video.video_id}: {e}")
+            video.last_error = str(e)
+
+        if video.last_polled_at is not None:
+            elapsed = max(1.0, now - video.last_polled_at)
+            video.velocity = 0.5 * video.velocity + 0.5 * (new_count / elapsed)
+        video.last_polled_at = now
+        video.polls += 1
+        video.new_comments += new_count
+
+        # with no quota left the stretch is unbounded; the budget refills at the reset
+        video.interval = self._next_interval(video)
+        video.next_poll_at = now + min(video.interval * self._stretch_factor(), self.budget.seconds_until_reset())
+        return alert
+
+    def _detect(self, video: WatchedVideo, comments) -> Optional[MonitorAlert]:
+        result = self._detector.detect_judol_comments(
+            comments=comments,
+            algorithm=video.algorithm,
+            pattern_file_id=video.pattern_file_id,
+            detection_mode=DetectionMode.FIRST_HIT,
+            video_id=video.video_id
+        )
+        hits = result['judol_comments']
+        if not hits:
+            return None
+
+        video.judol_comments += len(hits)
+        alert = MonitorAlert(video.video_id, hits, len(comments), time.time())
+        self.raise_alert(alert)
+        return alert
+
+    def raise_alert(self, alert: MonitorAlert):
+        """Record an alert in the history store and pass it to every hook"""
+        history_store = get_history_store()
+        if history_store:
+            history_store.record(alert.video_id, alert.hits, alert.hits[0].detection_algorithm.value)
+
+        self._alerts.append(alert)
+        for hook in list(self._alert_hooks):
+            try:
+                hook(alert)
+            except Exception as e:
+                logger.error(f"Monitor alert hook {getattr(hook, '__name__', hook)} failed: {e}")
+
+    def _next_interval(self, video: WatchedVideo) -> float:
+        if video.velocity > 0:
+            interval = self.target_comments_per_poll / video.velocity
+        else:
+            interval = video.interval * 1.5
+        return min(video.max_interval, max(video.min_interval, interval))
+
+    def _stretch_factor(self) -> float:
+        """How much to lengthen every interval so polling fits the remaining quota"""
+        with self._lock:
+            # one commentThreads.list unit per poll, or more for busy videos
+            planned = sum(
+                max(1.0, video.velocity * video.interval / 100) / video.interval
+                for video in self._videos.values()
+            )
+        sustainable = self.budget.sustainable_rate()
+        if planned == 0:
+            return 1.0
+        if sustainable == 0:
+            return float("inf")
+        return max(1.0, planned / sustainable)
+
+    @staticmethod
+    def _log_alert(alert: MonitorAlert):
+        logger.warning(f"Judol alert on {alert.video_id}: {len(alert.hits)} of "
+                       f"{alert.new_comments} new comments")
@@ -3,6 +3,8 @@ import uuid
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from datetime import datetime
+from app.models.schemas import PatternType
+from app.core.string_matching import RegexMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +15,7 @@ class PatternFile:
     patterns: List[str]
     upload_time: datetime
     patterns_count: int
+    pattern_type: PatternType = PatternType.KEYWORD
 
 class PatternManager:
     
@@ -20,7 +23,12 @@ class PatternManager:
         self._current_pattern_file: Optional[PatternFile] = None
         logger.info("PatternManager initialized")
     
-    def upload_patterns(self, content: str, filename: str) -> Dict[str, Any]:
+    def upload_patterns(
+        self,
+        content: str,
+        filename: str,
+        pattern_type: PatternType = PatternType.KEYWORD
+    ) -> Dict[str, Any]:
         try:
             if self._current_pattern_file:
                 old_filename = self._current_pattern_file.filename
@@ -39,7 +47,8 @@ class PatternManager:
                 filename=filename,
                 patterns=unique_patterns,
                 upload_time=datetime.now(),
-                patterns_count=len(unique_patterns)
+                patterns_count=len(unique_patterns),
+                pattern_type=pattern_type
             )
             
             self._current_pattern_file = pattern_file
@@ -52,6 +61,7 @@ class PatternManager:
                 "filename": filename,
                 "patterns_count": len(unique_patterns),
                 "patterns": unique_patterns,
+                "pattern_type": pattern_type.value,
                 "upload_time": pattern_file.upload_time.isoformat()
             }
             
@@ -69,6 +79,15 @@ class PatternManager:
         logger.debug(f"Retrieved {len(self._current_pattern_file.patterns)} patterns")
         return self._current_pattern_file.patterns
     
+    def get_pattern_type(self, file_id: str = None) -> PatternType:
+        if not self._current_pattern_file:
+            raise ValueError("No pattern file currently loaded")
+        
+        if file_id and file_id != self._current_pattern_file.file_id:
+            raise ValueError(f"Pattern file not found: {file_id}")
+        
+        return self._current_pattern_file.pattern_type
+    
     def get_current_file_info(self) -> Optional[Dict[str, Any]]:
         if not self._current_pattern_file:
             return None
@@ -77,6 +96,7 @@ class PatternManager:
             "file_id": self._current_pattern_file.file_id,
             "filename": self._current_pattern_file.filename,
             "patterns_count": self._current_pattern_file.patterns_count,
+            "pattern_type": self._current_pattern_file.pattern_type.value,
             "upload_time": self._current_pattern_file.upload_time.isoformat()
         }
     
@@ -89,7 +109,11 @@ class PatternManager:
         logger.info(f"Pattern file cleared: {filename}")
         return True
     
-    def validate_patterns(self, patterns: List[str]) -> Dict[str, Any]:
+    def validate_patterns(
+        self,
+        patterns: List[str],
+        pattern_type: PatternType = PatternType.KEYWORD
+    ) -> Dict[str, Any]:
         if not patterns:
             return {"valid": False, "error": "No patterns provided"}
         
@@ -103,7 +127,17 @@ class PatternManager:
             elif len(pattern) > 1000:
                 invalid_patterns.append({"pattern": pattern, "error": "Pattern too long (max 1000 chars)"})
             else:
-                valid_patterns.append(pattern)
+                error = RegexMatcher.validate_pattern(pattern) if pattern_type == PatternType.REGEX else None
+                if error:
+                    invalid_patterns.append({"pattern": pattern, "error": error})
+                else:
+                    valid_patterns.append(pattern)
+        
+        if pattern_type == PatternType.REGEX and valid_patterns and not invalid_patterns:
+            try:
+                RegexMatcher.compile_patterns(valid_patterns)
+            except Exception as e:
+                invalid_patterns.append({"pattern": "<combined>", "error": f"Regexes cannot be combined: {e}"})
         
         return {
             "valid": len(invalid_patterns) == 0,
@@ -0,0 +1,53 @@
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PrefilterStats:
+    checked: int = 0
+    rejected: int = 0
+    prefilter_time: float = 0.0
+    match_time: float = 0.0
+    matched_candidates: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        average_match_time = self.match_time / self.matched_candidates if self.matched_candidates else 0.0
+        return {
+            "checked": self.checked,
+            "rejected": self.rejected,
+            "rejection_rate": self.rejected / self.checked if self.checked else 0.0,
+            "prefilter_time": self.prefilter_time,
+            "estimated_time_saved": max(0.0, self.rejected * average_match_time - self.prefilter_time)
+        }
+
+class QGramPrefilter:
+    """Cheap necessary condition for exact keyword matches.
+
+    Each pattern contributes one representative q-gram, its first q characters.
+    A text that contains none of them cannot contain any pattern, so it can
+    skip the full matcher. Built once per pattern set.
+    """
+
+    def __init__(self, patterns: List[str], q: int = 3):
+        lowered = [pattern.strip().lower() for pattern in patterns if pattern.strip()]
+        self.q = min([q] + [len(pattern) for pattern in lowered]) if lowered else 0
+        self._grams = frozenset(pattern[:self.q] for pattern in lowered)
+        logger.debug(f"QGramPrefilter built: q={self.q}, {len(self._grams)} grams")
+
+    def may_match(self, text: str) -> bool:
+        if not self.q:
+            return True
+
+        text_lower = text.lower()
+        grams = self._grams
+        q = self.q
+
+        if q == 1:
+            return any(char in grams for char in text_lower)
+
+        for i in range(len(text_lower) - q + 1):
+            if text_lower[i:i + q] in grams:
+                return True
+        return False
@@ -0,0 +1,80 @@
+import base64
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.records import JudolHit
+from app.models.schemas import ResponseView
+
+logger = logging.getLogger(__name__)
+
+@dataclass(slots=True)
+class StoredResult:
+    hits: List[JudolHit]
+    summary: Dict[str, Any]
+    view: ResponseView
+    page_size: int
+    created_at: float
+
+class DetectionResultStore:
+    """Keeps paged detection results so later pages are served without re-detecting.
+
+    A cursor encodes the result id and the offset of the next page; results
+    expire after `ttl_seconds` and the oldest are evicted beyond `max_results`.
+    """
+
+    def __init__(self, max_results: int = 32, ttl_seconds: int = 15 * 60):
+        self._max_results = max_results
+        self._ttl_seconds = ttl_seconds
+        self._results: "OrderedDict[str, StoredResult]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def encode_cursor(result_id: str, offset: int) -> str:
+        raw = f"{result_id}:{offset}".encode("ascii")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, int]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            result_id, offset = base64.urlsafe_b64decode(padded).decode("ascii").split(":")
+            return result_id, int(offset)
+        except Exception:
+            raise ValueError("Invalid cursor")
+
+    def put(self, hits: List[JudolHit], summary: Dict[str, Any], view: ResponseView, page_size: int) -> str:
+        result_id = uuid.uuid4().hex
+        with self._lock:
+            self._evict_expired()
+            self._results[result_id] = StoredResult(hits, summary, view, page_size, time.time())
+            while len(self._results) > self._max_results:
+                self._results.popitem(last=False)
+        return result_id
+
+    def get(self, result_id: str) -> Optional[StoredResult]:
+        with self._lock:
+            self._evict_expired()
+            return self._results.get(result_id)
+
+    def _evict_expired(self):
+        cutoff = time.time() - self._ttl_seconds
+        while self._results:
+            oldest_id, oldest = next(iter(self._results.items()))
+            if oldest.created_at >= cutoff:
+                break
+            del self._results[oldest_id]
+            logger.debug(f"Detection result expired: {oldest_id}")
+
+# Singleton instance
+_result_store = None
+
+def get_result_store() -> DetectionResultStore:
+    global _result_store
+    if _result_store is None:
+        _result_store = DetectionResultStore()
+    return _result_store
@@ -0,0 +1,43 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """Shares one in-flight call among concurrent callers with the same key.
+
+    The first caller for a key starts the call as a task; callers arriving
+    while it runs await the same task instead of starting their own. The key
+    is forgotten as soon as the call finishes, so results are never reused
+    afterwards and nothing goes stale. The task is shielded, so one caller
+    giving up (e.g. a client disconnect) does not cancel it for the others.
+    Results are shared objects and must be treated as read-only.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.started = 0
+        self.shared = 0
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+            self.started += 1
+        else:
+            self.shared += 1
+            logger.debug(f"{self.name}: joined in-flight call for {key}")
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self.started + self.shared
+        return {
+            "in_flight": len(self._calls),
+            "started": self.started,
+            "shared": self.shared,
+            "shared_rate": self.shared / calls if calls else 0.0
+        }
@@ -1,40 +1,261 @@
 import re
-from typing import List, Tuple, Optional
+import logging
+from typing import Any, Dict, List, Tuple, Optional
 from abc import ABC, abstractmethod
+import numpy as np
+import regex
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+logger = logging.getLogger(__name__)
 
 class StringMatcher(ABC):
     
     @abstractmethod
-    def search(self, text: str, patterns: List[str]) -> List[Tuple[str, List[int]]]:
+    def search(self, text: str, patterns: List[str], first_only: bool = False) -> List[Tuple[str, List[int]]]:
+        """Positions of every pattern in text; with first_only, only each pattern's first hit"""
         pass
+    
+    def find_any(self, text: str, patterns: List[str]) -> Optional[str]:
+        """First pattern found in text, stopping at the first hit"""
+        for pattern in patterns:
+            if self.search(text, [pattern], first_only=True):
+                return pattern.strip()
+        return None
 
-class RegexMatcher(StringMatcher):
+class SinglePatternMatcher(StringMatcher):
+    """Base for matchers that scan for one pattern at a time.
+
+    Each pattern's search table is built once per pattern set and reused for
+    every text, so a long-lived matcher (the live chat detector) or a large
+    batch pays for table construction only once.
+    """
+    
     def __init__(self):
-        self.gambling_pattern = r'\b[a-zA-Z]+\d{2,3}\b'
+        self._table_key: Optional[Tuple[str, ...]] = None
+        self._tables: List[Tuple[str, str, Any]] = []
+    
+    @abstractmethod
+    def _prepare(self, pattern: str) -> Any:
+        """Search table for a lowercased pattern, or None if it can never match"""
+    
+    @abstractmethod
+    def _search_one(self, text: str, pattern: str, table: Any, first_only: bool = False) -> List[int]:
+        """Positions of a lowercased pattern in a lowercased text"""
     
-    def search(self, text: str, patterns: List[str] = None) -> List[Tuple[str, List[int]]]:
+    def _get_tables(self, patterns: List[str]) -> List[Tuple[str, str, Any]]:
+        key = tuple(patterns)
+        if key != self._table_key:
+            tables = []
+            for pattern in patterns:
+                stripped = pattern.strip()
+                if not stripped:
+                    continue
+                lowered = stripped.lower()
+                table = self._prepare(lowered)
+                if table is not None:
+                    tables.append((stripped, lowered, table))
+            self._tables = tables
+            self._table_key = key
+        return self._tables
+    
+    def search(self, text: str, patterns: List[str], first_only: bool = False) -> List[Tuple[str, List[int]]]:
+        text_lower = text.lower()
         results = []
+        for stripped, lowered, table in self._get_tables(patterns):
+            positions = self._search_one(text_lower, lowered, table, first_only)
+            if positions:
+                results.append((stripped, positions))
+        return results
+    
+    def find_any(self, text: str, patterns: List[str]) -> Optional[str]:
+        text_lower = text.lower()
+        for stripped, lowered, table in self._get_tables(patterns):
+            if self._search_one(text_lower, lowered, table, first_only=True):
+                return stripped
+        return None
+
+class RegexMatcher(StringMatcher):
+    """Default gambling heuristic, or a combined engine over a regex pattern file.
+
+    User regexes are joined into one alternation of named groups and compiled
+    once per pattern set, so each comment is scanned a single time. Scans run
+    with a time budget; a scan that exceeds it keeps the matches found so far.
+    """
+    
+    # adversarial inputs used to probe uploaded regexes for slow backtracking
+    _PROBE_INPUTS = ('a' * 64 + '!', '1' * 64 + '!', ' ' * 64 + '!', 'a1 ' * 32 + '!', 'é' * 64 + '!')
+    
+    # regex-module escapes and POSIX classes that each stand for one character;
+    # the stdlib parser used for the structural checks only needs their shape
+    _SINGLE_CHAR_SYNTAX = regex.compile(r'(?<!\\)(?:\\[pP]\{[^}]*\}|\\[pP][A-Za-z]|\\X|\[:\^?[a-z]+:\])')
+    
+    def __init__(self, timeout: float = 0.05):
+        self.gambling_pattern = re.compile(r'\b[a-zA-Z]+\d{2,3}\b', re.IGNORECASE)
+        self.timeout = timeout
+        self._compiled_key: Optional[Tuple[str, ...]] = None
+        self._compiled_patterns: Optional[Tuple["regex.Pattern", Dict[str, str]]] = None
+    
+    @staticmethod
+    def _group_name(index: int) -> str:
+        return f"_judol_{index}"
+    
+    @classmethod
+    def compile_patterns(cls, patterns: List[str]) -> Tuple["regex.Pattern", Dict[str, str]]:
+        """Compile regexes into one alternation, returning it with group name -> regex"""
+        group_sources: Dict[str, str] = {}
+        alternatives = []
+        for pattern in dict.fromkeys(p.strip() for p in patterns if p.strip()):
+            name = cls._group_name(len(group_sources))
+            group_sources[name] = pattern
+            alternatives.append(f"(?P<{name}>{pattern})")
         
-        matches = []
-        matched_strings = []
-        for match in re.finditer(self.gambling_pattern, text, re.IGNORECASE):
-            matches.append(match.start())
-            matched_strings.append(match.group())
-        
-        if matches:
-            unique_matches = {}
-            for i, pos in enumerate(matches):
-                matched_str = matched_strings[i]
-                if matched_str not in unique_matches:
-                    unique_matches[matched_str] = []
-                unique_matches[matched_str].append(pos)
-            
-            for matched_str, positions in unique_matches.items():
-                results.append((matched_str, positions))
+        return regex.compile("|".join(alternatives), regex.IGNORECASE | regex.V0), group_sources
+    
+    @classmethod
+    def validate_pattern(cls, pattern: str, probe_timeout: float = 0.05) -> Optional[str]:
+        """Return an error message if the regex is invalid or prone to catastrophic backtracking.
         
-        return results
+        Syntax is checked by the `regex` module that compiles the patterns for
+        matching. The accepted dialect is Python `re` syntax (including
+        possessive quantifiers and atomic groups) plus the `regex` module's
+        Unicode property escapes (\\p{L}, \\P{N}), \\X and POSIX classes
+        ([[:alpha:]]). Other `regex`-only groups such as branch reset and
+        recursion are rejected, since the structural backtracking checks
+        cannot see inside them; the timed probes still cover everything.
+        """
+        try:
+            compiled = regex.compile(pattern, regex.IGNORECASE | regex.V0)
+        except Exception as e:
+            return f"Invalid regex: {e}"
+        
+        try:
+            parsed = sre_parse.parse(cls._SINGLE_CHAR_SYNTAX.sub(r"\\w", pattern))
+        except Exception as e:
+            return f"Unsupported regex syntax: {e}"
+        
+        if compiled.fullmatch("") is not None:
+            return "Regex matches the empty string"
+        
+        problem = cls._find_backtracking_hazard(parsed.data if hasattr(parsed, 'data') else list(parsed), False)
+        if problem:
+            return problem
+        
+        for probe in cls._PROBE_INPUTS:
+            try:
+                compiled.search(probe, timeout=probe_timeout)
+            except TimeoutError:
+                return "Regex is too slow on adversarial input (catastrophic backtracking)"
+        
+        return None
+    
+    @classmethod
+    def _find_backtracking_hazard(cls, items, inside_unbounded: bool) -> Optional[str]:
+        for op, av in items:
+            if op in (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS):
+                return "Backreferences are not supported"
+            elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+                low, high, body = av
+                unbounded = high == sre_constants.MAXREPEAT
+                if inside_unbounded and unbounded:
+                    return "Nested unbounded quantifiers (e.g. (a+)+) can backtrack catastrophically"
+                problem = cls._find_backtracking_hazard(body, inside_unbounded or unbounded)
+                if problem:
+                    return problem
+            elif op == sre_constants.SUBPATTERN:
+                problem = cls._find_backtracking_hazard(av[-1], inside_unbounded)
+                if problem:
+                    return problem
+            elif op == sre_constants.BRANCH:
+                branches = av[1]
+                if inside_unbounded and cls._branches_overlap(branches):
+                    return "Overlapping alternatives inside a repeat (e.g. (a|aa)*) can backtrack catastrophically"
+                for branch in branches:
+                    problem = cls._find_backtracking_hazard(branch, inside_unbounded)
+                    if problem:
+                        return problem
+            elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+                problem = cls._find_backtracking_hazard(av[1], False)
+                if problem:
+                    return problem
+            # possessive repeats and atomic groups never backtrack into their body
+        return None
+    
+    @classmethod
+    def _branches_overlap(cls, branches) -> bool:
+        seen = set()
+        for branch in branches:
+            first = cls._first_chars(branch)
+            if first is None or first & seen:
+                return True
+            seen |= first
+        return False
+    
+    @classmethod
+    def _first_chars(cls, items) -> Optional[set]:
+        """Literal code points a branch can start with; None if empty or unknown"""
+        for op, av in items:
+            if op == sre_constants.LITERAL:
+                return {chr(av).lower()}
+            if op == sre_constants.SUBPATTERN:
+                return cls._first_chars(av[-1])
+            if op in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+                continue
+            return None
+        return None
+    
+    def _get_compiled(self, patterns: List[str]) -> Tuple["regex.Pattern", Dict[str, str]]:
+        key = tuple(patterns)
+        if key != self._compiled_key:
+            self._compiled_patterns = self.compile_patterns(patterns)
+            self._compiled_key = key
+        return self._compiled_patterns
+    
+    def _search_default(self, text: str, first_only: bool = False) -> List[Tuple[str, List[int]]]:
+        unique_matches: Dict[str, List[int]] = {}
+        for match in self.gambling_pattern.finditer(text):
+            positions = unique_matches.setdefault(match.group(), [])
+            if not (first_only and positions):
+                positions.append(match.start())
+        return list(unique_matches.items())
+    
+    def _search_combined(self, text: str, patterns: List[str], first_only: bool = False) -> List[Tuple[str, List[int]]]:
+        compiled, group_sources = self._get_compiled(patterns)
+        unique_matches: Dict[str, List[int]] = {}
+        
+        try:
+            for match in compiled.finditer(text, timeout=self.timeout):
+                positions = unique_matches.setdefault(group_sources[match.lastgroup], [])
+                if not (first_only and positions):
+                    positions.append(match.start())
+        except TimeoutError:
+            logger.warning(f"Regex scan exceeded {self.timeout}s budget on a {len(text)} char comment")
+        
+        return list(unique_matches.items())
+    
+    def search(self, text: str, patterns: List[str] = None, first_only: bool = False) -> List[Tuple[str, List[int]]]:
+        if patterns:
+            return self._search_combined(text, patterns, first_only)
+        return self._search_default(text, first_only)
+    
+    def find_any(self, text: str, patterns: List[str] = None) -> Optional[str]:
+        if not patterns:
+            match = self.gambling_pattern.search(text)
+            return match.group() if match else None
+        
+        compiled, group_sources = self._get_compiled(patterns)
+        try:
+            match = compiled.search(text, timeout=self.timeout)
+        except TimeoutError:
+            logger.warning(f"Regex scan exceeded {self.timeout}s budget on a {len(text)} char comment")
+            return None
+        return group_sources[match.lastgroup] if match else None
 
-class KMPMatcher(StringMatcher):
+class KMPMatcher(SinglePatternMatcher):
     def _compute_lps(self, pattern: str) -> List[int]:
         m = len(pattern)
         lps = [0] * m
@@ -54,64 +275,84 @@ class KMPMatcher(StringMatcher):
                     i += 1
         return lps
     
-    def _kmp_search(self, text: str, pattern: str) -> List[int]:
-        if not pattern:
-            return []
-        
-        text_lower = text.lower()
-        pattern_lower = pattern.lower()
-        
-        n = len(text_lower)
-        m = len(pattern_lower)
-        
-        lps = self._compute_lps(pattern_lower)
+    def _prepare(self, pattern: str) -> List[int]:
+        return self._compute_lps(pattern)
+    
+    def _search_one(self, text: str, pattern: str, lps: List[int], first_only: bool = False) -> List[int]:
+        n = len(text)
+        m = len(pattern)
         matches = []
         
         i = 0  # index for text
         j = 0  # index for pattern
         
         while i < n:
-            if pattern_lower[j] == text_lower[i]:
+            if pattern[j] == text[i]:
                 i += 1
                 j += 1
             
             if j == m:
                 matches.append(i - j)
+                if first_only:
+                    break
                 j = lps[j - 1]
-            elif i < n and pattern_lower[j] != text_lower[i]:
+            elif i < n and pattern[j] != text[i]:
                 if j != 0:
                     j = lps[j - 1]
                 else:
                     i += 1
         
         return matches
-    
-    def search(self, text: str, patterns: List[str]) -> List[Tuple[str, List[int]]]:
-        results = []
-        for pattern in patterns:
-            positions = self._kmp_search(text, pattern.strip())
-            if positions:
-                results.append((pattern.strip(), positions))
-        return results
 
-class BoyerMooreMatcher(StringMatcher):
+class BoyerMooreMatcher(SinglePatternMatcher):
     def _build_bad_char_table(self, pattern: str) -> dict:
         table = {}
         for i in range(len(pattern)):
             table[pattern[i]] = i
         return table
     
-    def _boyer_moore_search(self, text: str, pattern: str) -> List[int]:
-        if not pattern:
-            return []
+    def _build_good_suffix_table(self, pattern: str) -> List[int]:
+        """Strong good-suffix shifts; shift[j] applies after a mismatch at j - 1"""
+        m = len(pattern)
+        shift = [0] * (m + 1)
+        border = [0] * (m + 1)
         
-        text_lower = text.lower()
-        pattern_lower = pattern.lower()
+        # case 1: the matched suffix reoccurs elsewhere in the pattern
+        i = m
+        j = m + 1
+        border[i] = j
+        while i > 0:
+            while j <= m and pattern[i - 1] != pattern[j - 1]:
+                if shift[j] == 0:
+                    shift[j] = j - i
+                j = border[j]
+            i -= 1
+            j -= 1
+            border[i] = j
         
-        n = len(text_lower)
-        m = len(pattern_lower)
+        # case 2: only a prefix of the pattern matches a part of the suffix
+        j = border[0]
+        for i in range(m + 1):
+            if shift[i] == 0:
+                shift[i] = j
+            if i == j:
+                j = border[j]
         
-        bad_char = self._build_bad_char_table(pattern_lower)
+        return shift
+    
+    def _prepare(self, pattern: str) -> Tuple[dict, List[int]]:
+        return self._build_bad_char_table(pattern), self._build_good_suffix_table(pattern)
+    
+    def _search_one(
+        self,
+        text: str,
+        pattern: str,
+        tables: Tuple[dict, List[int]],
+        first_only: bool = False
+    ) -> List[int]:
+        bad_char, good_suffix = tables
+        n = len(text)
+        m = len(pattern)
         matches = []
         
         s = 0 
@@ -119,31 +360,124 @@ class BoyerMooreMatcher(StringMatcher):
         while s <= n - m:
             j = m - 1
             
-            while j >= 0 and pattern_lower[j] == text_lower[s + j]:
+            while j >= 0 and pattern[j] == text[s + j]:
                 j -= 1
             
             if j < 0:
                 matches.append(s)
-                s += 1 
+                if first_only:
+                    break
+                s += good_suffix[0]
             else:
-                bad_char_shift = j - bad_char.get(text_lower[s + j], -1)
-                s += max(1, bad_char_shift)
+                bad_char_shift = j - bad_char.get(text[s + j], -1)
+                s += max(good_suffix[j + 1], bad_char_shift)
         
         return matches
+
+class WuManberMatcher(StringMatcher):
+    """Multi-pattern block-shift search (Wu-Manber).
+
+    Only the first `min_length` characters of every pattern take part in the
+    shift table, so one scan skips ahead by up to `min_length - block + 1`
+    characters no matter how many patterns are loaded.
+    """
+    
+    def __init__(self, block_size: int = 2):
+        self.block_size = block_size
+        self._table_key: Optional[Tuple[str, ...]] = None
+        self._tables: Optional[Tuple[int, int, Dict[str, int], Dict[str, List[Tuple[str, str]]]]] = None
+    
+    def _build_tables(self, patterns: List[str]) -> Optional[Tuple[int, int, Dict[str, int], Dict[str, List[Tuple[str, str]]]]]:
+        entries = []
+        seen = set()
+        for pattern in patterns:
+            stripped = pattern.strip()
+            if stripped and stripped not in seen:
+                seen.add(stripped)
+                entries.append((stripped, stripped.lower()))
+        
+        if not entries:
+            return None
+        
+        min_length = min(len(lowered) for _, lowered in entries)
+        block = min(self.block_size, min_length)
+        default_shift = min_length - block + 1
+        
+        shift: Dict[str, int] = {}
+        candidates: Dict[str, List[Tuple[str, str]]] = {}
+        for original, lowered in entries:
+            for q in range(block, min_length + 1):
+                key = lowered[q - block:q]
+                distance = min_length - q
+                if distance < shift.get(key, default_shift):
+                    shift[key] = distance
+            candidates.setdefault(lowered[min_length - block:min_length], []).append((original, lowered))
+        
+        return min_length, block, shift, candidates
+    
+    def _get_tables(self, patterns: List[str]):
+        key = tuple(patterns)
+        if key != self._table_key:
+            self._tables = self._build_tables(patterns)
+            self._table_key = key
+        return self._tables
+    
+    def _wu_manber_search(self, text: str, patterns: List[str], first_only: bool = False, stop_at_first: bool = False) -> Dict[str, List[int]]:
+        tables = self._get_tables(patterns)
+        if tables is None:
+            return {}
+        
+        min_length, block, shift, candidates = tables
+        default_shift = min_length - block + 1
+        text_lower = text.lower()
+        n = len(text_lower)
+        positions: Dict[str, List[int]] = {}
+        
+        pos = min_length - 1
+        while pos < n:
+            key = text_lower[pos - block + 1:pos + 1]
+            distance = shift.get(key, default_shift)
+            if distance:
+                pos += distance
+                continue
+            
+            start = pos - min_length + 1
+            for original, lowered in candidates.get(key, ()):
+                if text_lower.startswith(lowered, start):
+                    found = positions.setdefault(original, [])
+                    if stop_at_first:
+                        found.append(start)
+                        return positions
+                    if not (first_only and found):
+                        found.append(start)
+            pos += 1
+        
+        return positions
     
-    def search(self, text: str, patterns: List[str]) -> List[Tuple[str, List[int]]]:
-        """Search for multiple patterns using Boyer-Moore"""
+    def search(self, text: str, patterns: List[str], first_only: bool = False) -> List[Tuple[str, List[int]]]:
+        positions = self._wu_manber_search(text, patterns, first_only)
+        if not positions:
+            return []
+        
         results = []
         for pattern in patterns:
-            positions = self._boyer_moore_search(text, pattern.strip())
-            if positions:
-                results.append((pattern.strip(), positions))
+            stripped = pattern.strip()
+            if stripped in positions:
+                results.append((stripped, positions.pop(stripped)))
         return results
+    
+    def find_any(self, text: str, patterns: List[str]) -> Optional[str]:
+        positions = self._wu_manber_search(text, patterns, stop_at_first=True)
+        return next(iter(positions), None)
 
 class RabinKarpMatcher(StringMatcher):
-    def __init__(self, base: int = 256, prime: int = 101):
+    # Mersenne prime 2^61 - 1 keeps spurious hash hits negligible, so almost
+    # every window is rejected without a string comparison
+    def __init__(self, base: int = 1_000_003, prime: int = (1 << 61) - 1):
         self.base = base
         self.prime = prime
+        self._table_key: Optional[Tuple[str, ...]] = None
+        self._length_tables: Dict[int, Dict[int, List[Tuple[str, str]]]] = {}
     
     def _hash(self, s: str, length: int) -> int:
         h = 0
@@ -151,7 +485,7 @@ class RabinKarpMatcher(StringMatcher):
             h = (h * self.base + ord(s[i])) % self.prime
         return h
     
-    def _rabin_karp_search(self, text: str, pattern: str) -> List[int]:
+    def _rabin_karp_search(self, text: str, pattern: str, first_only: bool = False) -> List[int]:
         if not pattern:
             return []
         
@@ -169,42 +503,365 @@ class RabinKarpMatcher(StringMatcher):
         pattern_hash = self._hash(pattern_lower, m)
         text_hash = self._hash(text_lower, m)
         
-        h = 1
-        for i in range(m - 1):
-            h = (h * self.base) % self.prime
+        h = pow(self.base, m - 1, self.prime)
         
         for i in range(n - m + 1):
             if pattern_hash == text_hash:
                 if text_lower[i:i + m] == pattern_lower:
                     matches.append(i)
+                    if first_only:
+                        break
             
             if i < n - m:
                 text_hash = (self.base * (text_hash - ord(text_lower[i]) * h) + ord(text_lower[i + m])) % self.prime
-                if text_hash < 0:
-                    text_hash += self.prime
         
         return matches
     
-    def search(self, text: str, patterns: List[str]) -> List[Tuple[str, List[int]]]:
+    def _build_length_tables(self, patterns: List[str]) -> Dict[int, Dict[int, List[Tuple[str, str]]]]:
+        """Group patterns by length, each group mapping hash -> [(pattern, lowered)]"""
+        tables: Dict[int, Dict[int, List[Tuple[str, str]]]] = {}
+        seen = set()
+        for pattern in patterns:
+            stripped = pattern.strip()
+            if not stripped or stripped in seen:
+                continue
+            seen.add(stripped)
+            
+            lowered = stripped.lower()
+            m = len(lowered)
+            table = tables.setdefault(m, {})
+            table.setdefault(self._hash(lowered, m), []).append((stripped, lowered))
+        return tables
+    
+    def _get_length_tables(self, patterns: List[str]) -> Dict[int, Dict[int, List[Tuple[str, str]]]]:
+        key = tuple(patterns)
+        if key != self._table_key:
+            self._length_tables = self._build_length_tables(patterns)
+            self._table_key = key
+        return self._length_tables
+    
+    def _multi_pattern_search(self, text: str, patterns: List[str], first_only: bool = False, stop_at_first: bool = False) -> Dict[str, List[int]]:
+        """One rolling hash per distinct pattern length instead of one per pattern"""
+        text_lower = text.lower()
+        n = len(text_lower)
+        base = self.base
+        prime = self.prime
+        positions: Dict[str, List[int]] = {}
+        
+        for m, table in self._get_length_tables(patterns).items():
+            if m > n:
+                continue
+            
+            h = pow(base, m - 1, prime)
+            text_hash = self._hash(text_lower, m)
+            last = n - m
+            
+            for i in range(last + 1):
+                candidates = table.get(text_hash)
+                if candidates:
+                    window = text_lower[i:i + m]
+                    for original, lowered in candidates:
+                        if window == lowered:
+                            found = positions.setdefault(original, [])
+                            if stop_at_first:
+                                found.append(i)
+                                return positions
+                            if not (first_only and found):
+                                found.append(i)
+                
+                if i < last:
+                    text_hash = (base * (text_hash - ord(text_lower[i]) * h) + ord(text_lower[i + m])) % prime
+        
+        return positions
+    
+    def search(self, text: str, patterns: List[str], first_only: bool = False) -> List[Tuple[str, List[int]]]:
+        positions = self._multi_pattern_search(text, patterns, first_only)
+        if not positions:
+            return []
+        
         results = []
         for pattern in patterns:
-            positions = self._rabin_karp_search(text, pattern.strip())
-            if positions:
-                results.append((pattern.strip(), positions))
+            stripped = pattern.strip()
+            if stripped in positions:
+                results.append((stripped, positions.pop(stripped)))
         return results
+    
+    def find_any(self, text: str, patterns: List[str]) -> Optional[str]:
+        positions = self._multi_pattern_search(text, patterns, stop_at_first=True)
+        return next(iter(positions), None)
+
+class VectorizedRabinKarpMatcher(StringMatcher):
+    """Rabin-Karp over whole comment batches using NumPy.
+
+    Every window hash is derived from prefix sums in uint64, so arithmetic
+    wraps modulo 2^64 and the base must be odd to stay invertible. Candidate
+    windows are found with np.isin and verified against the text.
+    """
+    
+    def __init__(self, base: int = 1_000_003):
+        if base % 2 == 0:
+            raise ValueError("Base must be odd for modulo 2^64 hashing")
+        self.base = base
+        self._mask = (1 << 64) - 1
+        self._base_inverse = pow(base, -1, 1 << 64)
+        self._table_key: Optional[Tuple[str, ...]] = None
+        self._length_tables: Dict[int, Dict[int, List[Tuple[str, str]]]] = {}
+    
+    def _hash(self, s: str) -> int:
+        h = 0
+        for char in s:
+            h = (h * self.base + ord(char)) & self._mask
+        return h
+    
+    def _get_length_tables(self, patterns: List[str]) -> Dict[int, Dict[int, List[Tuple[str, str]]]]:
+        key = tuple(patterns)
+        if key == self._table_key:
+            return self._length_tables
+        
+        tables: Dict[int, Dict[int, List[Tuple[str, str]]]] = {}
+        seen = set()
+        for pattern in patterns:
+            stripped = pattern.strip()
+            if not stripped or stripped in seen:
+                continue
+            seen.add(stripped)
+            
+            lowered = stripped.lower()
+            table = tables.setdefault(len(lowered), {})
+            table.setdefault(self._hash(lowered), []).append((stripped, lowered))
+        
+        self._length_tables = tables
+        self._table_key = key
+        return tables
+    
+    def _powers(self, value: int, count: int) -> np.ndarray:
+        powers = np.full(count, value, dtype=np.uint64)
+        powers[0] = 1
+        return np.cumprod(powers, dtype=np.uint64)
+    
+    def search_batch(
+        self,
+        texts: List[str],
+        patterns: List[str],
+        first_only: bool = False,
+        stop_at_first: bool = False
+    ) -> List[List[Tuple[str, List[int]]]]:
+        """Matches for every text; first_only keeps each pattern's first position,
+        stop_at_first stops verifying a text once it has one confirmed hit"""
+        if not texts:
+            return []
+        
+        tables = self._get_length_tables(patterns)
+        lowered_texts = [text.lower() for text in texts]
+        corpus = "".join(lowered_texts)
+        n = len(corpus)
+        if n == 0 or not tables:
+            return [[] for _ in texts]
+        
+        lengths = np.fromiter((len(t) for t in lowered_texts), dtype=np.int64, count=len(texts))
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+        
+        codes = np.frombuffer(corpus.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        base_powers = self._powers(self.base, n)
+        inverse_powers = self._powers(self._base_inverse, n)
+        
+        # prefix[i] = sum(codes[j] * base^-j for j < i); the window [i, i + m)
+        # then hashes to (prefix[i + m] - prefix[i]) * base^(i + m - 1)
+        prefix = np.zeros(n + 1, dtype=np.uint64)
+        np.cumsum(codes * inverse_powers, dtype=np.uint64, out=prefix[1:])
+        
+        positions: List[Dict[str, List[int]]] = [{} for _ in texts]
+        resolved = np.zeros(len(texts), dtype=bool)
+        
+        for m, table in tables.items():
+            if m > n:
+                continue
+            if stop_at_first and resolved.all():
+                break
+            
+            window_hashes = (prefix[m:] - prefix[:-m]) * base_powers[m - 1:]
+            pattern_hashes = np.fromiter(table.keys(), dtype=np.uint64, count=len(table))
+            candidates = np.nonzero(np.isin(window_hashes, pattern_hashes))[0]
+            if candidates.size == 0:
+                continue
+            
+            # drop windows that straddle two comments
+            owners = np.searchsorted(ends, candidates, side="right")
+            inside = candidates + m <= ends[np.minimum(owners, len(texts) - 1)]
+            candidates = candidates[inside]
+            owners = owners[inside]
+            if stop_at_first:
+                unresolved = ~resolved[owners]
+                candidates = candidates[unresolved]
+                owners = owners[unresolved]
+            
+            for start, owner, window_hash in zip(
+                candidates.tolist(), owners.tolist(), window_hashes[candidates].tolist()
+            ):
+                if stop_at_first and resolved[owner]:
+                    continue
+                window = corpus[start:start + m]
+                for original, lowered in table[window_hash]:
+                    if window == lowered:
+                        found = positions[owner].setdefault(original, [])
+                        if not (first_only and found):
+                            found.append(start - int(starts[owner]))
+                        if stop_at_first:
+                            resolved[owner] = True
+                            break
+        
+        results = []
+        for found in positions:
+            text_results = []
+            if found:
+                for pattern in patterns:
+                    stripped = pattern.strip()
+                    if stripped in found:
+                        text_results.append((stripped, found.pop(stripped)))
+            results.append(text_results)
+        return results
+    
+    def search(self, text: str, patterns: List[str], first_only: bool = False) -> List[Tuple[str, List[int]]]:
+        return self.search_batch([text], patterns, first_only=first_only)[0]
+    
+    def find_any(self, text: str, patterns: List[str]) -> Optional[str]:
+        results = self.search_batch([text], patterns, stop_at_first=True)[0]
+        return results[0][0] if results else None
+
+class ApproximateMatcher(SinglePatternMatcher):
+    """Occurrences within `max_edits` edits (Myers' bit-vector algorithm).
+
+    Each pattern column of the edit-distance matrix is packed into one integer,
+    so every text character costs a handful of bit operations regardless of
+    pattern length. Reported positions are where a run of matching windows
+    starts (end index - pattern length + 1), which is exact for substitutions
+    and approximate for insertions and deletions.
+    
+    A pattern split into max_edits + 1 pieces keeps at least one piece intact
+    in any occurrence, so texts containing none of its pieces skip the scan.
+    """
+    
+    def __init__(self, max_edits: int = 1):
+        super().__init__()
+        self.max_edits = max_edits
+    
+    def _build_peq(self, pattern: str) -> Dict[str, int]:
+        peq: Dict[str, int] = {}
+        for i, char in enumerate(pattern):
+            peq[char] = peq.get(char, 0) | (1 << i)
+        return peq
+    
+    def _prepare(self, pattern: str) -> Optional[Tuple[Dict[str, int], List[str]]]:
+        # a pattern no longer than k would match everywhere
+        m = len(pattern)
+        if m <= self.max_edits:
+            return None
+        pieces = self.max_edits + 1
+        bounds = [m * i // pieces for i in range(pieces + 1)]
+        return self._build_peq(pattern), [pattern[bounds[i]:bounds[i + 1]] for i in range(pieces)]
+    
+    def _search_one(
+        self,
+        text: str,
+        pattern: str,
+        tables: Tuple[Dict[str, int], List[str]],
+        first_only: bool = False
+    ) -> List[int]:
+        peq, pieces = tables
+        if not any(piece in text for piece in pieces):
+            return []
+        
+        k = self.max_edits
+        m = len(pattern)
+        mask = (1 << m) - 1
+        high = 1 << (m - 1)
+        
+        pv = mask
+        mv = 0
+        score = m
+        matches = []
+        in_match = False
+        
+        for j, char in enumerate(text):
+            eq = peq.get(char, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & mask)
+            mh = pv & xh
+            
+            if ph & high:
+                score += 1
+            elif mh & high:
+                score -= 1
+            
+            ph = (ph << 1) & mask
+            mh = (mh << 1) & mask
+            pv = mh | (~(xv | ph) & mask)
+            mv = ph & xv
+            
+            if score <= k:
+                if not in_match:
+                    matches.append(max(0, j - m + 1))
+                    if first_only:
+                        break
+                in_match = True
+            else:
+                in_match = False
+        
+        return matches
+
+class HybridMatcher(StringMatcher):
+    """Default regex heuristic and multi-pattern keyword search over the same text.
+
+    search_tagged reports each match with its source ('regex' or 'keyword')
+    so one pass over a comment serves both detectors.
+    """
+    
+    REGEX_SOURCE = 'regex'
+    KEYWORD_SOURCE = 'keyword'
+    
+    def __init__(self):
+        self._regex_matcher = RegexMatcher()
+        self._keyword_matcher = WuManberMatcher()
+    
+    def search_tagged(self, text: str, patterns: List[str], first_only: bool = False) -> List[Tuple[str, List[int], str]]:
+        results = [
+            (pattern, positions, self.REGEX_SOURCE)
+            for pattern, positions in self._regex_matcher.search(text, first_only=first_only)
+        ]
+        if patterns:
+            results.extend(
+                (pattern, positions, self.KEYWORD_SOURCE)
+                for pattern, positions in self._keyword_matcher.search(text, patterns, first_only)
+            )
+        return results
+    
+    def search(self, text: str, patterns: List[str], first_only: bool = False) -> List[Tuple[str, List[int]]]:
+        return [(pattern, positions) for pattern, positions, _ in self.search_tagged(text, patterns, first_only)]
+    
+    def find_any(self, text: str, patterns: List[str]) -> Optional[str]:
+        found = self._regex_matcher.find_any(text)
+        if found is None and patterns:
+            found = self._keyword_matcher.find_any(text, patterns)
+        return found
 
 class StringMatchingFactory:
     @staticmethod
-    def create_matcher(algorithm_type: str) -> StringMatcher:
+    def create_matcher(algorithm_type: str, **options) -> StringMatcher:
         matchers = {
             'regex': RegexMatcher,
             'kmp': KMPMatcher,
             'boyer_moore': BoyerMooreMatcher,
-            'rabin_karp': RabinKarpMatcher
+            'wu_manber': WuManberMatcher,
+            'rabin_karp': RabinKarpMatcher,
+            'rabin_karp_vectorized': VectorizedRabinKarpMatcher,
+            'approximate': ApproximateMatcher,
+            'hybrid': HybridMatcher
         }
         
         matcher_class = matchers.get(algorithm_type.lower())
         if not matcher_class:
             raise ValueError(f"Unknown algorithm type: {algorithm_type}")
         
-        return matcher_class()
\ No newline at end of file
+        return matcher_class(**options)
\ No newline at end of file
@@ -1,28 +1,68 @@
 import time
+import asyncio
 import logging
-from typing import List, Optional, Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Set, Tuple
+import google_auth_httplib2
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
 from google.auth.credentials import Credentials
-from app.models.schemas import CommentData, AlgorithmType
+from app.models.schemas import AlgorithmType, DetectionMode
+from app.models.records import CommentRecord
 from app.core.detector import JudolDetector
+from app.core.api_resilience import CircuitOpenError, describe_error, get_api_resilience
 from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Partial-response masks (the `fields` parameter): only what CommentRecord and
+# the info dicts read is sent, which keeps pages small and quick to decode
+COMMENT_FIELDS = "id,snippet(authorDisplayName,authorChannelId,textDisplay,likeCount,publishedAt,parentId)"
+COMMENT_THREAD_FIELDS = f"nextPageToken,items(id,snippet(totalReplyCount,topLevelComment({COMMENT_FIELDS})))"
+COMMENT_THREAD_WITH_REPLIES_FIELDS = (
+    f"nextPageToken,items(id,snippet(totalReplyCount,topLevelComment({COMMENT_FIELDS})),"
+    f"replies/comments({COMMENT_FIELDS}))"
+)
+REPLY_FIELDS = f"nextPageToken,items({COMMENT_FIELDS})"
+VIDEO_INFO_FIELDS = (
+    "items(id,snippet(title,channelTitle,channelId,publishedAt),statistics(viewCount,likeCount,commentCount))"
+)
+LIVE_CHAT_ID_FIELDS = "items(id,liveStreamingDetails/activeLiveChatId)"
+LIVE_CHAT_MESSAGE_FIELDS = (
+    "nextPageToken,pollingIntervalMillis,"
+    "items(id,snippet(displayMessage,publishedAt,authorChannelId),authorDetails/displayName)"
+)
+CHANNEL_INFO_FIELDS = "items(id,snippet(title,description),statistics(subscriberCount,videoCount,viewCount))"
+
+class LiveChatEndedError(Exception):
+    """The live chat is over or no longer exists"""
+
 class YouTubeClient:
     def __init__(self, api_key: Optional[str] = None, credentials: Optional[Credentials] = None):
         self.settings = get_settings()
         self.api_key = api_key
         self.credentials = credentials
+        # httplib2 connections are not thread-safe; reply fetch workers get their own
+        self._thread_local = threading.local()
+        self._resilience = get_api_resilience()
+        # set when the last comment fetch failed partway and returned the pages it had
+        self.partial_fetch: Optional[Dict[str, Any]] = None
+        
+        # A base URL points the client at another API host, e.g. a local fake server
+        service_options = {}
+        if self.settings.youtube_api_base_url:
+            service_options['client_options'] = {'api_endpoint': self.settings.youtube_api_base_url}
+            service_options['static_discovery'] = True
         
         # Initialize YouTube service
         if credentials:
-            self.youtube = build('youtube', 'v3', credentials=credentials)
+            self.youtube = build('youtube', 'v3', credentials=credentials, **service_options)
             self.auth_type = "oauth"
             logger.info("YouTube client initialized with OAuth credentials")
         elif api_key:
-            self.youtube = build('youtube', 'v3', developerKey=api_key)
+            self.youtube = build('youtube', 'v3', developerKey=api_key, **service_options)
             self.auth_type = "api_key"
             logger.info("YouTube client initialized with API key")
         else:
@@ -31,68 +71,299 @@ class YouTubeClient:
     def has_write_access(self) -> bool:
         return self.auth_type == "oauth" and self.credentials is not None
     
-    async def get_video_comments(self, video_id: str, max_results: int = 100) -> List[CommentData]:
+    async def get_video_comments(
+        self,
+        video_id: str,
+        max_results: int = 100,
+        include_replies: bool = False,
+        max_replies_per_thread: int = 20
+    ) -> List[CommentRecord]:
+        """
+        Up to `max_results` top-level comments by relevance. With `include_replies`,
+        the replies of each thread follow, at most `max_replies_per_thread` per thread.
+        """
+        self.partial_fetch = None
         try:
             comments = []
+            threads = []
+            pages = 0
             next_page_token = None
             
             while len(comments) < max_results:
                 remaining = max_results - len(comments)
                 per_page = min(100, remaining)  # YouTube API limit: 100 per request
                 
+                # the replies part adds the first few replies of each thread at no extra quota cost
                 request = self.youtube.commentThreads().list(
-                    part='snippet',
+                    part='snippet,replies' if include_replies else 'snippet',
                     videoId=video_id,
                     maxResults=per_page,
                     order='relevance',
-                    pageToken=next_page_token
+                    pageToken=next_page_token,
+                    fields=COMMENT_THREAD_WITH_REPLIES_FIELDS if include_replies else COMMENT_THREAD_FIELDS
                 )
                 
-                response = request.execute()
+                try:
+                    response = await self._resilience.execute_async('commentThreads.list', request)
+                except Exception as e:
+                    if not comments:
+                        raise
+                    # keep the pages already fetched rather than failing the whole request
+                    self.partial_fetch = {'pages_fetched': pages, 'error': describe_error(e)}
+                    logger.warning(f"Comment fetch for {video_id} stopped after {pages} pages: {describe_error(e)}")
+                    break
+                pages += 1
                 
-                for item in response['items']:
-                    comment_snippet = item['snippet']['topLevelComment']['snippet']
-                    
-                    comment_data = CommentData(
-                        comment_id=item['snippet']['topLevelComment']['id'],
-                        author=comment_snippet['authorDisplayName'],
-                        text=comment_snippet['textDisplay'],
-                        like_count=comment_snippet.get('likeCount', 0),
-                        published_at=comment_snippet['publishedAt'],
-                        reply_count=item['snippet'].get('totalReplyCount', 0)
-                    )
-                    
-                    comments.append(comment_data)
+                items = response.get('items', [])
+                comments.extend(self._comment_from_thread(item) for item in items)
+                threads.extend(items)
                 
                 next_page_token = response.get('nextPageToken')
                 if not next_page_token:
                     break
             
-            logger.info(f"Retrieved {len(comments)} comments for video {video_id}")
+            top_level_count = len(comments)
+            if include_replies:
+                comments.extend(await self._get_thread_replies(threads, max_replies_per_thread))
+            
+            logger.info(f"Retrieved {top_level_count} comments and {len(comments) - top_level_count} "
+                        f"replies for video {video_id}")
             return comments
             
+        except CircuitOpenError:
+            raise
         except HttpError as e:
-            logger.error(f"YouTube API error: {e}")
+            logger.error(f"YouTube API error: {describe_error(e)}")
             if e.resp.status == 403:
                 raise Exception("YouTube API quota exceeded or access denied")
             elif e.resp.status == 404:
                 raise Exception("Video not found or comments are disabled")
             else:
-                raise Exception(f"YouTube API error: {e}")
+                raise Exception(f"YouTube API error: {describe_error(e)}")
         except Exception as e:
-            logger.error(f"Error retrieving comments: {e}")
-            raise Exception(f"Failed to retrieve comments: {str(e)}")
+            logger.error(f"Error retrieving comments: {describe_error(e)}")
+            raise Exception(f"Failed to retrieve comments: {describe_error(e)}")
+    
+    async def get_new_comments(
+        self,
+        video_id: str,
+        since: Optional[str] = None,
+        seen_ids: Optional[Set[str]] = None,
+        max_results: int = 500
+    ) -> Tuple[List[CommentRecord], int]:
+        """
+        Comments published since the `since` timestamp, newest first, and the
+        number of pages fetched. Pages are requested in time order and paging
+        stops at the first comment that is older or already seen. There are no
+        partial results here: the newest pages alone would move a watermark
+        past the comments on the pages that failed.
+        """
+        seen_ids = seen_ids or set()
+        comments = []
+        pages = 0
+        next_page_token = None
+        
+        try:
+            while len(comments) < max_results:
+                request = self.youtube.commentThreads().list(
+                    part='snippet',
+                    videoId=video_id,
+                    maxResults=min(100, max_results - len(comments)),
+                    order='time',
+                    pageToken=next_page_token,
+                    fields=COMMENT_THREAD_FIELDS
+                )
+                response = await self._resilience.execute_async('commentThreads.list', request)
+                pages += 1
+                
+                for item in response.get('items', []):
+                    comment = self._comment_from_thread(item)
+                    if since and (comment.published_at < since or comment.comment_id in seen_ids):
+                        return comments, pages
+                    if comment.comment_id not in seen_ids:
+                        comments.append(comment)
+                
+                next_page_token = response.get('nextPageToken')
+                if not since or not next_page_token:
+                    break
+            
+            return comments, pages
+            
+        except HttpError as e:
+            logger.error(f"YouTube API error: {describe_error(e)}")
+            raise Exception(f"Failed to retrieve new comments: {describe_error(e)}")
+    
+    async def _get_thread_replies(self, threads: List[Dict[str, Any]], max_per_thread: int) -> List[CommentRecord]:
+        """
+        Replies of every thread that has any. Threads whose replies all came
+        inline with the thread are answered from there; the rest are fetched
+        with comments.list, up to `reply_fetch_concurrency` threads at a time.
+        A thread whose replies fail to load is skipped.
+        """
+        replies = []
+        pending = []
+        for item in threads:
+            total = item['snippet'].get('totalReplyCount', 0)
+            if not total:
+                continue
+            inline = item.get('replies', {}).get('comments', [])
+            if len(inline) >= min(total, max_per_thread):
+                replies.extend(self._comment_from_resource(reply) for reply in inline[:max_per_thread])
+            else:
+                pending.append(item['id'])
+        
+        if not pending:
+            return replies
+        
+        loop = asyncio.get_running_loop()
+        workers = max(1, min(self.settings.reply_fetch_concurrency, len(pending)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reply-fetch") as pool:
+            results = await asyncio.gather(
+                *(loop.run_in_executor(pool, self._fetch_replies, parent_id, max_per_thread) for parent_id in pending),
+                return_exceptions=True
+            )
+        
+        for parent_id, result in zip(pending, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Skipping replies of {parent_id}: {result}")
+                continue
+            replies.extend(result)
+        return replies
+    
+    def _fetch_replies(self, parent_id: str, max_results: int) -> List[CommentRecord]:
+        """Runs in a reply fetch worker thread"""
+        http = self._thread_http()
+        replies = []
+        next_page_token = None
+        while len(replies) < max_results:
+            request = self.youtube.comments().list(
+                part='snippet',
+                parentId=parent_id,
+                maxResults=min(100, max_results - len(replies)),
+                pageToken=next_page_token,
+                fields=REPLY_FIELDS
+            )
+            try:
+                response = self._resilience.execute('comments.list', request, http=http)
+            except Exception as e:
+                if not replies:
+                    raise
+                logger.warning(f"Replies of {parent_id} stopped after {len(replies)}: {describe_error(e)}")
+                break
+            replies.extend(self._comment_from_resource(item) for item in response.get('items', []))
+            
+            next_page_token = response.get('nextPageToken')
+            if not next_page_token:
+                break
+        return replies[:max_results]
+    
+    def _thread_http(self):
+        http = getattr(self._thread_local, 'http', None)
+        if http is None:
+            http = build_http()
+            if self.credentials:
+                http = google_auth_httplib2.AuthorizedHttp(self.credentials, http=http)
+            self._thread_local.http = http
+        return http
+    
+    @staticmethod
+    def _comment_from_resource(item: Dict[str, Any]) -> CommentRecord:
+        """A comment resource, as returned by comments.list or inline in a thread's replies"""
+        snippet = item['snippet']
+        return CommentRecord(
+            comment_id=item['id'],
+            author=snippet['authorDisplayName'],
+            text=snippet['textDisplay'],
+            like_count=snippet.get('likeCount', 0),
+            published_at=snippet['publishedAt'],
+            author_channel_id=snippet.get('authorChannelId', {}).get('value', ''),
+            parent_id=snippet.get('parentId', '')
+        )
+    
+    @staticmethod
+    def _comment_from_thread(item: Dict[str, Any]) -> CommentRecord:
+        comment_snippet = item['snippet']['topLevelComment']['snippet']
+        return CommentRecord(
+            comment_id=item['snippet']['topLevelComment']['id'],
+            author=comment_snippet['authorDisplayName'],
+            text=comment_snippet['textDisplay'],
+            like_count=comment_snippet.get('likeCount', 0),
+            published_at=comment_snippet['publishedAt'],
+            reply_count=item['snippet'].get('totalReplyCount', 0),
+            author_channel_id=comment_snippet.get('authorChannelId', {}).get('value', '')
+        )
+    
+    async def get_live_chat_id(self, video_id: str) -> str:
+        try:
+            request = self.youtube.videos().list(
+                part='liveStreamingDetails',
+                id=video_id,
+                fields=LIVE_CHAT_ID_FIELDS
+            )
+            response = await self._resilience.execute_async('videos.list', request)
+        except HttpError as e:
+            logger.error(f"Error getting live chat for {video_id}: {describe_error(e)}")
+            raise Exception(f"Failed to get live chat: {describe_error(e)}")
+        
+        if not response.get('items'):
+            raise Exception("Video not found")
+        
+        live_chat_id = response['items'][0].get('liveStreamingDetails', {}).get('activeLiveChatId')
+        if not live_chat_id:
+            raise LiveChatEndedError(f"Video {video_id} has no active live chat")
+        return live_chat_id
+    
+    async def get_live_chat_messages(
+        self,
+        live_chat_id: str,
+        page_token: Optional[str] = None
+    ) -> Tuple[List[CommentRecord], Optional[str], int]:
+        """
+        One page of live chat messages, the token for the next page and the
+        number of milliseconds the API asks to wait before requesting it
+        """
+        try:
+            request = self.youtube.liveChatMessages().list(
+                liveChatId=live_chat_id,
+                part='snippet,authorDetails',
+                pageToken=page_token,
+                fields=LIVE_CHAT_MESSAGE_FIELDS
+            )
+            response = await self._resilience.execute_async('liveChatMessages.list', request)
+        except HttpError as e:
+            reasons = {detail.get('reason') for detail in (e.error_details or []) if isinstance(detail, dict)}
+            if reasons & {'liveChatEnded', 'liveChatNotFound', 'liveChatDisabled'}:
+                raise LiveChatEndedError(f"Live chat {live_chat_id} ended")
+            logger.error(f"Error polling live chat {live_chat_id}: {describe_error(e)}")
+            raise Exception(f"Failed to poll live chat: {describe_error(e)}")
+        
+        messages = []
+        for item in response.get('items', []):
+            snippet = item['snippet']
+            text = snippet.get('displayMessage')
+            if not text:
+                continue
+            messages.append(CommentRecord(
+                comment_id=item['id'],
+                author=item.get('authorDetails', {}).get('displayName', ''),
+                text=text,
+                published_at=snippet.get('publishedAt', ''),
+                author_channel_id=snippet.get('authorChannelId', '')
+            ))
+        
+        return messages, response.get('nextPageToken'), int(response.get('pollingIntervalMillis', 5000))
     
     async def get_video_info(self, video_id: str) -> Dict[str, Any]:
         try:
             request = self.youtube.videos().list(
                 part='snippet,statistics',
-                id=video_id
+                id=video_id,
+                fields=VIDEO_INFO_FIELDS
             )
             
-            response = request.execute()
+            response = await self._resilience.execute_async('videos.list', request)
             
-            if not response['items']:
+            if not response.get('items'):
                 raise Exception("Video not found")
             
             video_info = response['items'][0]
@@ -108,8 +379,8 @@ class YouTubeClient:
             }
             
         except HttpError as e:
-            logger.error(f"Error getting video info: {e}")
-            raise Exception(f"Failed to get video info: {str(e)}")
+            logger.error(f"Error getting video info: {describe_error(e)}")
+            raise Exception(f"Failed to get video info: {describe_error(e)}")
     
     def get_my_channel_info(self) -> Dict[str, Any]:
         if not self.has_write_access():
@@ -118,11 +389,12 @@ class YouTubeClient:
         try:
             request = self.youtube.channels().list(
                 part='snippet,statistics',
-                mine=True
+                mine=True,
+                fields=CHANNEL_INFO_FIELDS
             )
-            response = request.execute()
+            response = self._resilience.execute('channels.list', request)
             
-            if response['items']:
+            if response.get('items'):
                 channel = response['items'][0]
                 return {
                     'channel_id': channel['id'],
@@ -136,8 +408,8 @@ class YouTubeClient:
                 raise Exception("No channel found for authenticated user")
                 
         except HttpError as e:
-            logger.error(f"Error getting channel info: {e}")
-            raise Exception(f"Failed to get channel info: {str(e)}")
+            logger.error(f"Error getting channel info: {describe_error(e)}")
+            raise Exception(f"Failed to get channel info: {describe_error(e)}")
     
     def insert_comment(self, video_id: str, comment_text: str) -> Dict[str, Any]:
         if not self.has_write_access():
@@ -146,6 +418,7 @@ class YouTubeClient:
         try:
             request = self.youtube.commentThreads().insert(
                 part='snippet',
+                fields='id',
                 body={
                     'snippet': {
                         'videoId': video_id,
@@ -158,7 +431,8 @@ class YouTubeClient:
                 }
             )
             
-            response = request.execute()
+            # not retried: a retry after a lost response could post the comment twice
+            response = self._resilience.execute('commentThreads.insert', request, retry=False)
             
             return {
                 'comment_id': response['id'],
@@ -168,11 +442,11 @@ class YouTubeClient:
             }
             
         except HttpError as e:
-            logger.error(f"Error inserting comment: {e}")
+            logger.error(f"Error inserting comment: {describe_error(e)}")
             if e.resp.status == 403:
                 raise Exception("Comments are disabled on this video or insufficient permissions")
             else:
-                raise Exception(f"Failed to insert comment: {str(e)}")
+                raise Exception(f"Failed to insert comment: {describe_error(e)}")
     
     def insert_multiple_comments(self, video_id: str, comments: List[str]) -> Dict[str, Any]:
         if not self.has_write_access():
@@ -197,9 +471,9 @@ class YouTubeClient:
             except Exception as e:
                 results['failed'].append({
                     'comment': comment_text,
-                    'error': str(e)
+                    'error': describe_error(e)
                 })
-                logger.error(f"Failed to insert comment {i+1}: {e}")
+                logger.error(f"Failed to insert comment {i+1}: {describe_error(e)}")
         
         return results
     
@@ -209,17 +483,17 @@ class YouTubeClient:
         
         try:
             request = self.youtube.comments().delete(id=comment_id)
-            request.execute()
+            self._resilience.execute('comments.delete', request)
             
             logger.info(f"Comment deleted: {comment_id}")
             return True
             
         except HttpError as e:
-            logger.error(f"Error deleting comment: {e}")
+            logger.error(f"Error deleting comment: {describe_error(e)}")
             if e.resp.status == 403:
                 raise Exception("Cannot delete comment, not your comment or insufficient permissions")
             else:
-                raise Exception(f"Failed to delete comment: {str(e)}")
+                raise Exception(f"Failed to delete comment: {describe_error(e)}")
     
     def get_my_comments_on_video(self, video_id: str) -> List[Dict[str, Any]]:
         if not self.has_write_access():
@@ -230,19 +504,30 @@ class YouTubeClient:
             my_channel_id = channel_info['channel_id']
             
             my_comments = []
+            pages = 0
             next_page_token = None
+            self.partial_fetch = None
             
             while True:
                 request = self.youtube.commentThreads().list(
                     part='snippet',
                     videoId=video_id,
                     maxResults=1000,
-                    pageToken=next_page_token
+                    pageToken=next_page_token,
+                    fields=COMMENT_THREAD_FIELDS
                 )
                 
-                response = request.execute()
+                try:
+                    response = self._resilience.execute('commentThreads.list', request)
+                except Exception as e:
+                    if not pages:
+                        raise
+                    self.partial_fetch = {'pages_fetched': pages, 'error': describe_error(e)}
+                    logger.warning(f"Listing my comments on {video_id} stopped after {pages} pages: {describe_error(e)}")
+                    break
+                pages += 1
                 
-                for item in response['items']:
+                for item in response.get('items', []):
                     comment = item['snippet']['topLevelComment']['snippet']
                     
                     comment_channel_id = comment.get('authorChannelId', {}).get('value')
@@ -262,8 +547,8 @@ class YouTubeClient:
             return my_comments
             
         except HttpError as e:
-            logger.error(f"Error getting my comments: {e}")
-            raise Exception(f"Failed to get my comments: {str(e)}")
+            logger.error(f"Error getting my comments: {describe_error(e)}")
+            raise Exception(f"Failed to get my comments: {describe_error(e)}")
     
     def delete_judol_comments_on_video(
         self, 
@@ -292,7 +577,7 @@ class YouTubeClient:
             comment_id_map = {}
             
             for comment in my_comments:
-                comment_data = CommentData(
+                comment_data = CommentRecord(
                     comment_id=comment['comment_id'],
                     author="me",
                     text=comment['text'],
@@ -305,7 +590,8 @@ class YouTubeClient:
             detection_result = detector.detect_judol_comments(
                 comments=comment_data_list,
                 algorithm=algorithm,
-                pattern_file_id=pattern_file_id
+                pattern_file_id=pattern_file_id,
+                detection_mode=DetectionMode.VERDICT
             )
             
             judol_comments = detection_result['judol_comments']
@@ -339,15 +625,15 @@ class YouTubeClient:
                     results['details'].append({
                         'comment_id': comment_id,
                         'text': judol_comment.comment.text[:100] + '...' if len(judol_comment.comment.text) > 100 else judol_comment.comment.text,
-                        'error': str(e),
+                        'error': describe_error(e),
                         'status': 'failed'
                     })
             
             return results
             
         except Exception as e:
-            logger.error(f"Error deleting judol comments: {e}")
-            raise Exception(f"Failed to delete judol comments: {str(e)}")
+            logger.error(f"Error deleting judol comments: {describe_error(e)}")
+            raise Exception(f"Failed to delete judol comments: {describe_error(e)}")
     
     def delete_all_my_comments_on_video(self, video_id: str) -> Dict[str, Any]:
         if not self.has_write_access():
@@ -379,12 +665,12 @@ class YouTubeClient:
                     results['deletion_failed'] += 1
                     results['details'].append({
                         'comment_id': comment['comment_id'],
-                        'error': str(e),
+                        'error': describe_error(e),
                         'status': 'failed'
                     })
             
             return results
             
         except Exception as e:
-            logger.error(f"Error deleting all comments: {e}")
-            raise Exception(f"Failed to delete all comments: {str(e)}")
\ No newline at end of file
+            logger.error(f"Error deleting all comments: {describe_error(e)}")
+            raise Exception(f"Failed to delete all comments: {describe_error(e)}")
\ No newline at end of file
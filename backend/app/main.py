@@ -1,15 +1,32 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import uvicorn
 from app.config import get_settings
-from app.routes import detection, comments, auth
+from app.routes import detection, comments, auth, monitor, admission
+from app.core.history_store import get_history_store
+from app.core.author_reputation import get_author_reputation_index
 
 settings = get_settings()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # both join their polling threads; keep the joins off the event loop
+    await asyncio.to_thread(monitor.live_chat.stop_all)
+    await asyncio.to_thread(monitor.monitor.stop)
+    history_store = get_history_store()
+    if history_store:
+        history_store.close()
+    get_author_reputation_index().save()
+
 app = FastAPI(
     title="Judol Detector API",
     description="API for detecting gambling content in YouTube comments",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -20,9 +37,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(detection.router, prefix="/api/detection", tags=["Detection"])
 app.include_router(comments.router, prefix="/api/comments", tags=["Comments"])
+app.include_router(monitor.router, prefix="/api/monitor", tags=["Monitor"])
+app.include_router(admission.router, prefix="/api/admission", tags=["Admission"])
 
 @app.get("/")
 async def root():
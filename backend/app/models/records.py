@@ -0,0 +1,56 @@
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+from app.models.schemas import CommentData, JudolComment, PatternMatch, AlgorithmType, PatternType
+
+# Internal, validation-free representations for the fetch-to-detect path.
+# They are converted to the Pydantic models in schemas.py only at the
+# response boundary, and only for the comments that are returned.
+
+@dataclass(slots=True)
+class CommentRecord:
+    comment_id: str
+    author: str
+    text: str
+    like_count: int = 0
+    published_at: str = ""
+    reply_count: int = 0
+    author_channel_id: str = ""
+    parent_id: str = ""
+
+    def to_model(self) -> CommentData:
+        return CommentData.model_construct(
+            comment_id=self.comment_id,
+            author=self.author,
+            text=self.text,
+            like_count=self.like_count,
+            published_at=self.published_at,
+            reply_count=self.reply_count,
+            author_channel_id=self.author_channel_id or None,
+            parent_id=self.parent_id or None
+        )
+
+@dataclass(slots=True)
+class JudolHit:
+    comment: CommentRecord
+    matched_patterns: List[str]
+    detection_algorithm: AlgorithmType
+    normalized_text: Optional[str] = None
+    pattern_matches: List[Tuple[str, str]] = field(default_factory=list)
+    cluster_id: Optional[int] = None
+    propagated_from: Optional[str] = None
+    known_spammer: bool = False
+
+    def to_model(self) -> JudolComment:
+        return JudolComment.model_construct(
+            comment=self.comment.to_model(),
+            matched_patterns=self.matched_patterns,
+            normalized_text=self.normalized_text,
+            detection_algorithm=self.detection_algorithm,
+            pattern_matches=[
+                PatternMatch.model_construct(pattern=pattern, source=PatternType(source))
+                for pattern, source in self.pattern_matches
+            ],
+            cluster_id=self.cluster_id,
+            propagated_from=self.propagated_from,
+            known_spammer=self.known_spammer
+        )
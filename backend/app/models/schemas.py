@@ -7,7 +7,31 @@ class AlgorithmType(str, Enum):
     REGEX = "regex"
     KMP = "kmp"
     BOYER_MOORE = "boyer_moore"
+    WU_MANBER = "wu_manber"
     RABIN_KARP = "rabin_karp"
+    RABIN_KARP_VECTORIZED = "rabin_karp_vectorized"
+    HYBRID = "hybrid"
+    APPROXIMATE = "approximate"
+    AUTO = "auto"
+
+class PatternType(str, Enum):
+    KEYWORD = "keyword"
+    REGEX = "regex"
+
+class DetectionMode(str, Enum):
+    FULL = "full"
+    FIRST_HIT = "first_hit"
+    VERDICT = "verdict"
+
+class ResponseView(str, Enum):
+    IDS = "ids"
+    SUMMARY = "summary"
+    FULL = "full"
+
+class SpammerPolicy(str, Enum):
+    IGNORE = "ignore"
+    FLAG = "flag"
+    SHORT_CIRCUIT = "short_circuit"
 
 class CommentData(BaseModel):
     comment_id: str
@@ -16,40 +40,143 @@ class CommentData(BaseModel):
     like_count: int = 0
     published_at: str
     reply_count: int = 0
+    author_channel_id: Optional[str] = None
+    parent_id: Optional[str] = Field(None, description="Top-level comment this is a reply to")
+
+def extract_video_id(v: str) -> str:
+    if 'youtube.com/watch?v=' in v:
+        v = v.split('watch?v=')[1].split('&')[0]
+    elif 'youtu.be/' in v:
+        v = v.split('youtu.be/')[1].split('?')[0]
+    
+    if not re.match(r'^[a-zA-Z0-9_-]{11}$', v):
+        raise ValueError('Invalid YouTube video ID format')
+    return v
 
 class DetectionRequest(BaseModel):
     video_id: str = Field(..., description="YouTube video ID or URL")
     algorithm: AlgorithmType
     pattern_file_id: Optional[str] = Field(None, description="Pattern file ID for non-regex algorithms")
     max_results: int = Field(1000, ge=1, le=1000, description="Maximum number of comments to analyze")
+    max_edits: int = Field(1, ge=0, le=3, description="Maximum edit distance for the approximate algorithm")
+    detection_mode: DetectionMode = Field(
+        DetectionMode.FULL,
+        description="full: every occurrence; first_hit: stop each pattern at its first hit; "
+                    "verdict: stop each comment at the first matching pattern"
+    )
+    cluster_campaigns: bool = Field(
+        False,
+        description="Group near-duplicate comments and propagate judol verdicts within each group"
+    )
+    view: ResponseView = Field(
+        ResponseView.FULL,
+        description="ids: judol comment IDs only; summary: IDs, authors and matched patterns; "
+                    "full: complete comments with normalized text and pattern sources"
+    )
+    spammer_policy: SpammerPolicy = Field(
+        SpammerPolicy.IGNORE,
+        description="ignore: no author reputation; flag: mark judol comments from known spammers; "
+                    "short_circuit: flag every comment from a known spammer without matching it"
+    )
+    page_size: Optional[int] = Field(
+        None, ge=1, le=1000,
+        description="Return judol comments in pages of this size; fetch the rest with next_cursor"
+    )
+    include_replies: bool = Field(False, description="Also scan the replies under each comment thread")
+    max_replies_per_thread: int = Field(
+        20, ge=1, le=500,
+        description="Most replies fetched from a single thread when include_replies is set"
+    )
     
     @validator('video_id')
     def validate_video_id(cls, v):
-        if 'youtube.com/watch?v=' in v:
-            v = v.split('watch?v=')[1].split('&')[0]
-        elif 'youtu.be/' in v:
-            v = v.split('youtu.be/')[1].split('?')[0]
-        
-        if not re.match(r'^[a-zA-Z0-9_-]{11}$', v):
-            raise ValueError('Invalid YouTube video ID format')
-        return v
+        return extract_video_id(v)
+
+class MonitorWatchRequest(BaseModel):
+    video_id: str = Field(..., description="YouTube video ID or URL")
+    algorithm: AlgorithmType = AlgorithmType.REGEX
+    pattern_file_id: Optional[str] = None
+    min_interval_seconds: int = Field(60, ge=5, le=86400, description="Shortest time between polls")
+    max_interval_seconds: int = Field(1800, ge=5, le=86400, description="Longest time between polls")
+    alert_on_backlog: bool = Field(
+        False,
+        description="Also alert on judol comments already on the video when it is first polled"
+    )
+    
+    @validator('video_id')
+    def validate_video_id(cls, v):
+        return extract_video_id(v)
+
+class LiveChatWatchRequest(BaseModel):
+    video_id: str = Field(..., description="YouTube video ID or URL of a live stream")
+    algorithm: AlgorithmType = AlgorithmType.REGEX
+    pattern_file_id: Optional[str] = None
+    
+    @validator('video_id')
+    def validate_video_id(cls, v):
+        return extract_video_id(v)
+
+class PatternMatch(BaseModel):
+    pattern: str
+    source: PatternType
 
 class JudolComment(BaseModel):
     comment: CommentData
     matched_patterns: List[str]
-    normalized_text: str
+    normalized_text: Optional[str] = None
     detection_algorithm: AlgorithmType
+    pattern_matches: List[PatternMatch] = []
+    cluster_id: Optional[int] = None
+    propagated_from: Optional[str] = None
+    known_spammer: bool = False
+
+class JudolCommentSummary(BaseModel):
+    comment_id: str
+    author: str
+    matched_patterns: List[str]
+    cluster_id: Optional[int] = None
+    known_spammer: bool = False
+
+class CampaignCluster(BaseModel):
+    cluster_id: int
+    size: int
+    comment_ids: List[str]
+    judol: bool
+    sample_text: str
 
 class DetectionResponse(BaseModel):
     success: bool = True
     video_id: str
     video_title: Optional[str] = None
     total_comments: int
-    judol_comments: List[JudolComment]
+    judol_comments: Optional[List[JudolComment]] = None
+    judol_summaries: Optional[List[JudolCommentSummary]] = None
+    judol_comment_ids: Optional[List[str]] = None
     detection_count: int
     algorithm_used: AlgorithmType
+    detection_mode: DetectionMode = DetectionMode.FULL
     processing_time: float
     patterns_used: List[str] = []
+    source_counts: Optional[Dict[str, int]] = None
+    prefilter_stats: Optional[Dict[str, Any]] = None
+    planner: Optional[Dict[str, Any]] = None
+    campaigns: Optional[List[CampaignCluster]] = None
+    cache_stats: Optional[Dict[str, Any]] = None
+    reputation_stats: Optional[Dict[str, Any]] = None
+    partial_fetch: Optional[Dict[str, Any]] = Field(
+        None, description="Set when fetching stopped early; the comments fetched until then were analyzed"
+    )
+    view: ResponseView = ResponseView.FULL
+    next_cursor: Optional[str] = None
+
+class CorpusQueryResponse(BaseModel):
+    success: bool = True
+    video_id: str
+    query: str
+    total_hits: int
+    comments: List[CommentData]
+    query_time: float
+    index_stats: Dict[str, Any] = {}
 
 class PatternFileUploadResponse(BaseModel):
     success: bool
@@ -57,6 +184,7 @@ class PatternFileUploadResponse(BaseModel):
     filename: str
     patterns_count: int
     patterns: List[str]
+    pattern_type: PatternType = PatternType.KEYWORD
     replaced_previous: bool = False
     upload_time: str
 
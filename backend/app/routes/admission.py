@@ -0,0 +1,51 @@
+import logging
+import time
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+from app.core.admission import (
+    AdmissionRejected,
+    get_admission_controller,
+    all_admission_controllers,
+    render_prometheus
+)
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+def admission_slot(name: str):
+    """
+    Route dependency that holds one of the group's slots for the whole
+    request, or answers 429 with Retry-After when none frees up in time
+    """
+    controller = get_admission_controller(name)
+    
+    async def slot():
+        try:
+            await controller.acquire()
+        except AdmissionRejected as e:
+            logger.warning(f"Rejected {name} request: {e.reason}")
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+        
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            controller.release(time.monotonic() - start)
+    
+    return slot
+
+@router.get("/stats")
+async def get_admission_stats():
+    """Slots in use, queue depth, wait times and rejections per route group"""
+    return {
+        "success": True,
+        "groups": {controller.name: controller.stats() for controller in all_admission_controllers()}
+    }
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_admission_metrics():
+    """The same figures in the Prometheus text format, for scraping"""
+    return PlainTextResponse(
+        render_prometheus(all_admission_controllers()),
+        media_type="text/plain; version=0.0.4"
+    )
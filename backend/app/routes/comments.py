@@ -1,5 +1,6 @@
+import asyncio
 import logging
-from fastapi import APIRouter, HTTPException, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
 from app.models.schemas import (
     CommentInsertRequest,
     CommentFileInsertRequest,
@@ -11,6 +12,7 @@ from app.models.schemas import (
 from app.core.youtube_client import YouTubeClient
 from app.core.auth_manager import get_auth_manager
 from app.core.comment_file_manager import get_comment_file_manager
+from app.routes.admission import admission_slot
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -18,6 +20,9 @@ router = APIRouter()
 auth_manager = get_auth_manager()
 comment_file_manager = get_comment_file_manager()
 
+# bounded concurrency for the routes that call the YouTube API on the user's behalf
+moderation_slot = Depends(admission_slot("moderation"))
+
 def get_authenticated_youtube_client() -> YouTubeClient:
     if not auth_manager.is_authenticated():
         logger.warning("Authentication check failed - no valid memory session")
@@ -44,7 +49,7 @@ def get_authenticated_youtube_client() -> YouTubeClient:
     logger.info("Creating YouTube client with memory-stored credentials")
     return YouTubeClient(credentials=credentials)
 
-@router.post("/insert", response_model=CommentOperationResponse)
+@router.post("/insert", response_model=CommentOperationResponse, dependencies=[moderation_slot])
 async def insert_comments(request: CommentInsertRequest):
     """Insert comments directly from list"""
     try:
@@ -56,7 +61,8 @@ async def insert_comments(request: CommentInsertRequest):
                 detail="Maximum 100 comments allowed per request"
             )
         
-        result = youtube_client.insert_multiple_comments(request.video_id, request.comments)
+        # the client sleeps between comments and retries with blocking backoff
+        result = await asyncio.to_thread(youtube_client.insert_multiple_comments, request.video_id, request.comments)
         
         return CommentOperationResponse(
             success=len(result['successful']) > 0,
@@ -119,7 +125,7 @@ async def upload_comment_file(file: UploadFile = File(...)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing comment file: {str(e)}")
 
-@router.post("/insert-from-file", response_model=CommentOperationResponse)
+@router.post("/insert-from-file", response_model=CommentOperationResponse, dependencies=[moderation_slot])
 async def insert_comments_from_file(request: CommentFileInsertRequest):
     """
     Insert comments from uploaded comment file
@@ -143,7 +149,7 @@ async def insert_comments_from_file(request: CommentFileInsertRequest):
                 detail="No comments found in file"
             )
         
-        result = youtube_client.insert_multiple_comments(request.video_id, comments)
+        result = await asyncio.to_thread(youtube_client.insert_multiple_comments, request.video_id, comments)
         
         file_info = comment_file_manager.get_current_file_info()
         
@@ -199,7 +205,7 @@ async def clear_comment_file():
         logger.error(f"Error clearing comment file: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to clear comment file: {str(e)}")
 
-@router.post("/delete", response_model=CommentOperationResponse)
+@router.post("/delete", response_model=CommentOperationResponse, dependencies=[moderation_slot])
 async def delete_comments(request: CommentDeleteRequest):
     """Delete comments (judol only or all user comments)"""
     try:
@@ -212,7 +218,8 @@ async def delete_comments(request: CommentDeleteRequest):
             )
         
         if request.delete_judol_only:
-            result = youtube_client.delete_judol_comments_on_video(
+            result = await asyncio.to_thread(
+                youtube_client.delete_judol_comments_on_video,
                 request.video_id,
                 algorithm=request.algorithm,
                 pattern_file_id=request.pattern_file_id
@@ -228,7 +235,7 @@ async def delete_comments(request: CommentDeleteRequest):
                 details=result['details']
             )
         else:
-            result = youtube_client.delete_all_my_comments_on_video(request.video_id)
+            result = await asyncio.to_thread(youtube_client.delete_all_my_comments_on_video, request.video_id)
             
             return CommentOperationResponse(
                 success=result['deleted_successfully'] > 0 or result['total_comments'] == 0,
@@ -245,19 +252,20 @@ async def delete_comments(request: CommentDeleteRequest):
         logger.error(f"Error in delete_comments: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to delete comments: {str(e)}")
 
-@router.get("/my-comments/{video_id}")
+@router.get("/my-comments/{video_id}", dependencies=[moderation_slot])
 async def get_my_comments(video_id: str):
     """Get current user's comments on a video"""
     try:
         youtube_client = get_authenticated_youtube_client()
         
-        comments = youtube_client.get_my_comments_on_video(video_id)
+        comments = await asyncio.to_thread(youtube_client.get_my_comments_on_video, video_id)
         
         return {
             "success": True,
             "video_id": video_id,
             "total_comments": len(comments),
             "comments": comments,
+            "partial_fetch": youtube_client.partial_fetch,
         }
         
     except HTTPException:
@@ -272,7 +280,7 @@ async def get_my_channel_info():
     try:
         youtube_client = get_authenticated_youtube_client()
         
-        channel_info = youtube_client.get_my_channel_info()
+        channel_info = await asyncio.to_thread(youtube_client.get_my_channel_info)
         
         return {
             "success": True,
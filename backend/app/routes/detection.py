@@ -1,16 +1,32 @@
-from fastapi import APIRouter, HTTPException, File, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, File, Form, Query, UploadFile
+from fastapi.responses import Response
+from typing import Any, Dict, List, Optional, Tuple
 from app.models.schemas import (
     DetectionRequest, 
     DetectionResponse, 
+    CorpusQueryResponse,
+    JudolCommentSummary,
     PatternFileUploadResponse,
+    PatternType,
+    ResponseView,
     AlgorithmType
 )
+from app.models.records import CommentRecord, JudolHit
 from app.core.detector import JudolDetector
 from app.core.youtube_client import YouTubeClient
+from app.core.api_resilience import CircuitOpenError, get_api_resilience
+from app.core.single_flight import SingleFlight
+from app.routes.admission import admission_slot
 from app.core.auth_manager import get_auth_manager
 from app.core.pattern_manager import get_pattern_manager
+from app.core.corpus_index import get_corpus_index_store
+from app.core.result_store import get_result_store
+from app.core.history_store import get_history_store
 from app.config import get_settings
+import asyncio
 import logging
+import math
+import time
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -19,6 +35,16 @@ settings = get_settings()
 auth_manager = get_auth_manager()
 detector = JudolDetector()
 pattern_manager = get_pattern_manager()
+corpus_index_store = get_corpus_index_store()
+result_store = get_result_store()
+history_store = get_history_store()
+
+# concurrent identical requests (e.g. several moderators on a viral video) share one call
+youtube_fetches = SingleFlight("youtube-fetch")
+detections = SingleFlight("detection")
+
+# bounded concurrency and a short wait queue for the fetch-and-detect routes
+detection_slot = Depends(admission_slot("detection"))
 
 def get_youtube_client() -> YouTubeClient:
     if auth_manager.is_authenticated():
@@ -32,13 +58,127 @@ def get_youtube_client() -> YouTubeClient:
             detail="No authentication available. Please authenticate or configure API key."
         )
 
-@router.post("/detect", response_model=DetectionResponse)
-async def detect_judol_comments(request: DetectionRequest):
+async def fetch_video_info(youtube_client: YouTubeClient, video_id: str) -> Dict[str, Any]:
+    key = ("video_info", youtube_client.auth_type, video_id)
+    return await youtube_fetches.run(key, lambda: youtube_client.get_video_info(video_id))
+
+async def fetch_video_comments(
+    youtube_client: YouTubeClient,
+    video_id: str,
+    max_results: int,
+    include_replies: bool = False,
+    max_replies_per_thread: int = 20
+) -> Tuple[List[CommentRecord], Optional[Dict[str, Any]]]:
+    """
+    Comments of a video (by relevance) and the fetching client's partial_fetch
+    note, shared with an identical fetch already in flight
+    """
+    key = ("comments", youtube_client.auth_type, video_id, "relevance",
+           max_results, include_replies, max_replies_per_thread)
+    
+    async def fetch():
+        comments = await youtube_client.get_video_comments(
+            video_id,
+            max_results=max_results,
+            include_replies=include_replies,
+            max_replies_per_thread=max_replies_per_thread
+        )
+        return comments, youtube_client.partial_fetch
+    
+    return await youtube_fetches.run(key, fetch)
+
+async def run_detection(request: DetectionRequest, comments: List[CommentRecord]) -> Dict[str, Any]:
+    """
+    Detect judol comments in a worker thread, sharing the run with concurrent
+    requests for the same comments, settings and pattern-set version. The
+    comment list is part of the key by identity, so only requests that shared
+    a fetch can share a detection.
+    """
+    key = (
+        id(comments), detector.pattern_version(), request.video_id, request.algorithm, request.pattern_file_id,
+        request.detection_mode, request.max_edits, request.cluster_campaigns, request.spammer_policy
+    )
+    
+    def detect():
+        detection_result = detector.detect_judol_comments(
+            comments=comments,
+            algorithm=request.algorithm,
+            pattern_file_id=request.pattern_file_id,
+            detection_mode=request.detection_mode,
+            max_edits=request.max_edits,
+            cluster_campaigns=request.cluster_campaigns,
+            spammer_policy=request.spammer_policy,
+            video_id=request.video_id
+        )
+        if history_store:
+            history_store.record(request.video_id, detection_result["judol_comments"],
+                                 detection_result["algorithm_used"])
+        return detection_result
+    
+    return await detections.run(key, lambda: asyncio.to_thread(detect))
+
+def circuit_open_response(error: CircuitOpenError) -> HTTPException:
+    """503 telling the client when the YouTube API circuit may close again"""
+    return HTTPException(
+        status_code=503,
+        detail=str(error),
+        headers={"Retry-After": str(math.ceil(error.retry_after))}
+    )
+
+def render_detection_page(
+    summary: Dict[str, Any],
+    hits: List[JudolHit],
+    view: ResponseView,
+    offset: int = 0,
+    page_size: Optional[int] = None,
+    result_id: Optional[str] = None
+) -> Response:
+    """
+    Shape one page of judol comments for the requested view and serialize it
+    with pydantic-core directly; only the returned page is converted to models
+    """
+    end = len(hits) if page_size is None else offset + page_size
+    page = hits[offset:end]
+    
+    response = DetectionResponse(**summary, view=view)
+    if view == ResponseView.IDS:
+        response.judol_comment_ids = [hit.comment.comment_id for hit in page]
+    elif view == ResponseView.SUMMARY:
+        response.judol_summaries = [
+            JudolCommentSummary.model_construct(
+                comment_id=hit.comment.comment_id,
+                author=hit.comment.author,
+                matched_patterns=hit.matched_patterns,
+                cluster_id=hit.cluster_id,
+                known_spammer=hit.known_spammer
+            )
+            for hit in page
+        ]
+    else:
+        response.judol_comments = [hit.to_model() for hit in page]
+    
+    if result_id and end < len(hits):
+        response.next_cursor = result_store.encode_cursor(result_id, end)
+    
+    # the pattern list can be far larger than an ids/summary page
+    exclude = None if view == ResponseView.FULL else {"patterns_used"}
+    return Response(
+        content=response.model_dump_json(exclude_none=True, exclude=exclude),
+        media_type="application/json"
+    )
+
+@router.post(
+    "/detect",
+    response_model=DetectionResponse,
+    response_model_exclude_none=True,
+    dependencies=[detection_slot]
+)
+async def detect_judol_comments(request: DetectionRequest, background_tasks: BackgroundTasks):
     """
     Detect gambling comments in YouTube video
     """
     try:
-        if request.algorithm != AlgorithmType.REGEX and not request.pattern_file_id:
+        if request.algorithm not in (AlgorithmType.REGEX, AlgorithmType.AUTO) and not request.pattern_file_id:
             if not pattern_manager.has_patterns():
                 raise HTTPException(
                     status_code=400,
@@ -48,59 +188,98 @@ async def detect_judol_comments(request: DetectionRequest):
         
         youtube_client = get_youtube_client()
         
-        video_info = await youtube_client.get_video_info(request.video_id)
+        video_info = await fetch_video_info(youtube_client, request.video_id)
         
-        comments = await youtube_client.get_video_comments(
+        comments, partial_fetch = await fetch_video_comments(
+            youtube_client,
             request.video_id, 
-            max_results=request.max_results
+            max_results=request.max_results,
+            include_replies=request.include_replies,
+            max_replies_per_thread=request.max_replies_per_thread
         )
         
+        if comments:
+            background_tasks.add_task(corpus_index_store.build, request.video_id, comments)
+        
         if not comments:
-            return DetectionResponse(
-                success=True,
-                video_id=request.video_id,
-                video_title=video_info.get('title'),
-                total_comments=0,
-                judol_comments=[],
-                detection_count=0,
-                algorithm_used=request.algorithm,
-                processing_time=0.0,
-                patterns_used=[]
-            )
+            summary = {
+                "success": True,
+                "video_id": request.video_id,
+                "video_title": video_info.get('title'),
+                "total_comments": 0,
+                "detection_count": 0,
+                "algorithm_used": request.algorithm,
+                "processing_time": 0.0,
+                "patterns_used": []
+            }
+            return render_detection_page(summary, [], request.view)
         
-        detection_result = detector.detect_judol_comments(
-            comments=comments,
-            algorithm=request.algorithm,
-            pattern_file_id=request.pattern_file_id
-        )
+        detection_result = await run_detection(request, comments)
         
-        response = DetectionResponse(
-            success=True,
-            video_id=request.video_id,
-            video_title=video_info.get('title'),
-            total_comments=len(comments),
-            judol_comments=detection_result["judol_comments"],
-            detection_count=detection_result["count"],
-            algorithm_used=request.algorithm,
-            processing_time=detection_result["processing_time"],
-            patterns_used=detection_result["patterns_used"]
-        )
+        summary = {
+            "success": True,
+            "video_id": request.video_id,
+            "video_title": video_info.get('title'),
+            "total_comments": len(comments),
+            "detection_count": detection_result["count"],
+            "algorithm_used": detection_result["algorithm_used"],
+            "detection_mode": request.detection_mode,
+            "processing_time": detection_result["processing_time"],
+            "patterns_used": detection_result["patterns_used"],
+            "source_counts": detection_result.get("source_counts"),
+            "prefilter_stats": detection_result.get("prefilter_stats"),
+            "planner": detection_result.get("planner"),
+            "campaigns": detection_result.get("campaigns"),
+            "cache_stats": detection_result.get("cache_stats"),
+            "reputation_stats": detection_result.get("reputation_stats"),
+            "partial_fetch": partial_fetch
+        }
+        hits = detection_result["judol_comments"]
+        
+        result_id = None
+        if request.page_size and len(hits) > request.page_size:
+            result_id = result_store.put(hits, summary, request.view, request.page_size)
         
         logger.info(f"Detection completed: {detection_result['count']}/{len(comments)} "
-                   f"judol comments found using {request.algorithm.value}")
+                   f"judol comments found using {detection_result['algorithm_used']}")
         
-        return response
+        return render_detection_page(summary, hits, request.view, 0, request.page_size, result_id)
         
     except HTTPException:
         raise
+    except CircuitOpenError as e:
+        raise circuit_open_response(e)
+    except ValueError as e:
+        # a missing, empty or mismatched pattern file
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Detection failed: {e}")
         raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)}")
 
+@router.get("/detect/page", response_model=DetectionResponse, response_model_exclude_none=True)
+async def get_detection_page(cursor: str = Query(..., description="next_cursor from a previous detection response")):
+    """
+    Next page of a paged detection result
+    """
+    try:
+        result_id, offset = result_store.decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    stored = result_store.get(result_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Detection result expired. Please run detection again.")
+    
+    return render_detection_page(stored.summary, stored.hits, stored.view, offset, stored.page_size, result_id)
+
 @router.post("/upload-patterns", response_model=PatternFileUploadResponse)
-async def upload_pattern_file(file: UploadFile = File(...)):
+async def upload_pattern_file(
+    file: UploadFile = File(...),
+    pattern_type: PatternType = Form(PatternType.KEYWORD)
+):
     """
-    Upload pattern file (.txt) for non-regex algorithms
+    Upload pattern file (.txt): keywords for non-regex algorithms,
+    or one regex per line for the regex algorithm
     """
     if not file.filename or not file.filename.endswith('.txt'):
         raise HTTPException(status_code=400, detail="Only .txt files are allowed")
@@ -112,6 +291,7 @@ async def upload_pattern_file(file: UploadFile = File(...)):
         upload_result = detector.upload_patterns(
             content=text_content,
             filename=file.filename,
+            pattern_type=pattern_type
         )
         
         return PatternFileUploadResponse(
@@ -120,6 +300,7 @@ async def upload_pattern_file(file: UploadFile = File(...)):
             filename=upload_result['filename'],
             patterns_count=upload_result['patterns_count'],
             patterns=pattern_manager.get_patterns(upload_result['file_id']),
+            pattern_type=upload_result['pattern_type'],
             replaced_previous=upload_result.get('replaced_previous', False),
             upload_time=upload_result['upload_time']
         )
@@ -149,6 +330,138 @@ async def clear_pattern_file():
         logger.error(f"Error clearing pattern file: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to clear pattern file: {str(e)}")
 
+@router.get(
+    "/corpus/{video_id}/search",
+    response_model=CorpusQueryResponse,
+    dependencies=[detection_slot]
+)
+async def search_video_corpus(
+    video_id: str,
+    q: str = Query(..., min_length=1, description="Text to look for in the normalized comments"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of comments to return")
+):
+    """
+    Find the comments of a video that contain a substring, using the video's
+    cached corpus index (built on /detect, or here on first use)
+    """
+    try:
+        index = corpus_index_store.get(video_id)
+        if index is None:
+            youtube_client = get_youtube_client()
+            comments, _ = await fetch_video_comments(youtube_client, video_id, max_results=1000)
+            index = await asyncio.to_thread(corpus_index_store.build, video_id, comments)
+        
+        start_time = time.time()
+        hits = index.find(q)
+        query_time = time.time() - start_time
+        
+        return CorpusQueryResponse(
+            success=True,
+            video_id=video_id,
+            query=q,
+            total_hits=len(hits),
+            comments=[index.comments[i].to_model() for i in hits[:limit]],
+            query_time=query_time,
+            index_stats=index.stats()
+        )
+        
+    except HTTPException:
+        raise
+    except CircuitOpenError as e:
+        raise circuit_open_response(e)
+    except Exception as e:
+        logger.error(f"Corpus search failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Corpus search failed: {str(e)}")
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """Hit rate and size of the per-comment detection result cache"""
+    return {
+        "success": True,
+        "cache": detector.result_cache.stats(),
+        "coalescing": {
+            "youtube_fetches": youtube_fetches.stats(),
+            "detections": detections.stats()
+        }
+    }
+
+@router.get("/youtube-api-stats")
+async def get_youtube_api_stats():
+    """Retries and circuit breaker states of the YouTube API endpoints"""
+    return {
+        "success": True,
+        "youtube_api": get_api_resilience().stats()
+    }
+
+def _require_history_store():
+    if not history_store:
+        raise HTTPException(status_code=404, detail="Detection history is disabled")
+    return history_store
+
+@router.get("/history/top-authors")
+async def get_top_spam_authors(
+    days: float = Query(7, gt=0, description="Look back this many days"),
+    limit: int = Query(20, ge=1, le=500)
+):
+    """Authors with the most judol comments detected in the last `days` days"""
+    store = _require_history_store()
+    try:
+        since = time.time() - days * 86400
+        return {
+            "success": True,
+            "days": days,
+            "authors": await asyncio.to_thread(store.top_authors, since, limit)
+        }
+    except Exception as e:
+        logger.error(f"History query failed: {e}")
+        raise HTTPException(status_code=500, detail=f"History query failed: {str(e)}")
+
+@router.get("/history/patterns/videos")
+async def get_videos_by_pattern(
+    pattern: str = Query(..., min_length=1),
+    days: Optional[float] = Query(None, gt=0, description="Look back this many days (default: all history)"),
+    limit: int = Query(20, ge=1, le=500)
+):
+    """Videos with judol comments matched by a pattern"""
+    store = _require_history_store()
+    try:
+        since = time.time() - days * 86400 if days else 0.0
+        return {
+            "success": True,
+            "pattern": pattern,
+            "videos": await asyncio.to_thread(store.videos_by_pattern, pattern, since, limit)
+        }
+    except Exception as e:
+        logger.error(f"History query failed: {e}")
+        raise HTTPException(status_code=500, detail=f"History query failed: {str(e)}")
+
+@router.get("/history/videos/{video_id}")
+async def get_video_history(video_id: str, limit: int = Query(100, ge=1, le=1000)):
+    """Judol comments previously detected on a video, most recent first"""
+    store = _require_history_store()
+    try:
+        detections = await asyncio.to_thread(store.video_history, video_id, limit)
+        stats = await asyncio.to_thread(store.stats)
+        return {
+            "success": True,
+            "video_id": video_id,
+            "detections": detections,
+            "stats": stats
+        }
+    except Exception as e:
+        logger.error(f"History query failed: {e}")
+        raise HTTPException(status_code=500, detail=f"History query failed: {str(e)}")
+
+@router.get("/authors/spammers")
+async def get_known_spammers(limit: int = Query(20, ge=1, le=500)):
+    """Author channels with the most judol comments across all scanned videos"""
+    reputation = detector.reputation
+    return {
+        "success": True,
+        "authors": reputation.top_spammers(limit),
+        "stats": reputation.stats()
+    }
+
 @router.get("/video-info/{video_id}")
 async def get_video_info(video_id: str):
     """Get YouTube video information"""
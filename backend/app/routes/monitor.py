@@ -0,0 +1,120 @@
+import asyncio
+import logging
+from fastapi import APIRouter, HTTPException, Query
+from app.models.schemas import MonitorWatchRequest, LiveChatWatchRequest, AlgorithmType
+from app.core.monitor import MonitorScheduler
+from app.core.live_chat import LiveChatWatcher
+from app.core.pattern_manager import get_pattern_manager
+from app.routes import detection
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+pattern_manager = get_pattern_manager()
+
+# looked up on every poll, so a later login or API key change is picked up;
+# the route's detector is shared, so its verdict cache and planner state are too
+monitor = MonitorScheduler(client_factory=lambda: detection.get_youtube_client(), detector=detection.detector)
+
+# live chat alerts share the monitor's history, alert log and hooks
+live_chat = LiveChatWatcher(
+    client_factory=lambda: detection.get_youtube_client(),
+    on_alert=monitor.raise_alert,
+    detector=detection.detector
+)
+
+def _require_patterns(algorithm: AlgorithmType, pattern_file_id):
+    if algorithm == AlgorithmType.AUTO:
+        raise HTTPException(status_code=400, detail="Choose a concrete algorithm for monitoring")
+    if algorithm != AlgorithmType.REGEX and not pattern_file_id and not pattern_manager.has_patterns():
+        raise HTTPException(
+            status_code=400,
+            detail=f"Pattern file is required for {algorithm.value} algorithm. "
+                   f"Please upload a pattern file first."
+        )
+
+@router.post("/videos")
+async def watch_video(request: MonitorWatchRequest):
+    """
+    Start polling a video for new comments and alerting on judol ones
+    """
+    _require_patterns(request.algorithm, request.pattern_file_id)
+
+    try:
+        video = monitor.watch(
+            request.video_id,
+            algorithm=request.algorithm,
+            pattern_file_id=request.pattern_file_id,
+            min_interval=request.min_interval_seconds,
+            max_interval=request.max_interval_seconds,
+            alert_on_backlog=request.alert_on_backlog
+        )
+        return {
+            "success": True,
+            "video": video.to_dict()
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.delete("/videos/{video_id}")
+async def unwatch_video(video_id: str):
+    """Stop monitoring a video"""
+    removed = monitor.unwatch(video_id)
+    return {
+        "success": removed,
+        "message": "Video no longer monitored" if removed else "Video was not monitored"
+    }
+
+@router.get("/status")
+async def get_monitor_status():
+    """Watched videos, their current polling intervals and the quota budget"""
+    return {
+        "success": True,
+        **monitor.status()
+    }
+
+@router.get("/alerts")
+async def get_monitor_alerts(limit: int = Query(50, ge=1, le=200)):
+    """Most recent judol alerts raised by the monitor"""
+    return {
+        "success": True,
+        "alerts": monitor.recent_alerts(limit)
+    }
+
+@router.post("/live/videos")
+async def watch_live_chat(request: LiveChatWatchRequest):
+    """
+    Start following the live chat of a stream and alerting on judol messages
+    """
+    _require_patterns(request.algorithm, request.pattern_file_id)
+
+    try:
+        session = live_chat.start(
+            request.video_id,
+            algorithm=request.algorithm,
+            pattern_file_id=request.pattern_file_id
+        )
+        return {
+            "success": True,
+            "session": session.to_dict()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.delete("/live/videos/{video_id}")
+async def unwatch_live_chat(video_id: str):
+    """Stop following a live chat; starting it again resumes from the last page"""
+    # joins the polling thread, so keep it off the event loop
+    stopped = await asyncio.to_thread(live_chat.stop, video_id)
+    return {
+        "success": stopped,
+        "message": "Live chat no longer followed" if stopped else "Live chat was not followed"
+    }
+
+@router.get("/live/status")
+async def get_live_chat_status():
+    """Followed live chats with their polling intervals and per-message latency"""
+    return {
+        "success": True,
+        "sessions": live_chat.status()
+    }
@@ -0,0 +1,160 @@
+"""
+Scan exported comment dumps (JSONL or CSV) for judol comments offline.
+
+Writes one JSON verdict per input record and reports throughput on stderr.
+With --mmap, a newline-delimited archive is scanned in place without parsing
+records, and only hits are written, as byte offsets into the archive. A JSONL
+archive has its --text-field pulled out of each line at the byte level; any
+other archive is read as one plain-text comment per line.
+Run from the backend directory:
+    python -m app.scan comments.jsonl --algorithm wu_manber --patterns patterns.txt -o verdicts.jsonl
+    python -m app.scan archive.jsonl --mmap --patterns patterns.txt -o hits.jsonl
+    python -m app.scan comments.txt --mmap --patterns patterns.txt -o hits.jsonl
+"""
+import argparse
+import logging
+import os
+import sys
+from typing import List, Optional
+
+from app.models.schemas import AlgorithmType, DetectionMode, PatternType
+from app.core.batch_scanner import BatchScanner, read_records
+from app.core.pattern_manager import PatternManager
+
+SCAN_ALGORITHMS = [algorithm.value for algorithm in AlgorithmType if algorithm != AlgorithmType.AUTO]
+
+def load_patterns(path: Optional[str], algorithm: AlgorithmType, pattern_type: PatternType) -> Optional[List[str]]:
+    if not path:
+        if algorithm != AlgorithmType.REGEX:
+            raise ValueError(f"--patterns is required for the {algorithm.value} algorithm")
+        return None
+
+    if pattern_type == PatternType.REGEX and algorithm != AlgorithmType.REGEX:
+        raise ValueError(f"Regex pattern files can only be used with the {AlgorithmType.REGEX.value} algorithm")
+    if algorithm == AlgorithmType.REGEX and pattern_type != PatternType.REGEX:
+        raise ValueError("The regex algorithm needs --pattern-type regex, or no pattern file for the default pattern")
+
+    with open(path, "r", encoding="utf-8") as f:
+        patterns = [line.strip() for line in f if line.strip()]
+
+    validation = PatternManager().validate_patterns(patterns, pattern_type)
+    if not validation["valid"]:
+        raise ValueError(validation.get("error") or "; ".join(
+            f"{detail['pattern']}: {detail['error']}" for detail in validation["invalid_details"]
+        ))
+    return patterns
+
+def detect_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    if extension == ".csv":
+        return "csv"
+    raise ValueError(f"Cannot infer the format of {path}; pass --format")
+
+def detect_archive_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    if extension == ".csv":
+        return "csv"
+    return "text"
+
+def report_progress(stats):
+    print(f"  {stats['comments']} comments, {stats['judol']} judol, "
+          f"{stats['comments_per_second']:.0f} comments/s", file=sys.stderr)
+
+def scan_archive(scanner: BatchScanner, args: argparse.Namespace) -> int:
+    def report_archive_progress(stats):
+        print(f"  {stats['bytes'] / 1e6:.0f} MB, {stats['judol']} judol, "
+              f"{stats['megabytes_per_second']:.1f} MB/s", file=sys.stderr)
+
+    output_stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        stats = scanner.scan_archive(
+            args.input,
+            output_stream,
+            chunk_bytes=args.chunk_mb * 1024 * 1024,
+            text_field=args.text_field if args.format == "jsonl" else None,
+            progress=report_archive_progress
+        )
+    finally:
+        if output_stream is not sys.stdout:
+            output_stream.close()
+
+    print(f"Scanned {stats['bytes'] / 1e6:.1f} MB with {scanner.algorithm.value} on {scanner.workers} workers: "
+          f"{stats['judol']} judol lines in {stats['elapsed']:.2f}s ({stats['megabytes_per_second']:.1f} MB/s)",
+          file=sys.stderr)
+    return 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="JSONL or CSV file of comments, or - for JSONL on stdin")
+    parser.add_argument("-o", "--output", default="-", help="Verdicts JSONL file (default: stdout)")
+    parser.add_argument("--format", choices=["jsonl", "csv", "text"],
+                        help="Input format (default: from the file extension); text is one comment per line, --mmap only")
+    parser.add_argument("--algorithm", choices=SCAN_ALGORITHMS, default=AlgorithmType.WU_MANBER.value)
+    parser.add_argument("--patterns", help="Pattern file, one keyword or regex per line")
+    parser.add_argument("--pattern-type", choices=[t.value for t in PatternType], default=PatternType.KEYWORD.value)
+    parser.add_argument("--mode", choices=[m.value for m in DetectionMode], default=DetectionMode.FULL.value)
+    parser.add_argument("--max-edits", type=int, default=1, help="Edit distance for the approximate algorithm")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=2000, help="Records per worker task")
+    parser.add_argument("--id-field", default="comment_id")
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--only-judol", action="store_true", help="Write verdicts for judol comments only")
+    parser.add_argument("--mmap", action="store_true",
+                        help="Memory-map a newline-delimited archive and match raw lines, writing hit byte offsets")
+    parser.add_argument("--chunk-mb", type=int, default=8, help="Megabytes per worker task with --mmap")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+
+    algorithm = AlgorithmType(args.algorithm)
+    try:
+        patterns = load_patterns(args.patterns, algorithm, PatternType(args.pattern_type))
+        if args.mmap:
+            if args.input == "-":
+                raise ValueError("--mmap needs a file path, not stdin")
+            args.format = args.format or detect_archive_format(args.input)
+            if args.format == "csv":
+                raise ValueError("--mmap cannot scan CSV; use the normal scan, or a JSONL or plain-text archive")
+        elif args.format == "text":
+            raise ValueError("--format text is only supported with --mmap")
+        fmt = args.format or ("jsonl" if args.input == "-" else detect_format(args.input))
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    scanner = BatchScanner(
+        algorithm=algorithm,
+        patterns=patterns,
+        detection_mode=DetectionMode(args.mode),
+        max_edits=args.max_edits,
+        workers=args.workers,
+        chunk_size=args.chunk_size
+    )
+
+    if args.mmap:
+        return scan_archive(scanner, args)
+
+    input_stream = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8", newline="")
+    output_stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        records = read_records(input_stream, fmt, args.id_field, args.text_field)
+        stats = scanner.scan(records, output_stream, only_judol=args.only_judol, progress=report_progress)
+    except ValueError as e:
+        print(f"Scan failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+
+    print(f"Scanned {stats['comments']} comments with {algorithm.value} on {scanner.workers} workers: "
+          f"{stats['judol']} judol in {stats['elapsed']:.2f}s ({stats['comments_per_second']:.0f} comments/s)",
+          file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Compare full and `fields`-masked YouTube API responses: payload bytes and
+the time to decode a page and turn it into comment records.
+
+Pages come from recorded commentThreads.list responses (*.json, one full
+unmasked response per file). Record some from a real video with
+    YOUTUBE_API_KEY=... python -m benchmarks.bench_field_masks --record recorded/ --video VIDEO_ID
+and benchmark them with
+    python -m benchmarks.bench_field_masks --recorded recorded/
+Without --recorded, pages are generated by the fake API's resource builder.
+
+Run from the backend directory.
+"""
+import argparse
+import gzip
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from app.config import get_settings
+from app.core.youtube_client import YouTubeClient, COMMENT_THREAD_FIELDS, VIDEO_INFO_FIELDS
+from devtools.fake_youtube_api import FakeYouTube, FakeComment, CLEAN_TEXTS, JUDOL_TEXTS
+from devtools.partial_response import mask_response
+
+
+def record_pages(directory: Path, video_id: str, pages: int):
+    """Save full commentThreads.list pages of a video, as the API sent them"""
+    api_key = get_settings().youtube_api_key
+    if not api_key:
+        raise SystemExit("Set YOUTUBE_API_KEY to record responses")
+    client = YouTubeClient(api_key=api_key)
+    directory.mkdir(parents=True, exist_ok=True)
+    page_token = None
+    for page in range(pages):
+        response = client.youtube.commentThreads().list(
+            part='snippet', videoId=video_id, maxResults=100, order='relevance', pageToken=page_token
+        ).execute()
+        (directory / f"{video_id}-{page:03d}.json").write_text(json.dumps(response, ensure_ascii=False))
+        print(f"recorded page {page} ({len(response.get('items', []))} threads)")
+        page_token = response.get('nextPageToken')
+        if not page_token:
+            break
+
+
+def load_pages(directory: Path) -> List[Dict[str, Any]]:
+    pages = [json.loads(path.read_text()) for path in sorted(directory.glob("*.json"))]
+    if not pages:
+        raise SystemExit(f"No recorded responses in {directory}")
+    return pages
+
+
+def generate_pages(count: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    fake = FakeYouTube()
+    video_id = "dQw4w9WgXcQ"
+    for i in range(count * 100):
+        text = rng.choice(JUDOL_TEXTS if rng.random() < 0.2 else CLEAN_TEXTS) + " " * rng.randint(0, 3) + str(i)
+        fake.add_comment(video_id, FakeComment(text=text, author=f"user{i % 50}",
+                                               author_channel_id=f"UCfakeuser{i % 50:014d}"))
+    threads = fake.comments[video_id]
+    return [
+        {"kind": "youtube#commentThreadListResponse", "etag": f"page-{page}", "nextPageToken": f"token{page + 1}",
+         "pageInfo": {"totalResults": 100, "resultsPerPage": 100}, "items": threads[page * 100:(page + 1) * 100]}
+        for page in range(count)
+    ]
+
+
+def timed(label: str, bodies: List[bytes], decode: Callable[[bytes], int], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        records = sum(decode(body) for body in bodies)
+    elapsed = (time.perf_counter() - start) / repeat
+    raw = sum(map(len, bodies))
+    compressed = sum(len(gzip.compress(body)) for body in bodies)
+    print(f"{label:<12} {raw:>12,} B  {compressed:>10,} B gzip  {elapsed * 1000:9.2f} ms decode  records={records}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recorded", type=Path, help="Directory of recorded commentThreads.list responses")
+    parser.add_argument("--record", type=Path, help="Record responses of --video into this directory and exit")
+    parser.add_argument("--video", help="Video to record")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.record:
+        if not args.video:
+            parser.error("--record needs --video")
+        record_pages(args.record, args.video, args.pages)
+        return
+
+    pages = load_pages(args.recorded) if args.recorded else generate_pages(args.pages, args.seed)
+    print(f"{len(pages)} commentThreads pages, {sum(len(page.get('items', [])) for page in pages)} threads")
+
+    def decode_threads(body: bytes) -> int:
+        return len([YouTubeClient._comment_from_thread(item) for item in json.loads(body).get('items', [])])
+
+    # the API serves JSON pretty-printed unless asked otherwise
+    full = [json.dumps(page, ensure_ascii=False, indent=1).encode() for page in pages]
+    masked = [json.dumps(mask_response(page, COMMENT_THREAD_FIELDS), ensure_ascii=False, indent=1).encode()
+              for page in pages]
+
+    full_time = timed("full", full, decode_threads, args.repeat)
+    masked_time = timed("fields=...", masked, decode_threads, args.repeat)
+    print(f"commentThreads: {sum(map(len, full)) / sum(map(len, masked)):.1f}x fewer bytes, "
+          f"{full_time / masked_time:.1f}x faster decode")
+
+    video = FakeYouTube().video("dQw4w9WgXcQ")
+    video["snippet"].update({
+        "description": "Fake video description " * 40,
+        "thumbnails": {size: {"url": f"https://i.ytimg.com/vi/dQw4w9WgXcQ/{size}.jpg", "width": 480, "height": 360}
+                       for size in ("default", "medium", "high", "standard", "maxres")},
+        "tags": [f"tag{i}" for i in range(20)],
+        "categoryId": "10",
+        "liveBroadcastContent": "none",
+        "localized": {"title": "Fake video", "description": "Fake video description " * 40}
+    })
+    video_response = {"kind": "youtube#videoListResponse", "items": [video]}
+    full_video = len(json.dumps(video_response, indent=1))
+    masked_video = len(json.dumps(mask_response(video_response, VIDEO_INFO_FIELDS), indent=1))
+    print(f"videos.list:    {full_video:,} B full, {masked_video:,} B masked")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Fit the AlgorithmPlanner cost model and write app/core/planner_calibration.json.
+
+Times every candidate matcher over a grid of synthetic workloads and fits
+seconds = work * feature + per_comment * comments + fixed by non-negative
+least squares. Run from the backend directory:
+    python -m benchmarks.calibrate_planner
+"""
+import argparse
+import json
+import random
+import string
+import time
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+from app.core.algorithm_planner import AlgorithmPlanner, CALIBRATION_PATH
+from app.core.string_matching import StringMatchingFactory
+from benchmarks.bench_rabin_karp import make_comments
+
+
+def make_pattern_set(count: int, min_length: int, max_length: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    alphabet = string.ascii_lowercase + string.digits
+    return [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(min_length, max_length)))
+        for _ in range(count)
+    ]
+
+
+def time_matcher(algorithm: str, texts: List[str], patterns: List[str], repeats: int) -> float:
+    matcher = StringMatchingFactory.create_matcher(algorithm)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        if hasattr(matcher, "search_batch"):
+            matcher.search_batch(texts, patterns)
+        else:
+            for text in texts:
+                matcher.search(text, patterns)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def fit_non_negative(rows: np.ndarray, seconds: np.ndarray) -> np.ndarray:
+    """Least squares, dropping columns whose coefficient comes out negative"""
+    active = list(range(rows.shape[1]))
+    coefficients = np.zeros(rows.shape[1])
+    while active:
+        scale = rows[:, active].max(axis=0)
+        scale[scale == 0] = 1.0
+        solution, *_ = np.linalg.lstsq(rows[:, active] / scale, seconds, rcond=None)
+        solution = solution / scale
+        if (solution >= 0).all():
+            coefficients[active] = solution
+            break
+        active.pop(int(np.argmin(solution)))
+    return coefficients
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=CALIBRATION_PATH)
+    parser.add_argument("--repeats", type=int, default=2)
+    parser.add_argument("--quick", action="store_true", help="Smaller grid for a fast sanity run")
+    args = parser.parse_args()
+
+    comment_counts = [50, 400] if args.quick else [50, 300, 1000]
+    pattern_counts = [3, 40] if args.quick else [3, 20, 100, 400]
+    length_ranges = [(3, 6), (8, 16)]
+
+    planner = AlgorithmPlanner()
+    samples: Dict[str, List[List[float]]] = {name: [] for name in planner.CANDIDATES}
+    timings: Dict[str, List[float]] = {name: [] for name in planner.CANDIDATES}
+
+    for comment_count in comment_counts:
+        texts = [text.lower() for text in make_comments(comment_count, seed=comment_count)]
+        for pattern_count in pattern_counts:
+            for min_length, max_length in length_ranges:
+                patterns = make_pattern_set(pattern_count, min_length, max_length, seed=pattern_count)
+                workload = planner.describe_workload(patterns, [len(text) for text in texts])
+                for algorithm in planner.CANDIDATES:
+                    # per-pattern scans grow too slowly to time on the largest grids
+                    if algorithm in ("kmp", "boyer_moore") and comment_count * pattern_count > 100_000:
+                        continue
+                    seconds = time_matcher(algorithm, texts, patterns, args.repeats)
+                    samples[algorithm].append([planner.feature(algorithm, workload), comment_count, 1.0])
+                    timings[algorithm].append(seconds)
+                    print(f"{algorithm:<22} comments={comment_count:<5} patterns={pattern_count:<4} "
+                          f"len={min_length}-{max_length:<3} {seconds * 1000:9.2f} ms")
+
+    coefficients = {}
+    for algorithm in planner.CANDIDATES:
+        work, per_comment, fixed = fit_non_negative(np.array(samples[algorithm]), np.array(timings[algorithm]))
+        coefficients[algorithm] = {"work": float(work), "per_comment": float(per_comment), "fixed": float(fixed)}
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"calibrated_at": datetime.now().isoformat(timespec="seconds"), "coefficients": coefficients}, f, indent=2)
+        f.write("\n")
+    print(f"Calibration written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
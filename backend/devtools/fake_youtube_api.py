@@ -0,0 +1,399 @@
+"""
+A local stand-in for the parts of the YouTube Data API v3 the backend uses.
+
+Serves videos.list, commentThreads.list, comments.list and
+liveChatMessages.list from memory, honouring `fields` masks, and can
+generate a steady stream of comments and live chat messages (some of them
+judol) to exercise the monitor and the live chat watcher.
+Point the backend at it with YOUTUBE_API_BASE_URL and any YOUTUBE_API_KEY:
+    python -m devtools.fake_youtube_api --port 8765 --rate 0.5
+    YOUTUBE_API_BASE_URL=http://127.0.0.1:8765 YOUTUBE_API_KEY=fake uvicorn app.main:app
+
+Add comments and replies by hand with
+    POST /fake/videos/{video_id}/comments  {"text": "...", "author": "...", "author_channel_id": "..."}
+    POST /fake/comments/{comment_id}/replies  {"text": "...", ...}
+
+Videos passed with --live have an active live chat; post to it with
+    POST /fake/live/{video_id}/messages  {"text": "...", "author": "...", "author_channel_id": "..."}
+and end the stream with DELETE /fake/live/{video_id}.
+
+Make API paths fail to exercise retries and circuit breakers with
+    POST /fake/faults  {"path": "/youtube/v3/commentThreads", "status": 503, "count": 3, "skip": 2}
+which fails the 3 requests after the next 2; DELETE /fake/faults clears them.
+"""
+import argparse
+import asyncio
+import itertools
+import random
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from devtools.partial_response import mask_response
+
+CLEAN_TEXTS = ["mantap videonya", "terima kasih infonya", "keren bang", "lanjutkan kontennya", "wkwk lucu banget"]
+JUDOL_TEXTS = ["main di SLOT88 dijamin gacor", "𝗴𝗮𝗰𝗼𝗿 maxwin hari ini", "depo 10rb langsung wd di AERO88"]
+
+class FakeComment(BaseModel):
+    text: str
+    author: str = "Fake User"
+    author_channel_id: str = "UCfake000000000000000000"
+    published_at: Optional[str] = None
+
+def comment_snippet(video_id: str, comment: FakeComment, published_at: str) -> Dict[str, Any]:
+    """A comment snippet with every field the real API returns"""
+    return {
+        "channelId": "UCfakechannel0000000000",
+        "videoId": video_id,
+        "textDisplay": comment.text,
+        "textOriginal": comment.text,
+        "authorDisplayName": comment.author,
+        "authorProfileImageUrl": f"https://yt3.ggpht.com/ytc/{comment.author_channel_id}=s48-c-k-c0x00ffffff-no-rj",
+        "authorChannelUrl": f"http://www.youtube.com/@{comment.author.replace(' ', '').lower()}",
+        "authorChannelId": {"value": comment.author_channel_id},
+        "canRate": True,
+        "viewerRating": "none",
+        "likeCount": 0,
+        "publishedAt": published_at,
+        "updatedAt": published_at
+    }
+
+class FakeFault(BaseModel):
+    path: str
+    status: int = 503
+    count: int = 1
+    skip: int = 0
+    retry_after: Optional[float] = None
+    reason: str = "backendError"
+
+class FakeYouTube:
+    def __init__(self):
+        self.comments: Dict[str, List[Dict[str, Any]]] = {}
+        self.replies: Dict[str, List[Dict[str, Any]]] = {}
+        self.threads: Dict[str, Dict[str, Any]] = {}
+        self.live_chats: Dict[str, Dict[str, Any]] = {}
+        self.faults: List[FakeFault] = []
+        self._ids = itertools.count(1)
+
+    def take_fault(self, path: str) -> Optional[FakeFault]:
+        """The fault a request to `path` should fail with, if any"""
+        for fault in self.faults:
+            if not path.startswith(fault.path) or fault.count <= 0:
+                continue
+            if fault.skip > 0:
+                fault.skip -= 1
+                return None
+            fault.count -= 1
+            return fault
+        return None
+
+    def start_live_chat(self, video_id: str) -> Dict[str, Any]:
+        chat = {"id": f"Cg0KC{video_id}", "messages": [], "ended": False}
+        self.live_chats[video_id] = chat
+        return chat
+
+    def live_chat_by_id(self, live_chat_id: str) -> Optional[Dict[str, Any]]:
+        return next((chat for chat in self.live_chats.values() if chat["id"] == live_chat_id), None)
+
+    def add_live_message(self, video_id: str, comment: FakeComment) -> Dict[str, Any]:
+        chat = self.live_chats.get(video_id) or self.start_live_chat(video_id)
+        published_at = comment.published_at or datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        message = {
+            "kind": "youtube#liveChatMessage",
+            "id": f"LCC.{next(self._ids):020d}",
+            "snippet": {
+                "type": "textMessageEvent",
+                "liveChatId": chat["id"],
+                "authorChannelId": comment.author_channel_id,
+                "publishedAt": published_at,
+                "hasDisplayContent": True,
+                "displayMessage": comment.text,
+                "textMessageDetails": {"messageText": comment.text}
+            },
+            "authorDetails": {
+                "channelId": comment.author_channel_id,
+                "displayName": comment.author
+            }
+        }
+        chat["messages"].append(message)
+        return message
+
+    def add_comment(self, video_id: str, comment: FakeComment) -> Dict[str, Any]:
+        comment_id = f"Ugz{next(self._ids):020d}"
+        published_at = comment.published_at or datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        thread = {
+            "kind": "youtube#commentThread",
+            "etag": f"fake-etag-{comment_id}",
+            "id": comment_id,
+            "snippet": {
+                "channelId": "UCfakechannel0000000000",
+                "videoId": video_id,
+                "topLevelComment": {
+                    "kind": "youtube#comment",
+                    "etag": f"fake-etag-{comment_id}-c",
+                    "id": comment_id,
+                    "snippet": comment_snippet(video_id, comment, published_at)
+                },
+                "canReply": True,
+                "totalReplyCount": 0,
+                "isPublic": True
+            }
+        }
+        self.comments.setdefault(video_id, []).append(thread)
+        self.threads[comment_id] = thread
+        return thread
+
+    def add_reply(self, parent_id: str, comment: FakeComment) -> Dict[str, Any]:
+        thread = self.threads.get(parent_id)
+        if thread is None:
+            raise KeyError(parent_id)
+        published_at = comment.published_at or datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        reply_id = f"{parent_id}.{next(self._ids):010d}"
+        reply = {
+            "kind": "youtube#comment",
+            "etag": f"fake-etag-{reply_id}",
+            "id": reply_id,
+            "snippet": {**comment_snippet(thread["snippet"]["videoId"], comment, published_at), "parentId": parent_id}
+        }
+        self.replies.setdefault(parent_id, []).append(reply)
+        thread["snippet"]["totalReplyCount"] += 1
+        return reply
+
+    def video(self, video_id: str) -> Dict[str, Any]:
+        video = {
+            "kind": "youtube#video",
+            "id": video_id,
+            "snippet": {
+                "title": f"Fake video {video_id}",
+                "channelTitle": "Fake Channel",
+                "channelId": "UCfakechannel0000000000",
+                "publishedAt": "2026-01-01T00:00:00Z"
+            },
+            "statistics": {
+                "viewCount": "1000",
+                "likeCount": "100",
+                "commentCount": str(len(self.comments.get(video_id, [])))
+            }
+        }
+        chat = self.live_chats.get(video_id)
+        if chat:
+            video["liveStreamingDetails"] = {"actualStartTime": "2026-01-01T00:00:00Z"}
+            if not chat["ended"]:
+                video["liveStreamingDetails"]["activeLiveChatId"] = chat["id"]
+        return video
+
+def create_app(
+    fake: FakeYouTube,
+    rate: float = 0.0,
+    video_ids: Optional[List[str]] = None,
+    seed: int = 1,
+    live_rate: float = 0.0,
+    polling_interval_ms: int = 2000,
+    latency_ms: float = 0.0
+) -> FastAPI:
+    rng = random.Random(seed)
+    users = [(f"user{i}", f"UCfakeuser{i:014d}") for i in range(20)]
+
+    async def generate_comments():
+        while True:
+            await asyncio.sleep(rng.expovariate(rate))
+            author, channel_id = rng.choice(users)
+            text = rng.choice(JUDOL_TEXTS if rng.random() < 0.2 else CLEAN_TEXTS)
+            comment = FakeComment(text=text, author=author, author_channel_id=channel_id)
+            video_threads = fake.comments.get(rng.choice(video_ids))
+            # a third of the generated comments are replies to an existing thread
+            if video_threads and rng.random() < 0.33:
+                fake.add_reply(rng.choice(video_threads)["id"], comment)
+            else:
+                fake.add_comment(rng.choice(video_ids), comment)
+
+    async def generate_live_messages():
+        while True:
+            await asyncio.sleep(rng.expovariate(live_rate))
+            live = [video_id for video_id, chat in fake.live_chats.items() if not chat["ended"]]
+            if not live:
+                continue
+            author, channel_id = rng.choice(users)
+            text = rng.choice(JUDOL_TEXTS if rng.random() < 0.2 else CLEAN_TEXTS)
+            fake.add_live_message(rng.choice(live), FakeComment(text=text, author=author, author_channel_id=channel_id))
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        generators = []
+        if rate > 0 and video_ids:
+            generators.append(asyncio.create_task(generate_comments()))
+        if live_rate > 0:
+            generators.append(asyncio.create_task(generate_live_messages()))
+        yield
+        for generator in generators:
+            generator.cancel()
+
+    app = FastAPI(title="Fake YouTube Data API", lifespan=lifespan)
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        if latency_ms and request.url.path.startswith("/youtube/"):
+            await asyncio.sleep(latency_ms / 1000)
+        fault = fake.take_fault(request.url.path) if request.url.path.startswith("/youtube/") else None
+        if fault is None:
+            return await call_next(request)
+        headers = {"Retry-After": str(fault.retry_after)} if fault.retry_after is not None else None
+        return JSONResponse(status_code=fault.status, headers=headers, content={"error": {
+            "code": fault.status,
+            "message": f"Injected fault ({fault.reason})",
+            "errors": [{"domain": "global", "reason": fault.reason, "message": fault.reason}]
+        }})
+
+    @app.get("/youtube/v3/videos")
+    async def list_videos(id: str, part: str = "snippet", fields: Optional[str] = None):
+        response = {"kind": "youtube#videoListResponse", "items": [fake.video(video_id) for video_id in id.split(",")]}
+        return mask_response(response, fields)
+
+    @app.get("/youtube/v3/commentThreads")
+    async def list_comment_threads(
+        videoId: str,
+        part: str = "snippet",
+        maxResults: int = Query(20, ge=1, le=100),
+        order: str = "time",
+        pageToken: Optional[str] = None,
+        fields: Optional[str] = None
+    ):
+        threads = fake.comments.get(videoId, [])
+        # newest first for both orders; relevance has no meaning here
+        ordered = list(reversed(threads))
+        try:
+            offset = int(pageToken or 0)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid page token")
+
+        page = ordered[offset:offset + maxResults]
+        if "replies" in part.split(","):
+            # like the real API, only the first few replies come inline
+            page = [
+                {**thread, "replies": {"comments": fake.replies[thread["id"]][:5]}}
+                if fake.replies.get(thread["id"]) else thread
+                for thread in page
+            ]
+        response = {"kind": "youtube#commentThreadListResponse", "items": page}
+        if offset + maxResults < len(ordered):
+            response["nextPageToken"] = str(offset + maxResults)
+        return mask_response(response, fields)
+
+    @app.get("/youtube/v3/comments")
+    async def list_comments(
+        parentId: str,
+        part: str = "snippet",
+        maxResults: int = Query(20, ge=1, le=100),
+        pageToken: Optional[str] = None,
+        fields: Optional[str] = None
+    ):
+        try:
+            offset = int(pageToken or 0)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid page token")
+
+        replies = fake.replies.get(parentId, [])
+        response = {"kind": "youtube#commentListResponse", "items": replies[offset:offset + maxResults]}
+        if offset + maxResults < len(replies):
+            response["nextPageToken"] = str(offset + maxResults)
+        return mask_response(response, fields)
+
+    @app.get("/youtube/v3/liveChat/messages")
+    async def list_live_chat_messages(
+        liveChatId: str,
+        part: str = "snippet",
+        maxResults: int = Query(500, ge=200, le=2000),
+        pageToken: Optional[str] = None,
+        fields: Optional[str] = None
+    ):
+        chat = fake.live_chat_by_id(liveChatId)
+        if chat is None or chat["ended"]:
+            reason = "liveChatNotFound" if chat is None else "liveChatEnded"
+            status = 404 if chat is None else 403
+            return JSONResponse(status_code=status, content={"error": {
+                "code": status,
+                "message": f"The live chat is no longer available ({reason}).",
+                "errors": [{"domain": "youtube.liveChat", "reason": reason, "message": reason}]
+            }})
+        try:
+            offset = int(pageToken or 0)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid page token")
+
+        # oldest first, and the next token always points past the last message
+        page = chat["messages"][offset:offset + maxResults]
+        return mask_response({
+            "kind": "youtube#liveChatMessageListResponse",
+            "pollingIntervalMillis": polling_interval_ms,
+            "nextPageToken": str(offset + len(page)),
+            "items": page
+        }, fields)
+
+    @app.post("/fake/faults")
+    async def add_fault(fault: FakeFault):
+        fake.faults.append(fault)
+        return {"faults": len(fake.faults)}
+
+    @app.delete("/fake/faults")
+    async def clear_faults():
+        fake.faults.clear()
+        return {"faults": 0}
+
+    @app.post("/fake/videos/{video_id}/comments")
+    async def add_comment(video_id: str, comment: FakeComment):
+        return fake.add_comment(video_id, comment)
+
+    @app.post("/fake/comments/{comment_id}/replies")
+    async def add_reply(comment_id: str, comment: FakeComment):
+        try:
+            return fake.add_reply(comment_id, comment)
+        except KeyError:
+            raise HTTPException(status_code=404, detail="No such comment thread")
+
+    @app.post("/fake/live/{video_id}/messages")
+    async def add_live_message(video_id: str, comment: FakeComment):
+        return fake.add_live_message(video_id, comment)
+
+    @app.delete("/fake/live/{video_id}")
+    async def end_live_chat(video_id: str):
+        chat = fake.live_chats.get(video_id)
+        if chat is None:
+            raise HTTPException(status_code=404, detail="No live chat for this video")
+        chat["ended"] = True
+        return {"video_id": video_id, "ended": True}
+
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate", type=float, default=0.0, help="Generated comments per second across the videos")
+    parser.add_argument("--videos", default="dQw4w9WgXcQ", help="Comma-separated video IDs for generated comments")
+    parser.add_argument("--live", default="", help="Comma-separated video IDs that are live streams")
+    parser.add_argument("--live-rate", type=float, default=0.0, help="Generated live chat messages per second")
+    parser.add_argument("--polling-interval-ms", type=int, default=2000,
+                        help="pollingIntervalMillis returned with every live chat page")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every API response")
+    args = parser.parse_args()
+
+    fake = FakeYouTube()
+    for video_id in filter(None, args.live.split(",")):
+        fake.start_live_chat(video_id)
+    app = create_app(
+        fake,
+        rate=args.rate,
+        video_ids=args.videos.split(","),
+        live_rate=args.live_rate,
+        polling_interval_ms=args.polling_interval_ms,
+        latency_ms=args.latency_ms
+    )
+    uvicorn.run(app, host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Evaluate YouTube Data API `fields` masks locally.
+
+Supports the partial-response syntax the backend uses: comma-separated
+selections, `a/b` paths, `a(b,c)` sub-selections and the `*` wildcard.
+Used by the fake API to answer masked requests and by the field mask
+benchmark to mask recorded responses.
+"""
+from typing import Any, Dict, Optional
+
+# None selects a whole value, a dict selects some of its keys
+FieldTree = Optional[Dict[str, Any]]
+
+
+def parse_fields(fields: str) -> Dict[str, Any]:
+    fields = fields.replace(" ", "")
+    tree: Dict[str, Any] = {}
+    if _parse_selection(fields, 0, tree) != len(fields):
+        raise ValueError(f"Unbalanced parentheses in fields mask: {fields}")
+    return tree
+
+
+def _parse_selection(fields: str, pos: int, tree: FieldTree) -> int:
+    """Parse comma-separated paths into `tree` up to a closing parenthesis"""
+    while pos < len(fields) and fields[pos] != ")":
+        start = pos
+        while pos < len(fields) and fields[pos] not in ",()":
+            pos += 1
+        path = fields[start:pos].split("/")
+        if not all(path):
+            raise ValueError(f"Empty field name in fields mask at {start}: {fields}")
+
+        node = tree
+        for name in path[:-1]:
+            node = _child(node, name)
+
+        if pos < len(fields) and fields[pos] == "(":
+            pos = _parse_selection(fields, pos + 1, _child(node, path[-1]))
+            if pos >= len(fields):
+                raise ValueError(f"Unclosed parenthesis in fields mask: {fields}")
+            pos += 1
+        elif node is not None:
+            node[path[-1]] = None
+
+        if pos < len(fields) and fields[pos] == ",":
+            pos += 1
+    return pos
+
+
+def _child(node: FieldTree, name: str) -> FieldTree:
+    # below a whole selection every narrower selection is already included
+    if node is None or (name in node and node[name] is None):
+        return None
+    return node.setdefault(name, {})
+
+
+def apply_fields_mask(data: Any, tree: FieldTree) -> Any:
+    """The parts of a response a parsed mask selects"""
+    if tree is None:
+        return data
+    if isinstance(data, list):
+        return [apply_fields_mask(item, tree) for item in data]
+    if not isinstance(data, dict):
+        return data
+
+    masked = {}
+    for key, value in data.items():
+        if key in tree:
+            masked[key] = apply_fields_mask(value, tree[key])
+        elif "*" in tree:
+            masked[key] = apply_fields_mask(value, tree["*"])
+    return masked
+
+
+def mask_response(response: Dict[str, Any], fields: Optional[str]) -> Dict[str, Any]:
+    """The response as a request with an optional `fields` parameter would get it"""
+    if not fields:
+        return response
+    return apply_fields_mask(response, parse_fields(fields))
@@ -0,0 +1,37 @@
+from app.core.corpus_index import CorpusIndexStore
+from app.models.records import CommentRecord
+
+
+def _comments(*texts):
+    return [CommentRecord(comment_id=f"c{i}", author="viewer", text=text) for i, text in enumerate(texts)]
+
+
+def test_build_reuses_index_for_same_comments():
+    store = CorpusIndexStore()
+    first = store.build("vid", _comments("slot gacor hari ini", "nice video"))
+    again = store.build("vid", _comments("slot gacor hari ini", "nice video"))
+    assert again is first
+
+
+def test_build_rebuilds_when_a_comment_is_replaced():
+    store = CorpusIndexStore()
+    store.build("vid", _comments("slot gacor hari ini", "nice video"))
+    index = store.build("vid", _comments("slot gacor hari ini", "depo 10k maxwin"))
+    assert index.find("maxwin") == [1]
+    assert index.find("nice") == []
+
+
+def test_build_rebuilds_when_comments_are_deleted():
+    store = CorpusIndexStore()
+    store.build("vid", _comments("slot gacor hari ini", "nice video", "great edit"))
+    index = store.build("vid", _comments("nice video"))
+    assert len(index.comments) == 1
+    assert index.find("gacor") == []
+    assert store.get("vid") is index
+
+
+def test_build_rebuilds_when_a_comment_is_edited():
+    store = CorpusIndexStore()
+    store.build("vid", _comments("nice video"))
+    index = store.build("vid", _comments("nice video, join slot88"))
+    assert index.find("slot88") == [0]
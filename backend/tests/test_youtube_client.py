@@ -0,0 +1,39 @@
+import asyncio
+import logging
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from app.core.youtube_client import YouTubeClient
+
+API_KEY = "secret-api-key"
+
+
+class FailingResilience:
+    def __init__(self, error: Exception):
+        self.error = error
+
+    async def execute_async(self, operation, request):
+        raise self.error
+
+    def execute(self, operation, request):
+        raise self.error
+
+
+def _http_error(status: int) -> HttpError:
+    uri = f"https://www.googleapis.com/youtube/v3/videos?part=snippet&id=vid&key={API_KEY}&alt=json"
+    return HttpError(httplib2.Response({"status": status, "reason": "Not Found"}), b"", uri=uri)
+
+
+def test_failed_video_info_does_not_leak_api_key(monkeypatch, caplog):
+    client = YouTubeClient(api_key=API_KEY)
+    monkeypatch.setattr(client, "_resilience", FailingResilience(_http_error(404)))
+
+    with caplog.at_level(logging.DEBUG, logger="app"), pytest.raises(Exception) as raised:
+        asyncio.run(client.get_video_info("vid"))
+
+    assert "HTTP 404" in str(raised.value)
+    assert API_KEY not in str(raised.value)
+    assert "key=" not in caplog.text
+    assert API_KEY not in caplog.text
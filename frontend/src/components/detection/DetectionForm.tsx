@@ -76,9 +76,14 @@ export function DetectionForm({
 
   const algorithmOptions = [
     { value: AlgorithmType.REGEX, label: "Regular Expression (Default)" },
+    { value: AlgorithmType.AUTO, label: "Automatic (Cost-based)" },
     { value: AlgorithmType.KMP, label: "Knuth-Morris-Pratt (KMP)" },
     { value: AlgorithmType.BOYER_MOORE, label: "Boyer-Moore" },
+    { value: AlgorithmType.WU_MANBER, label: "Wu-Manber (Multi-pattern)" },
     { value: AlgorithmType.RABIN_KARP, label: "Rabin-Karp" },
+    { value: AlgorithmType.RABIN_KARP_VECTORIZED, label: "Rabin-Karp (Vectorized)" },
+    { value: AlgorithmType.HYBRID, label: "Hybrid (Regex + Keywords)" },
+    { value: AlgorithmType.APPROXIMATE, label: "Approximate (1 edit)" },
   ];
 
   const handleFileUpload = async (
@@ -107,7 +107,7 @@ export function DetectionResults({ results }: DetectionResultsProps) {
             <p className="text-sm text-gray-600">
               Processing Time: <span className="font-medium">{results.processing_time.toFixed(2)}s</span>
             </p>
-            {results.patterns_used.length > 0 && (
+            {results.patterns_used && results.patterns_used.length > 0 && (
               <div>
                 <p className="text-sm text-gray-600 mb-1">Patterns Used:</p>
                 <div className="flex flex-wrap gap-1">
@@ -137,7 +137,7 @@ export function DetectionResults({ results }: DetectionResultsProps) {
           </CardHeader>
           <CardContent>
             <div className="max-h-96 overflow-y-auto space-y-4 pr-2">
-              {results.judol_comments.map((judolComment, index) => (
+              {(results.judol_comments ?? []).map((judolComment, index) => (
                 <JudolCommentCard key={judolComment.comment.comment_id} judolComment={judolComment} index={index} />
               ))}
             </div>
@@ -192,7 +192,7 @@ function JudolCommentCard({ judolComment, index }: { judolComment: JudolComment;
           </p>
         </div>
         
-        {normalized_text !== comment.text && (
+        {normalized_text && normalized_text !== comment.text && (
           <div>
             <p className="text-sm font-medium text-gray-700 mb-1">Normalized Text:</p>
             <p className="text-sm text-gray-600 bg-gray-50 p-2 rounded border">
@@ -2,7 +2,30 @@ export enum AlgorithmType {
   REGEX = "regex",
   KMP = "kmp",
   BOYER_MOORE = "boyer_moore",
-  RABIN_KARP = "rabin_karp"
+  WU_MANBER = "wu_manber",
+  RABIN_KARP = "rabin_karp",
+  RABIN_KARP_VECTORIZED = "rabin_karp_vectorized",
+  HYBRID = "hybrid",
+  APPROXIMATE = "approximate",
+  AUTO = "auto"
+}
+
+export enum DetectionMode {
+  FULL = "full",
+  FIRST_HIT = "first_hit",
+  VERDICT = "verdict"
+}
+
+export enum ResponseView {
+  IDS = "ids",
+  SUMMARY = "summary",
+  FULL = "full"
+}
+
+export enum SpammerPolicy {
+  IGNORE = "ignore",
+  FLAG = "flag",
+  SHORT_CIRCUIT = "short_circuit"
 }
 
 export interface CommentData {
@@ -12,6 +35,8 @@ export interface CommentData {
   like_count: number;
   published_at: string;
   reply_count: number;
+  author_channel_id?: string;
+  parent_id?: string;
 }
 
 export interface DetectionRequest {
@@ -19,13 +44,46 @@ export interface DetectionRequest {
   algorithm: AlgorithmType;
   pattern_file_id?: string;
   max_results: number;
+  max_edits?: number;
+  detection_mode?: DetectionMode;
+  cluster_campaigns?: boolean;
+  spammer_policy?: SpammerPolicy;
+  view?: ResponseView;
+  page_size?: number;
+  include_replies?: boolean;
+  max_replies_per_thread?: number;
+}
+
+export interface PatternMatch {
+  pattern: string;
+  source: "keyword" | "regex";
 }
 
 export interface JudolComment {
   comment: CommentData;
   matched_patterns: string[];
-  normalized_text: string;
+  normalized_text?: string | null;
   detection_algorithm: AlgorithmType;
+  pattern_matches: PatternMatch[];
+  cluster_id?: number | null;
+  propagated_from?: string | null;
+  known_spammer?: boolean;
+}
+
+export interface CampaignCluster {
+  cluster_id: number;
+  size: number;
+  comment_ids: string[];
+  judol: boolean;
+  sample_text: string;
+}
+
+export interface JudolCommentSummary {
+  comment_id: string;
+  author: string;
+  matched_patterns: string[];
+  cluster_id?: number;
+  known_spammer?: boolean;
 }
 
 export interface DetectionResponse {
@@ -33,11 +91,28 @@ export interface DetectionResponse {
   video_id: string;
   video_title?: string;
   total_comments: number;
-  judol_comments: JudolComment[];
+  judol_comments?: JudolComment[];
+  judol_summaries?: JudolCommentSummary[];
+  judol_comment_ids?: string[];
   detection_count: number;
   algorithm_used: AlgorithmType;
+  detection_mode?: DetectionMode;
   processing_time: number;
-  patterns_used: string[];
+  patterns_used?: string[];
+  source_counts?: Record<string, number>;
+  prefilter_stats?: Record<string, number>;
+  planner?: {
+    requested: AlgorithmType;
+    chosen: AlgorithmType;
+    reason: string;
+    estimates?: Record<string, number>;
+  };
+  campaigns?: CampaignCluster[];
+  cache_stats?: Record<string, number | string | null>;
+  reputation_stats?: Record<string, number>;
+  partial_fetch?: { pages_fetched: number; error: string };
+  view?: ResponseView;
+  next_cursor?: string;
 }
 
 export interface PatternFileUploadResponse {
@@ -46,6 +121,7 @@ export interface PatternFileUploadResponse {
   filename: string;
   patterns_count: number;
   patterns: string[];
+  pattern_type: "keyword" | "regex";
   replaced_previous: boolean;
   upload_time: string;
 }